@@ -1,22 +1,42 @@
 # panorai/__init__.py
 
-from .pipeline.pipeline import ProjectionPipeline, PipelineConfig
-from .pipeline.pipeline_data import PipelineData
-from .pipeline.utils.resizer import ResizerConfig
+# Public names are resolved on first access (PEP 562), so `import panorai` stays cheap:
+# numpy, OpenCV, scipy, scikit-image, joblib and the projections submodule are only
+# imported once something that needs them is used.
+import importlib
+from typing import Any
 
-from .sampler.registry import SamplerRegistry
-from .submodules.projections import ProjectionRegistry
+from .log import setup_logging
 
 __version__ = "v1.0-beta"
 
-__all__ = [
+_LAZY_ATTRS = {
     # Pipeline
-    "ProjectionPipeline",
-    "PipelineConfig",
-    "PipelineData",
-    "ResizerConfig",
+    "ProjectionPipeline": ".pipeline.pipeline",
+    "PipelineConfig": ".pipeline.pipeline",
+    "PipelineData": ".pipeline.pipeline_data",
+    "ProjectionContext": ".pipeline.context",
+    "ProjectionCancelled": ".pipeline.context",
+    "SparseProjectionOperator": ".pipeline.operators",
+    "ResizerConfig": ".pipeline.utils.resizer",
     # Sampler
-    "SamplerRegistry",
+    "SamplerRegistry": ".sampler.registry",
     # Projection
-    "ProjectionRegistry",
-]
\ No newline at end of file
+    "ProjectionRegistry": ".submodules.projections",
+}
+
+__all__ = list(_LAZY_ATTRS) + ["setup_logging"]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_ATTRS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    if name == "SamplerRegistry":
+        importlib.import_module(".sampler", __name__)  # Registers the default samplers
+    value = getattr(importlib.import_module(_LAZY_ATTRS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,11 @@
+# blender/__init__.py
+
+from .registry import BlenderRegistry, BlenderRegistryError
+from .default_blenders import register_default_blenders
+
+try:
+    register_default_blenders()
+except Exception as e:
+    raise BlenderRegistryError("Cannot register default blenders") from e
+
+__all__ = ["BlenderRegistry", "BlenderRegistryError"]
@@ -0,0 +1,56 @@
+# panorai/blender/base_blenders.py
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, Tuple
+
+import numpy as np
+
+# (row slice, column slice) of a face's footprint on the equirectangular grid, and the
+# back-projected face over that box (zero outside the footprint)
+BlendFace = Tuple[Tuple[slice, slice], np.ndarray]
+
+
+class BaseBlender(ABC):
+    """Abstract base class for strategies combining back-projected faces."""
+
+    # Whether blend() consumes faces one at a time, so they can be produced lazily
+    streaming = False
+
+    def __init__(self, **kwargs: Any) -> None:
+        """
+        Base blender initialization.
+
+        Args:
+            **kwargs (Any): Additional parameters for blender configuration.
+        """
+        self.params: Dict[str, Any] = kwargs
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.params})"
+
+    @abstractmethod
+    def blend(self, faces: Iterable[BlendFace], img_shape: Tuple[int, ...]) -> np.ndarray:
+        """
+        Combine back-projected faces into one equirectangular image.
+
+        Faces only cover the bounding box of their footprint, so blenders work on
+        footprint-sized arrays and never hold one full-resolution image per face. The faces
+        may be a generator; streaming blenders fold each face in before taking the next.
+
+        Args:
+            faces (Iterable[BlendFace]): (box, image) per face, the image being (box height, box width, C).
+            img_shape (Tuple[int, ...]): Shape of the equirectangular output (H, W, C).
+
+        Returns:
+            np.ndarray: Blended float32 image of shape img_shape.
+        """
+        pass
+
+    def update(self, **kwargs: Any) -> None:
+        """
+        Update the blender with new parameters.
+
+        Args:
+            **kwargs (Any): Key-value pairs to update the existing parameters.
+        """
+        self.params.update(kwargs)
@@ -0,0 +1,25 @@
+# panorai/blender/default_blenders.py
+
+import logging
+from .registry import BlenderRegistry
+
+logger = logging.getLogger('blender.default_blenders')
+
+# Import paths of the default blenders; they are imported on first use
+DEFAULT_BLENDERS = {
+    "FeatheringBlender": f"{__package__}.feathering:FeatheringBlender",
+    "MultiBandBlender": f"{__package__}.multiband:MultiBandBlender",
+}
+
+
+def register_default_blenders() -> None:
+    """
+    Registers default blender classes into the BlenderRegistry.
+
+    Raises:
+        Exception: If blender registration fails for any reason.
+    """
+    logger.debug("Registering default blenders.")
+    for name, target in DEFAULT_BLENDERS.items():
+        BlenderRegistry.register_lazy(name, target)
+    logger.debug("All default blenders registered.")
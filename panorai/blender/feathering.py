@@ -0,0 +1,61 @@
+# panorai/blender/feathering.py
+
+from typing import Iterable, Tuple
+
+import numpy as np
+
+from .base_blenders import BaseBlender, BlendFace
+
+
+def feather(face: np.ndarray) -> np.ndarray:
+    """
+    Feather weights of a back-projected face: distance to the nearest invalid (all-zero)
+    pixel, normalized to [0, 1].
+
+    Args:
+        face (np.ndarray): Back-projected face (h, w, C).
+
+    Returns:
+        np.ndarray: Weights (h, w).
+    """
+    from scipy.ndimage import distance_transform_edt
+
+    valid_mask = np.max(face > 0, axis=-1).astype(np.float32)
+    distance = distance_transform_edt(valid_mask)
+    return distance / distance.max() if distance.max() != 0 else valid_mask
+
+
+class FeatheringBlender(BaseBlender):
+    """
+    Single-scale feathering: faces are averaged with weights fading towards their edges.
+
+    This is the pipeline's historical blend; see pipeline/README-Blending.md. Faces are
+    folded into the output one at a time.
+    """
+
+    streaming = True
+
+    def blend(self, faces: Iterable[BlendFace], img_shape: Tuple[int, ...]) -> np.ndarray:
+        """
+        Blend faces with feathered weights.
+
+        Args:
+            faces (Iterable[BlendFace]): (box, image) per face.
+            img_shape (Tuple[int, ...]): Shape of the equirectangular output.
+
+        Returns:
+            np.ndarray: Blended float32 image.
+        """
+        combined = np.zeros(img_shape, dtype=np.float32)
+        weight_map = np.zeros(img_shape[:2], dtype=np.float32)
+
+        for box, face in faces:
+            feathered_mask = feather(face)
+            combined[box] += face * feathered_mask[..., None]
+            weight_map[box] += feathered_mask
+
+        # Normalize
+        valid_weights = weight_map > 0
+        combined[valid_weights] /= weight_map[valid_weights, None]
+        combined[~valid_weights] = 0
+        return combined
@@ -0,0 +1,103 @@
+# panorai/blender/registry.py
+
+import importlib
+import logging
+from typing import TYPE_CHECKING, Any, Dict, Type
+
+if TYPE_CHECKING:
+    from .base_blenders import BaseBlender
+
+logger = logging.getLogger('blender.registry')
+
+
+class BlenderRegistryError(Exception):
+    """
+    Custom exception for BlenderRegistry errors.
+    """
+    pass
+
+
+class BlenderRegistry:
+    """
+    Registry for managing blending strategies.
+
+    Blenders are registered as classes, or lazily as an import path resolved on first use.
+    Every get_blender() call returns a new instance, so pipelines never share blender state.
+    """
+    _registry: Dict[str, Type["BaseBlender"]] = {}
+    _lazy: Dict[str, str] = {}
+
+    @classmethod
+    def register(cls, name: str, blender: Type["BaseBlender"]) -> None:
+        """
+        Register a blender class under a given name.
+
+        Args:
+            name (str): Blender name.
+            blender (Type[BaseBlender]): A BaseBlender subclass.
+        """
+        cls._registry[name] = blender
+        cls._lazy.pop(name, None)
+        logger.info(f"Blender '{name}' registered successfully.")
+
+    @classmethod
+    def register_lazy(cls, name: str, target: str) -> None:
+        """
+        Register a blender class by import path, without importing it.
+
+        Args:
+            name (str): Blender name.
+            target (str): "package.module:ClassName" of a BaseBlender subclass.
+        """
+        cls._lazy[name] = target
+        cls._registry.pop(name, None)
+        logger.debug(f"Blender '{name}' registered lazily as '{target}'.")
+
+    @classmethod
+    def _resolve(cls, name: str) -> None:
+        module_name, _, attr = cls._lazy[name].partition(":")
+        try:
+            cls._registry[name] = getattr(importlib.import_module(module_name), attr)
+        except Exception as e:
+            raise BlenderRegistryError(f"Cannot load blender '{name}' from '{cls._lazy[name]}'.") from e
+        del cls._lazy[name]
+
+    @classmethod
+    def get_blender(cls, name: str, **kwargs: Any) -> "BaseBlender":
+        """
+        Create a registered blender.
+
+        Args:
+            name (str): Name of the registered blender.
+            **kwargs (Any): Parameters of the blender.
+
+        Returns:
+            BaseBlender: A new instance of the requested blender.
+
+        Raises:
+            BlenderRegistryError: If the blender name is not found in the registry.
+        """
+        logger.debug(f"Retrieving blender '{name}' with parameters: {kwargs}")
+        if name in cls._lazy:
+            cls._resolve(name)
+        if name not in cls._registry:
+            error_msg = f"Blender '{name}' not found in the registry."
+            logger.error(error_msg)
+            raise BlenderRegistryError(error_msg)
+
+        blender = cls._registry[name]()
+        blender.update(**kwargs)
+        return blender
+
+    @classmethod
+    def list_blenders(cls) -> list:
+        """
+        List all registered blender names.
+
+        Returns:
+            list: A list of blender names.
+        """
+        logger.debug("Listing all registered blenders.")
+        blenders = list(cls._registry.keys()) + list(cls._lazy.keys())
+        logger.info(f"Registered blenders: {blenders}")
+        return blenders
@@ -0,0 +1,211 @@
+# panorai/cli/batch.py
+
+import collections
+import glob
+import json
+import logging
+import os
+import time
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+SUPPORTED_EXTENSIONS = (".npz", ".png", ".jpg", ".jpeg", ".tif", ".tiff", ".bmp")
+
+MANIFEST_NAME = "manifest.jsonl"
+
+
+def expand_inputs(input_arg: str) -> List[str]:
+    """
+    Expand a file, directory or glob pattern into a sorted list of input files.
+
+    Directories are searched recursively for files with a supported extension.
+
+    Args:
+        input_arg (str): Path to a file or directory, or a glob pattern.
+
+    Returns:
+        List[str]: Input files.
+    """
+    if os.path.isdir(input_arg):
+        paths = glob.glob(os.path.join(input_arg, "**", "*"), recursive=True)
+    elif glob.has_magic(input_arg):
+        paths = glob.glob(input_arg, recursive=True)
+    else:
+        return [input_arg]
+    return sorted(p for p in paths if os.path.isfile(p) and p.lower().endswith(SUPPORTED_EXTENSIONS))
+
+
+def output_name(input_path: str, root: Optional[str] = None) -> str:
+    """
+    Name of the per-input output directory inside a batch run directory.
+
+    Args:
+        input_path (str): Input file.
+        root (Optional[str]): Common root of the batch inputs; the relative path keeps names unique.
+
+    Returns:
+        str: Directory name derived from the input path.
+    """
+    rel = os.path.relpath(input_path, root) if root else os.path.basename(input_path)
+    stem, _ = os.path.splitext(rel)
+    return stem.replace(os.sep, "__")
+
+
+class Manifest:
+    """
+    Append-only JSON-lines record of the inputs a batch run has finished.
+
+    Only the main process writes to it, one line per completed input, so an
+    interrupted run loses at most the inputs that were in flight.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Open (or create) a manifest.
+
+        Args:
+            path (str): Location of the manifest file.
+        """
+        self.path = path
+        self._file = None
+
+    def completed(self) -> Set[str]:
+        """
+        Inputs recorded as done.
+
+        Returns:
+            Set[str]: Absolute paths of completed inputs.
+        """
+        done: Set[str] = set()
+        if not os.path.exists(self.path):
+            return done
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Partially written last line of an interrupted run
+                if record.get("status") == "done":
+                    done.add(record["input"])
+        return done
+
+    def record(self, **entry: Any) -> None:
+        """
+        Append one record and flush it to disk.
+
+        Args:
+            **entry (Any): Fields of the record; must include "input" and "status".
+        """
+        if self._file is None:
+            self._file = open(self.path, "a")
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def run_batch(
+    inputs: Iterable[str],
+    task: Callable[[str], Tuple[str, Optional[str]]],
+    manifest: Manifest,
+    workers: int = 1,
+    initializer: Optional[Callable[..., None]] = None,
+    initargs: Tuple[Any, ...] = ()
+) -> Dict[str, int]:
+    """
+    Run `task` over every input not yet recorded as done in the manifest.
+
+    With workers > 1 the inputs are processed by a process pool; `initializer` runs
+    once per worker, so each worker builds and keeps one warm pipeline. At most a few
+    tasks per worker are in flight, so huge input lists are not submitted at once.
+    If a worker dies, the pool is recreated and the inputs that were in flight are
+    retried one at a time, so only the input that crashed is recorded as failed.
+
+    Args:
+        inputs (Iterable[str]): Input files.
+        task (Callable[[str], Tuple[str, Optional[str]]]): Picklable callable returning (output_dir, error).
+        manifest (Manifest): Manifest used for resuming and for recording progress.
+        workers (int): Number of worker processes; 1 runs in the current process.
+        initializer (Optional[Callable[..., None]]): Per-worker setup, e.g. building the pipeline.
+        initargs (Tuple[Any, ...]): Arguments of `initializer`.
+
+    Returns:
+        Dict[str, int]: Counts of "done", "failed" and "skipped" inputs.
+    """
+    done = manifest.completed()
+    counts = {"done": 0, "failed": 0, "skipped": 0}
+    pending: List[str] = []
+    for path in inputs:
+        if os.path.abspath(path) in done:
+            counts["skipped"] += 1
+        else:
+            pending.append(path)
+    logging.info(f"Batch: {len(pending)} inputs to process, {counts['skipped']} already done.")
+
+    def _record(path: str, started: float, output_dir: Optional[str], error: Optional[str]) -> None:
+        status = "failed" if error else "done"
+        counts[status] += 1
+        manifest.record(input=os.path.abspath(path), status=status, output=output_dir,
+                        error=error, seconds=round(time.time() - started, 3))
+        if error:
+            logging.error(f"Failed to process {path}: {error}")
+        else:
+            logging.info(f"[{counts['done'] + counts['failed']}/{len(pending)}] {path} -> {output_dir}")
+
+    try:
+        if workers <= 1:
+            if initializer is not None:
+                initializer(*initargs)
+            for path in pending:
+                started = time.time()
+                output_dir, error = task(path)
+                _record(path, started, output_dir, error)
+            return counts
+
+        def _pool() -> ProcessPoolExecutor:
+            return ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs)
+
+        executor = _pool()
+        in_flight: Dict[Any, Tuple[str, float, bool]] = {}
+        queue = collections.deque(pending)
+        # Inputs in flight when a worker died; each is retried alone to find the one that crashed
+        suspects: Deque[str] = collections.deque()
+        try:
+            while in_flight or suspects or queue:
+                broken = False
+                source = suspects if suspects else queue
+                try:
+                    while source and len(in_flight) < (1 if source is suspects else workers * 2):
+                        path = source.popleft()
+                        in_flight[executor.submit(task, path)] = (path, time.time(), source is suspects)
+                except BrokenProcessPool:
+                    source.appendleft(path)  # Never ran
+                    broken = True
+                finished = wait(in_flight, return_when=ALL_COMPLETED if broken else FIRST_COMPLETED)[0]
+                for future in finished:
+                    path, started, alone = in_flight.pop(future)
+                    try:
+                        output_dir, error = future.result()
+                    except BrokenProcessPool as e:  # A worker died
+                        broken = True
+                        if not alone:
+                            suspects.append(path)
+                            continue
+                        output_dir, error = None, repr(e)
+                    except Exception as e:
+                        output_dir, error = None, repr(e)
+                    _record(path, started, output_dir, error)
+                if broken:
+                    logging.warning(f"Batch: a worker died; retrying {len(suspects)} in-flight inputs one at a time.")
+                    executor.shutdown(wait=True)
+                    executor = _pool()
+        finally:
+            executor.shutdown(wait=True)
+        return counts
+    finally:
+        manifest.close()
@@ -1,4 +1,5 @@
 import argparse
+import glob
 import os
 import json
 import sys
@@ -6,11 +7,13 @@ import numpy as np
 import logging
 from datetime import datetime
 import cv2
+from concurrent.futures import ThreadPoolExecutor
 
-from panorai.pipeline.pipeline import ProjectionPipeline
-from panorai.pipeline.pipeline_data import PipelineData
+from panorai.pipeline.sources import npz_keys
 from panorai.submodules.projections import ProjectionRegistry
 from panorai.sampler.registry import SamplerRegistry
+from panorai.cli.batch import MANIFEST_NAME, Manifest, expand_inputs, output_name, run_batch
+from panorai.cli.writers import OUTPUT_FORMATS, write_arrays
 
 def setup_logging(verbose):
     logging_level = logging.DEBUG if verbose else logging.INFO
@@ -52,6 +55,13 @@ Examples:
 
 4) FibonacciSampler with n_points=30
    panorai-cli --sampler_name=FibonacciSampler --input ../images/sample2.npz --kwargs n_points=30 --array_files rgb z
+
+5) Coverage and overlap of an icosahedron sampler with 50 degree faces
+   panorai-cli --analyze-coverage --sampler_name=IcosahedronSampler --kwargs subdivisions=1 fov_deg=50
+
+6) Batch over a directory (or a quoted glob) with 8 workers, then resume it after an interruption
+   panorai-cli --input ../images/ --workers 8 --array_files rgb z
+   panorai-cli --input ../images/ --workers 8 --array_files rgb z --resume .cache/run_<timestamp>_gnomonic_both
 """
     )
 
@@ -65,9 +75,14 @@ Examples:
     parser.add_argument("--list-samplers", action="store_true", help="List all available samplers and exit.")
     parser.add_argument("--list-files", action="store_true", help="List all files inside the provided NPZ input.")
     parser.add_argument("--show-pipeline", action="store_true", help="Show details of the instantiated pipeline object.")
+    parser.add_argument("--analyze-coverage", action="store_true",
+                        help="Print the sphere coverage and face overlap of the sampler with the projection "
+                             "config given in --kwargs (fov_deg, x_points, y_points, resolution_deg) and exit.")
 
     # Input parameters
-    parser.add_argument("--input", type=str, help="Path to the input file or directory.")
+    parser.add_argument("--input", type=str,
+                        help="Path to the input file, a directory, or a quoted glob pattern. "
+                             "Directories and globs are processed in batch mode.")
     parser.add_argument("--array_files", type=str, nargs="*", help="Keys for data in the .npz file (e.g., rgb, depth).")
 
     # Projection parameters
@@ -77,17 +92,38 @@ Examples:
                         help="Name of the sampler to use (default='CubeSampler').")
     parser.add_argument("--operation", choices=["project", "backward"], help="Operation to perform.")
     parser.add_argument("--kwargs", nargs="*", default=[], help="Additional arguments in key=value format.")
+    parser.add_argument("--cache_dir", type=str, default=None,
+                        help="Directory of the on-disk geometry cache shared across runs "
+                             "(default: $PANORAI_CACHE_DIR, disabled if unset).")
 
     # Output options
     parser.add_argument("--output_dir", type=str, default=".cache",
                         help="Base directory to save the output files (default='.cache').")
     parser.add_argument("--save_npz", action="store_true", default=True,
-                        help="Save results as a single .npz file (default=True). Disable to save storage.")
+                        help="Save the raw results (default=True). Pass --no-save_npz to save storage.")
+    parser.add_argument("--no-save_npz", action="store_true", help="Do not save the raw results (override).")
+    parser.add_argument("--output_format", choices=OUTPUT_FORMATS, default="npz_compressed",
+                        help="Format of the raw results: npz_compressed (default, smallest), npz (uncompressed), "
+                             "npy (directory of memory-mappable .npy files) or chunked (fast zstd/lz4/zlib chunks).")
     parser.add_argument("--save_png", action="store_true", default=True,
-                        help="Save illustrative PNG images (default=True). Disable to save storage.")
+                        help="Save illustrative PNG images (default=True). Pass --no-save_png to skip them.")
+    parser.add_argument("--no-save_png", action="store_true", help="Do not save PNG previews (override).")
+    parser.add_argument("--png_workers", type=int, default=4,
+                        help="Number of threads encoding PNG previews (default=4).")
     parser.add_argument("--cmap", type=str, default="jet",
                         help="Colormap name for single-channel arrays (default='jet').")
 
+    # Batch options
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of worker processes in batch mode, each keeping one warm pipeline (default=1).")
+    parser.add_argument("--resume", type=str, default=None,
+                        help="Run directory of an interrupted batch; inputs recorded in its manifest are skipped.")
+
+    # Server handoff
+    parser.add_argument("--server", type=str, default=os.environ.get("PANORAI_SERVER"),
+                        help="Address of a running panorai-serve (Unix socket path or host:port) to hand jobs to; "
+                             "runs locally if none answers (default: $PANORAI_SERVER).")
+
     # Logging and verbosity
     parser.add_argument("--verbose", action="store_true", default=True,
                         help="Enable verbose logging (default=True). Pass --no-verbose to silence (see below).")
@@ -113,6 +149,9 @@ def save_metadata(output_dir, args):
         "command": " ".join(sys.argv),
         "save_npz": args.save_npz,
         "save_png": args.save_png,
+        "output_format": args.output_format,
+        "cache_dir": args.cache_dir,
+        "workers": args.workers,
         "verbose": not args.no_verbose,
     }
     metadata_path = os.path.join(output_dir, "metadata.json")
@@ -184,13 +223,57 @@ def _flatten_result_for_npz(result_dict, prefix=""):
 ###############################################################################
 # Main saving logic
 ###############################################################################
+def _render_preview(full_key: str, array: np.ndarray, original_name: str, output_dir: str, cmap: str = "jet"):
+    """
+    Build the illustrative image of one array.
+
+    Returns:
+        Optional[tuple]: (png_path, image) or None if the array has no preview.
+    """
+    safe_key = full_key.replace(".", "_")
+
+    # If recognized as "rgb", handle color conversion
+    if original_name.lower() == "rgb":
+        if array.ndim == 3 and array.shape[2] == 3:
+            # Ensure 8-bit
+            if array.dtype != np.uint8:
+                array = normalize_array(array)
+            # Convert from RGB -> BGR
+            return os.path.join(output_dir, f"{safe_key}.png"), cv2.cvtColor(array, cv2.COLOR_RGB2BGR)
+        logging.warning(f"'{original_name}' labeled as RGB but shape={array.shape}. Skipping.")
+        return None
+
+    # Otherwise numeric data
+    if array.ndim == 2:
+        return os.path.join(output_dir, f"{safe_key}_colormap.png"), apply_colormap(array, cmap_name=cmap)
+    if array.ndim == 3 and array.shape[2] == 1:
+        return os.path.join(output_dir, f"{safe_key}_colormap.png"), apply_colormap(array[..., 0], cmap_name=cmap)
+    if array.ndim == 3 and array.shape[2] == 3:
+        return os.path.join(output_dir, f"{safe_key}.png"), compose_3channel(array)
+
+    logging.debug(
+        f"Skipping PNG for '{full_key}' (original='{original_name}'), shape {array.shape}"
+        " - not 2D or 3D with 1/3 channels."
+    )
+    return None
+
+def _write_preview(full_key, array, original_name, output_dir, cmap):
+    preview = _render_preview(full_key, array, original_name, output_dir, cmap=cmap)
+    if preview is None:
+        return
+    png_path, image = preview
+    cv2.imwrite(png_path, image)
+    logging.debug(f"Saved array '{original_name}' to {png_path}.")
+
 def save_output(
     combined_result: dict,
     output_dir: str,
     save_npz: bool,
     operation: str = None,
     save_png: bool = False,
-    cmap: str = "jet"
+    cmap: str = "jet",
+    output_format: str = "npz_compressed",
+    png_workers: int = 4
 ):
     """
     - combined_result is a dictionary that may contain:
@@ -198,97 +281,65 @@ def save_output(
       * 'backward': <dict returned by pipeline.backward(...)>
       or both, if no operation was specified.
 
-    - We first flatten and save the raw arrays into .npz (if save_npz=True).
+    - We first flatten and save the raw arrays (if save_npz=True) in `output_format`
+      (see panorai.cli.writers.write_arrays for the available formats).
     - Then we optionally create PNG images from the same arrays, applying
       colormaps or normalizations as needed for visualization (without altering
-      the raw data that went into the .npz).
+      the raw data that was saved). Colormapping and PNG encoding run on a pool of
+      `png_workers` threads, since OpenCV releases the GIL while encoding.
     """
     os.makedirs(output_dir, exist_ok=True)
 
     # 1) Flatten original raw arrays BEFORE any normalization
     flat_dict = _flatten_result_for_npz(combined_result)
 
-    # 2) Save the NPZ with raw data
-    if save_npz:
-        npz_path = os.path.join(output_dir, "output.npz")
-        arrays_for_npz = {k: v[0] for k, v in flat_dict.items()}  # The original arrays
-        np.savez_compressed(npz_path, **arrays_for_npz)
-        logging.info(f"Saved all arrays to {npz_path}.")
-        logging.info("Note: The .npz file contains the most complete data. Use --no-save_npz to save storage.")
-
-    # 3) Optionally create PNG images for quick inspection
-    if save_png:
-        logging.info("Saving illustrative .png files (one per array if possible). Use --no-save_png to save storage.")
-        for full_key, (array, original_name) in flat_dict.items():
-            safe_key = full_key.replace(".", "_")
-
-            # If recognized as "rgb", handle color conversion
-            if original_name.lower() == "rgb":
-                if array.ndim == 3 and array.shape[2] == 3:
-                    # Ensure 8-bit
-                    if array.dtype != np.uint8:
-                        array = normalize_array(array)
-                    # Convert from RGB -> BGR
-                    bgr_img = cv2.cvtColor(array, cv2.COLOR_RGB2BGR)
-                    png_path = os.path.join(output_dir, f"{safe_key}.png")
-                    cv2.imwrite(png_path, bgr_img)
-                    logging.info(f"Saved RGB array '{original_name}' to {png_path} (converted to BGR).")
-                else:
-                    logging.warning(
-                        f"'{original_name}' labeled as RGB but shape={array.shape}. Skipping."
-                    )
-                continue
-
-            # Otherwise numeric data
-            if array.ndim == 2:
-                color_img = apply_colormap(array, cmap_name=cmap)
-                png_path = os.path.join(output_dir, f"{safe_key}_colormap.png")
-                cv2.imwrite(png_path, color_img)
-                logging.debug(f"Saved single-channel numeric array '{original_name}' to {png_path}.")
-
-            elif array.ndim == 3 and array.shape[2] == 1:
-                color_img = apply_colormap(array[..., 0], cmap_name=cmap)
-                png_path = os.path.join(output_dir, f"{safe_key}_colormap.png")
-                cv2.imwrite(png_path, color_img)
-                logging.debug(f"Saved single-channel numeric array '{original_name}' to {png_path}.")
-
-            elif array.ndim == 3 and array.shape[2] == 3:
-                composed = compose_3channel(array)
-                png_path = os.path.join(output_dir, f"{safe_key}.png")
-                cv2.imwrite(png_path, composed)
-                logging.debug(f"Saved 3-channel numeric array '{original_name}' as single image {png_path}.")
-
-            else:
-                logging.debug(
-                    f"Skipping PNG for '{full_key}' (original='{original_name}'), shape {array.shape}"
-                    " - not 2D or 3D with 1/3 channels."
-                )
-    else:
-        logging.debug("PNG saving is disabled. Use --save_png to enable it.")
+    with ThreadPoolExecutor(max_workers=max(1, png_workers)) as executor:
+        # 2) Queue the PNG images for quick inspection, so they encode while the raw data is written
+        futures = []
+        if save_png:
+            logging.info("Saving illustrative .png files (one per array if possible). Use --no-save_png to save storage.")
+            futures = [
+                executor.submit(_write_preview, full_key, array, original_name, output_dir, cmap)
+                for full_key, (array, original_name) in flat_dict.items()
+            ]
+        else:
+            logging.debug("PNG saving is disabled. Use --save_png to enable it.")
+
+        # 3) Save the raw data
+        if save_npz:
+            arrays = {k: v[0] for k, v in flat_dict.items()}  # The original arrays
+            path = write_arrays(arrays, output_dir, output_format=output_format, executor=executor)
+            logging.info(f"Saved all arrays to {path}.")
+            logging.info("Note: The raw output contains the most complete data. Use --no-save_npz to save storage.")
+
+        for future in futures:
+            future.result()
 
 ###############################################################################
 # Input loading logic
 ###############################################################################
 def load_input(input_path, array_files, preprocess_params):
+    from panorai.pipeline.pipeline_data import PipelineData
+
     if input_path and input_path.endswith(".npz"):
-        with np.load(input_path) as data:
-            available_keys = list(data.keys())
-            if not array_files:
-                logging.info("No --array_files specified. Using all available files in the NPZ:")
+        # Only the member headers are read here; arrays are loaded when the pipeline stacks them
+        available_keys = npz_keys(input_path)
+        if not array_files:
+            logging.info("No --array_files specified. Using all available files in the NPZ:")
+            for key in available_keys:
+                logging.info(f" - {key}")
+            array_files = available_keys
+        else:
+            missing_keys = [key for key in array_files if key not in available_keys]
+            if missing_keys:
+                logging.error("The following keys are not available in the NPZ file:")
+                for key in missing_keys:
+                    logging.error(f" - {key}")
+                logging.error("Available keys are:")
                 for key in available_keys:
-                    logging.info(f" - {key}")
-                array_files = available_keys
-            else:
-                missing_keys = [key for key in array_files if key not in available_keys]
-                if missing_keys:
-                    logging.error("The following keys are not available in the NPZ file:")
-                    for key in missing_keys:
-                        logging.error(f" - {key}")
-                    logging.error("Available keys are:")
-                    for key in available_keys:
-                        logging.error(f" - {key}")
-                    sys.exit(1)
-            pipeline_data = PipelineData.from_dict({key: data[key] for key in array_files})
+                    logging.error(f" - {key}")
+                sys.exit(1)
+        pipeline_data = PipelineData.from_npz(input_path, keys=array_files)
     elif input_path:
         # e.g. .png or .jpg
         from skimage.io import imread
@@ -318,6 +369,180 @@ def parse_kwargs(kwargs_list):
         kwargs[key] = value
     return kwargs
 
+def analyze_sampler_coverage(args, kwargs):
+    """
+    Coverage report of the sampler and projection config from the command line, as JSON.
+    """
+    from panorai.sampler.coverage import analyze_coverage
+
+    if args.projection_name != "gnomonic":
+        raise ValueError("--analyze-coverage models gnomonic faces; use --projection_name gnomonic.")
+    resolution_deg = kwargs.pop("resolution_deg", 0.5)
+    sampler = SamplerRegistry.get_sampler(args.sampler_name)
+    sampler.update(**kwargs)
+    projector = ProjectionRegistry.get_projection(args.projection_name, return_processor=True)
+    projector.config.update(**kwargs)
+    config = projector.config.config_object.config
+    report = analyze_coverage(
+        sampler.get_tangent_points(), config.fov_deg,
+        x_points=config.x_points, y_points=config.y_points, resolution_deg=resolution_deg
+    )
+    report["sampler"] = args.sampler_name
+    return report
+
+###############################################################################
+# Processing
+###############################################################################
+def build_pipeline(args):
+    # Imported here so that --list-* and --help do not pay for the pipeline imports
+    from panorai.pipeline.pipeline import ProjectionPipeline, PipelineConfig
+
+    return ProjectionPipeline(
+        projection_name=args.projection_name,
+        sampler_name=args.sampler_name,
+        pipeline_cfg=PipelineConfig(cache_dir=args.cache_dir)
+    )
+
+def run_operation(pipeline, input_data, operation, kwargs):
+    """
+    Run the requested operation and collect results in a single dictionary.
+    """
+    combined_result = {}
+
+    if operation == "project":
+        # For "project" only => store all points
+        combined_result["project"] = pipeline.project(data=input_data, **kwargs)
+
+    elif operation == "backward":
+        # For "backward" only => store the backward arrays
+        combined_result["backward"] = pipeline.backward(data=input_data.as_dict(), **kwargs)
+
+    else:
+        # No operation => do both: keep all points + backward
+        project_result = pipeline.project(data=input_data, **kwargs)
+        backward_result = pipeline.backward(data=project_result, **kwargs)
+        combined_result["project"] = project_result
+        combined_result["backward"] = backward_result
+
+    return combined_result
+
+def connect_server(address):
+    """
+    Client of the panorai-serve at `address`, or None if no server answers there.
+    """
+    if not address:
+        return None
+    from panorai.cli.server import ServerClient
+
+    client = ServerClient(address)
+    if client.health():
+        logging.info(f"Handing jobs to panorai-serve at {address}.")
+        return client
+    logging.warning(f"No panorai-serve answering at {address}; running locally.")
+    return None
+
+def build_job(input_path, args, kwargs, preprocess_params, output_dir):
+    """
+    panorai-serve job equivalent to processing one input locally.
+    """
+    return {
+        "projection_name": args.projection_name,
+        "sampler_name": args.sampler_name,
+        "operation": args.operation,
+        "kwargs": kwargs,
+        "preprocess": preprocess_params,
+        "input": {"path": os.path.abspath(input_path), "array_files": args.array_files},
+        "output": {
+            "dir": os.path.abspath(output_dir),
+            "format": args.output_format,
+            "save_npz": args.save_npz,
+            "save_png": args.save_png,
+            "cmap": args.cmap,
+            "png_workers": args.png_workers,
+        },
+    }
+
+def process_input(pipeline, input_path, args, kwargs, preprocess_params, output_dir, client=None):
+    """
+    Load one input, run the operation and save everything into one NPZ (and optionally PNG).
+    With a server client, the job runs on the server instead and `pipeline` is unused.
+    """
+    if client is not None:
+        client.submit(build_job(input_path, args, kwargs, preprocess_params, output_dir))
+        logging.info(f"panorai-serve wrote the results to {output_dir}.")
+        return
+
+    input_data = load_input(input_path, args.array_files, preprocess_params)
+    combined_result = run_operation(pipeline, input_data, args.operation, kwargs)
+    save_output(
+        combined_result,
+        output_dir=output_dir,
+        save_npz=args.save_npz,
+        operation=args.operation,
+        save_png=args.save_png,
+        cmap=args.cmap,
+        output_format=args.output_format,
+        png_workers=args.png_workers
+    )
+
+###############################################################################
+# Batch mode
+###############################################################################
+_worker = {}
+
+def _init_batch_worker(args, kwargs, preprocess_params, run_dir, root):
+    """
+    Runs once per worker process: build the pipeline that the worker keeps warm, unless
+    jobs are handed to a server.
+    """
+    setup_logging(args.verbose)
+    client = connect_server(args.server)
+    _worker.update(
+        pipeline=build_pipeline(args) if client is None else None,
+        client=client,
+        args=args,
+        kwargs=kwargs,
+        preprocess_params=preprocess_params,
+        run_dir=run_dir,
+        root=root,
+    )
+
+def _batch_task(input_path):
+    output_dir = os.path.join(_worker["run_dir"], output_name(input_path, _worker["root"]))
+    try:
+        process_input(_worker["pipeline"], input_path, _worker["args"], dict(_worker["kwargs"]),
+                      _worker["preprocess_params"], output_dir, client=_worker["client"])
+    except (Exception, SystemExit) as e:
+        return None, repr(e)
+    return output_dir, None
+
+def run_batch_mode(args, inputs, kwargs, preprocess_params):
+    if args.resume:
+        run_dir = args.resume
+        if not os.path.isdir(run_dir):
+            logging.error(f"Cannot resume: {run_dir} is not a directory.")
+            sys.exit(1)
+    else:
+        run_dir = create_unique_output_dir(args.output_dir, args)
+        save_metadata(run_dir, args)
+
+    root = args.input if args.input and os.path.isdir(args.input) else (
+        os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in inputs]) if inputs else None
+    )
+    manifest = Manifest(os.path.join(run_dir, MANIFEST_NAME))
+    counts = run_batch(
+        inputs,
+        task=_batch_task,
+        manifest=manifest,
+        workers=args.workers,
+        initializer=_init_batch_worker,
+        initargs=(args, kwargs, preprocess_params, run_dir, root),
+    )
+    logging.info(f"Batch finished in {run_dir}: {counts['done']} done, {counts['failed']} failed, "
+                 f"{counts['skipped']} skipped (already done).")
+    if counts["failed"]:
+        sys.exit(1)
+
 ###############################################################################
 # Main
 ###############################################################################
@@ -327,6 +552,10 @@ def main():
     # If user specifically did --no-verbose, override
     if args.no_verbose:
         args.verbose = False
+    if args.no_save_npz:
+        args.save_npz = False
+    if args.no_save_png:
+        args.save_png = False
 
     setup_logging(args.verbose)
 
@@ -347,6 +576,8 @@ def main():
 
     # If user wants to show pipeline and exit
     if args.show_pipeline:
+        from panorai.pipeline.pipeline import ProjectionPipeline
+
         pipeline = ProjectionPipeline(
             projection_name=args.projection_name,
             sampler_name=args.sampler_name
@@ -355,6 +586,10 @@ def main():
         logging.info(repr(pipeline))
         sys.exit(0)
 
+    if args.analyze_coverage:
+        print(json.dumps(analyze_sampler_coverage(args, parse_kwargs(args.kwargs)), indent=2))
+        sys.exit(0)
+
     # Inform about default saving
     logging.info("Note: .npz saving is on by default (use --no-save_npz to disable).")
     logging.info("Note: .png saving is on by default for illustration (use --no-save_png to disable).")
@@ -367,46 +602,19 @@ def main():
         "delta_lon": kwargs.pop("delta_lon", 0),
     }
 
+    # Batch mode: directories, glob patterns or resumed runs
+    inputs = expand_inputs(args.input) if args.input else []
+    if args.resume or len(inputs) > 1 or (args.input and (os.path.isdir(args.input) or glob.has_magic(args.input))):
+        run_batch_mode(args, inputs, kwargs, preprocess_params)
+        return
+
     # Create output dir
     output_dir = create_unique_output_dir(args.output_dir, args)
     save_metadata(output_dir, args)
 
-    # Load data
-    input_data = load_input(args.input, args.array_files, preprocess_params)
-
-    # Create pipeline
-    pipeline = ProjectionPipeline(
-        projection_name=args.projection_name,
-        sampler_name=args.sampler_name
-    )
-
-    # Collect results in a single dictionary
-    combined_result = {}
-
-    if args.operation == "project":
-        # For "project" only => store all points
-        combined_result["project"] = pipeline.project(data=input_data, **kwargs)
-
-    elif args.operation == "backward":
-        # For "backward" only => store the backward arrays
-        combined_result["backward"] = pipeline.backward(data=input_data.as_dict(), **kwargs)
-
-    else:
-        # No operation => do both: keep all points + backward
-        project_result = pipeline.project(data=input_data, **kwargs)
-        backward_result = pipeline.backward(data=project_result, **kwargs)
-        combined_result["project"] = project_result
-        combined_result["backward"] = backward_result
-
-    # Now save everything into one NPZ (and optionally PNG)
-    save_output(
-        combined_result,
-        output_dir=output_dir,
-        save_npz=args.save_npz,
-        operation=args.operation,
-        save_png=args.save_png,
-        cmap=args.cmap
-    )
+    client = connect_server(args.server) if args.input else None
+    pipeline = build_pipeline(args) if client is None else None
+    process_input(pipeline, args.input, args, kwargs, preprocess_params, output_dir, client=client)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
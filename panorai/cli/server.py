@@ -0,0 +1,830 @@
+# panorai/cli/server.py
+
+import argparse
+import collections
+import http.client
+import json
+import logging
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Number of recent jobs used for latency percentiles
+LATENCY_WINDOW = 1000
+
+# Number of warm pipelines (one per projection, sampler and kwargs) kept by default
+DEFAULT_MAX_PIPELINES = 8
+
+# Seconds a client has to read a result block before the server removes it
+DEFAULT_OUTPUT_TTL = 600.0
+
+
+###############################################################################
+# Addresses and shared memory
+###############################################################################
+def parse_address(address: str) -> Tuple[str, Any]:
+    """
+    Parse a server address.
+
+    Args:
+        address (str): A Unix socket path (anything containing "/" or ending in ".sock"),
+                       "host:port", or "http://host:port".
+
+    Returns:
+        Tuple[str, Any]: ("unix", path) or ("tcp", (host, port)).
+    """
+    if address.startswith("http://"):
+        address = address[len("http://"):].rstrip("/")
+    elif address.startswith("unix://"):
+        return "unix", address[len("unix://"):]
+    if "/" in address or address.endswith(".sock"):
+        return "unix", address
+    host, _, port = address.rpartition(":")
+    return "tcp", (host or DEFAULT_HOST, int(port))
+
+
+def _attach_shm(name: str) -> Any:
+    """
+    Attach to an existing shared memory block without letting this process' resource
+    tracker unlink it at exit (the creator hands ownership to the reader).
+    """
+    from multiprocessing import resource_tracker, shared_memory
+
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python >= 3.13
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+def array_to_shm(array: np.ndarray, owned: bool = True) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Copy an array into a new shared memory block.
+
+    Args:
+        array (np.ndarray): Array to share.
+        owned (bool): Whether this process unlinks the block. Otherwise ownership passes
+                      to the reader, which must read it with shm_to_array(..., unlink=True).
+
+    Returns:
+        Tuple[Any, Dict[str, Any]]: (SharedMemory, JSON descriptor with name, shape and dtype).
+    """
+    from multiprocessing import resource_tracker, shared_memory
+
+    shm = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+    if not owned:
+        resource_tracker.unregister(shm._name, "shared_memory")
+    np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+    return shm, {"shm": shm.name, "shape": list(array.shape), "dtype": array.dtype.str}
+
+
+def shm_to_array(descriptor: Dict[str, Any], unlink: bool = False) -> np.ndarray:
+    """
+    Copy an array out of a shared memory block described by array_to_shm().
+
+    Args:
+        descriptor (Dict[str, Any]): Descriptor with name, shape and dtype.
+        unlink (bool): Take ownership of the block and remove it afterwards.
+
+    Returns:
+        np.ndarray: A private copy of the array.
+    """
+    from multiprocessing import shared_memory
+
+    shm = shared_memory.SharedMemory(name=descriptor["shm"]) if unlink else _attach_shm(descriptor["shm"])
+    try:
+        view = np.ndarray(tuple(descriptor["shape"]), dtype=np.dtype(descriptor["dtype"]), buffer=shm.buf)
+        array = view.copy()
+        del view
+    finally:
+        shm.close()
+        if unlink:
+            shm.unlink()
+    return array
+
+
+def unlink_shm(name: str) -> bool:
+    """
+    Remove a shared memory block, if it still exists.
+
+    Returns:
+        bool: True if the block existed.
+    """
+    from multiprocessing import shared_memory
+
+    try:
+        shm = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return False
+    shm.close()
+    shm.unlink()
+    return True
+
+
+class OutputBlocks:
+    """
+    Result blocks handed to clients, which unlink them once read (see array_to_shm).
+
+    A client that never reads its result would leave the block in shared memory for
+    good, so blocks still there `ttl` seconds after the job are removed by reap().
+    """
+
+    def __init__(self, ttl: float = DEFAULT_OUTPUT_TTL) -> None:
+        self.ttl = ttl
+        self._blocks: Deque[Tuple[float, str]] = collections.deque()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._blocks)
+
+    def add(self, name: str) -> None:
+        with self._lock:
+            self._blocks.append((time.monotonic(), name))
+
+    def reap(self, everything: bool = False) -> int:
+        """
+        Remove the blocks older than the TTL (or all of them) that no client has read.
+
+        Args:
+            everything (bool): Remove every tracked block, e.g. on shutdown.
+
+        Returns:
+            int: Number of unread blocks removed.
+        """
+        deadline = time.monotonic() - self.ttl
+        expired = []
+        with self._lock:
+            while self._blocks and (everything or self._blocks[0][0] <= deadline):
+                expired.append(self._blocks.popleft()[1])
+        removed = sum(unlink_shm(name) for name in expired)
+        if removed:
+            logging.info(f"Removed {removed} result blocks that no client read.")
+        return removed
+
+
+###############################################################################
+# Client
+###############################################################################
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path: str, timeout: Optional[float] = None) -> None:
+        super().__init__("localhost", timeout=timeout)
+        self._path = path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            self.sock.settimeout(self.timeout)
+        self.sock.connect(self._path)
+
+
+class ServerClient:
+    """
+    Client of a running panorai-serve process.
+    """
+
+    def __init__(self, address: str, timeout: Optional[float] = None) -> None:
+        """
+        Args:
+            address (str): Server address, see parse_address().
+            timeout (Optional[float]): Socket timeout in seconds for every request.
+        """
+        self.address = address
+        self.timeout = timeout
+        self._kind, self._target = parse_address(address)
+
+    def _connection(self, timeout: Optional[float]) -> http.client.HTTPConnection:
+        if self._kind == "unix":
+            return _UnixHTTPConnection(self._target, timeout=timeout)
+        host, port = self._target
+        return http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def _request(self, method: str, path: str, payload: Any = None, timeout: Optional[float] = None) -> Dict[str, Any]:
+        conn = self._connection(timeout if timeout is not None else self.timeout)
+        try:
+            body = json.dumps(payload).encode("utf-8") if payload is not None else None
+            headers = {"Content-Type": "application/json"} if body is not None else {}
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            return json.loads(response.read().decode("utf-8"))
+        finally:
+            conn.close()
+
+    def health(self) -> bool:
+        """
+        Returns:
+            bool: True if a server answers at the address.
+        """
+        try:
+            return self._request("GET", "/health", timeout=1.0).get("status") == "ok"
+        except (OSError, ValueError, http.client.HTTPException):
+            return False
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns:
+            Dict[str, Any]: Queue depth, job counts, latency percentiles and cache statistics.
+        """
+        return self._request("GET", "/stats")
+
+    def submit(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run a job and wait for it (see execute_job for the job format).
+
+        Args:
+            job (Dict[str, Any]): Job description.
+
+        Returns:
+            Dict[str, Any]: The job response.
+
+        Raises:
+            RuntimeError: If the job failed on the server.
+        """
+        response = self._request("POST", "/jobs", job)
+        if response.get("status") != "done":
+            raise RuntimeError(f"panorai-serve job failed: {response.get('error')}")
+        return response
+
+    def run_arrays(self, arrays: Dict[str, np.ndarray], **job: Any) -> Dict[str, np.ndarray]:
+        """
+        Run a job on in-memory arrays, passing them both ways through shared memory.
+
+        Args:
+            arrays (Dict[str, np.ndarray]): Input arrays by name; must include "rgb".
+            **job (Any): Remaining job fields (projection_name, sampler_name, operation, kwargs...).
+
+        Returns:
+            Dict[str, np.ndarray]: Result arrays by flattened key, e.g. "project.stacked.point_1".
+        """
+        blocks = []
+        try:
+            inputs = {}
+            for key, arr in arrays.items():
+                shm, descriptor = array_to_shm(np.asarray(arr))
+                blocks.append(shm)
+                inputs[key] = descriptor
+            response = self.submit(dict(job, input={"arrays": inputs}, output={"shm": True}))
+        finally:
+            for shm in blocks:
+                shm.close()
+                shm.unlink()
+        return {key: shm_to_array(desc, unlink=True) for key, desc in response["arrays"].items()}
+
+
+###############################################################################
+# Job execution
+###############################################################################
+def resolve_path(path: str, root: Optional[str]) -> str:
+    """
+    Resolve a path named by a job, refusing it if it leaves the server root.
+
+    Jobs read and write files with the server's permissions, so a server reachable by
+    other users should be given a root (see --root).
+
+    Args:
+        path (str): Input file or output directory of a job.
+        root (Optional[str]): Directory that every job path must be under. None allows any path.
+
+    Returns:
+        str: The resolved path.
+
+    Raises:
+        PermissionError: If the path is outside the root.
+    """
+    resolved = os.path.realpath(path)
+    if root is not None:
+        root = os.path.realpath(root)
+        if os.path.commonpath([resolved, root]) != root:
+            raise PermissionError(f"{path} is outside the server root {root}.")
+    return resolved
+
+
+def execute_job(
+    pipeline: Any,
+    job: Dict[str, Any],
+    outputs: Optional[OutputBlocks] = None,
+    root: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Run one job on a warm pipeline.
+
+    Job fields:
+        - operation: "project", "backward" or None for both.
+        - kwargs: overrides for the projection and sampler.
+        - preprocess: shadow_angle, delta_lat and delta_lon.
+        - input: {"path": file, "array_files": [...]} or {"arrays": {key: shared memory descriptor}}.
+        - output: {"dir": directory, "format", "save_npz", "save_png", "cmap", "png_workers"}
+          to write files like panorai-cli, or {"shm": true} to return arrays in shared memory.
+
+    Args:
+        pipeline (Any): ProjectionPipeline for the job's projection and sampler.
+        job (Dict[str, Any]): Job description.
+        outputs (Optional[OutputBlocks]): Tracks the result blocks, to remove those never read.
+        root (Optional[str]): Directory that input paths and output directories must be under.
+
+    Returns:
+        Dict[str, Any]: {"output_dir": ...} or {"arrays": {flattened key: descriptor}}.
+    """
+    from panorai.cli.projection_pipeline_cli import _flatten_result_for_npz, load_input, save_output
+    from panorai.pipeline.context import ProjectionContext
+    from panorai.pipeline.pipeline_data import PipelineData
+
+    source = job["input"]
+    output = job.get("output") or {}
+    # Checked before any work is done
+    output_dir = None if output.get("shm") else resolve_path(output["dir"], root)
+    preprocess = job.get("preprocess") or {}
+    attached = []
+    try:
+        if "arrays" in source:
+            arrays = {}
+            for key, descriptor in source["arrays"].items():
+                shm = _attach_shm(descriptor["shm"])
+                attached.append(shm)
+                arrays[key] = np.ndarray(tuple(descriptor["shape"]), dtype=np.dtype(descriptor["dtype"]),
+                                         buffer=shm.buf)
+            data = PipelineData.from_dict(arrays)
+            if any(preprocess.values()):
+                data.preprocess(**preprocess)
+            del arrays
+        else:
+            data = load_input(resolve_path(source["path"], root), source.get("array_files"), preprocess)
+
+        kwargs = dict(job.get("kwargs") or {})
+        operation = job.get("operation")
+        ctx = ProjectionContext()
+        result = {}
+        if operation == "backward":
+            result["backward"] = pipeline.backward(data.as_dict(), context=ctx, **kwargs)
+        else:
+            result["project"] = pipeline.project(data, context=ctx, **kwargs)
+            if operation != "project":
+                result["backward"] = pipeline.backward(result["project"], context=ctx, **kwargs)
+        del data, ctx
+    finally:
+        for shm in attached:
+            try:
+                shm.close()
+            except BufferError:  # A result still references the input buffer
+                logging.debug(f"Shared memory block {shm.name} still in use; closing it later.")
+
+    if output.get("shm"):
+        descriptors = {}
+        for key, (array, _) in _flatten_result_for_npz(result).items():
+            shm, descriptor = array_to_shm(array, owned=False)
+            shm.close()
+            if outputs is not None:
+                outputs.add(descriptor["shm"])
+            descriptors[key] = descriptor
+        return {"arrays": descriptors}
+
+    save_output(
+        result,
+        output_dir=output_dir,
+        save_npz=output.get("save_npz", True),
+        operation=operation,
+        save_png=output.get("save_png", True),
+        cmap=output.get("cmap", "jet"),
+        output_format=output.get("format", "npz_compressed"),
+        png_workers=output.get("png_workers", 4),
+    )
+    return {"output_dir": output_dir}
+
+
+class Job:
+    """
+    A submitted job waiting for, or holding, its result.
+    """
+
+    def __init__(self, payload: Dict[str, Any]) -> None:
+        self.payload = payload
+        self.key = batch_key(payload)
+        self.submitted = time.perf_counter()
+        self.started: Optional[float] = None
+        self.response: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self._done = threading.Event()
+
+    def finish(self, response: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> None:
+        self.response = response
+        self.error = error
+        self._done.set()
+
+    def wait(self) -> None:
+        self._done.wait()
+
+
+def batch_key(payload: Dict[str, Any]) -> str:
+    """
+    Jobs with equal keys share a configuration and are batched together.
+    """
+    return json.dumps({
+        "projection_name": payload.get("projection_name", "gnomonic"),
+        "sampler_name": payload.get("sampler_name", "CubeSampler"),
+        "operation": payload.get("operation"),
+        "kwargs": payload.get("kwargs") or {},
+    }, sort_keys=True, default=repr)
+
+
+def pipeline_key(projection_name: str, sampler_name: Optional[str], kwargs: Optional[Dict[str, Any]] = None) -> Tuple[str, Optional[str], str]:
+    """
+    Key of the warm pipeline running jobs with this projection, sampler and kwargs.
+
+    Job kwargs change the pipeline they run on for good, so jobs only share a pipeline
+    when their kwargs are equal: every job then runs on the default configuration plus
+    its own kwargs, like a fresh local pipeline, whatever ran before it.
+    """
+    return projection_name, sampler_name, json.dumps(kwargs or {}, sort_keys=True, default=repr)
+
+
+class JobScheduler:
+    """
+    Runs jobs on warm pipelines with a pool of worker threads.
+
+    Pending jobs are grouped by configuration. A free worker takes the group of the
+    oldest pending job and runs up to `max_batch` of its jobs back to back on the same
+    pipeline, so the configuration is applied once and its geometry stays hot. There is
+    one pipeline per projection, sampler and kwargs (see pipeline_key), of which the
+    `max_pipelines` most recently used are kept.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_batch: int = 8,
+        build_pipeline: Optional[Callable[[str, Optional[str]], Any]] = None,
+        max_pipelines: int = DEFAULT_MAX_PIPELINES,
+        output_ttl: float = DEFAULT_OUTPUT_TTL,
+        root: Optional[str] = None
+    ) -> None:
+        """
+        Start the worker threads.
+
+        Args:
+            workers (int): Number of worker threads.
+            max_batch (int): Maximum number of same-configuration jobs run in one batch.
+            build_pipeline (Optional[Callable]): Builds a pipeline from (projection_name, sampler_name).
+            max_pipelines (int): Number of warm pipelines kept.
+            output_ttl (float): Seconds after which result blocks no client read are removed.
+            root (Optional[str]): Directory that job input paths and output directories must be
+                                  under (see resolve_path). None allows any path.
+        """
+        self.max_batch = max(1, max_batch)
+        self.max_pipelines = max(1, max_pipelines)
+        self.outputs = OutputBlocks(output_ttl)
+        self.root = root
+        self._build_pipeline = build_pipeline or _default_pipeline_builder()
+        self._pipelines: "collections.OrderedDict[Tuple[str, Optional[str], str], Any]" = collections.OrderedDict()
+        self._building: Dict[Tuple[str, Optional[str], str], threading.Lock] = {}
+        self._pending: "collections.OrderedDict[str, Deque[Job]]" = collections.OrderedDict()
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._batches = 0
+        self._batched_jobs = 0
+        self._latencies: Deque[float] = collections.deque(maxlen=LATENCY_WINDOW)
+        self._waits: Deque[float] = collections.deque(maxlen=LATENCY_WINDOW)
+        self._reaper_stop = threading.Event()
+        self._threads = [
+            threading.Thread(target=self._run, daemon=True, name=f"panorai-serve-{i}") for i in range(max(1, workers))
+        ]
+        self._threads.append(threading.Thread(target=self._reap, daemon=True, name="panorai-serve-reaper"))
+        for thread in self._threads:
+            thread.start()
+
+    def pipeline(self, projection_name: str, sampler_name: Optional[str], kwargs: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Warm pipeline for a projection, sampler and job kwargs, built on first use.
+
+        Pipelines are built outside the scheduler lock, so a cold one only holds up the
+        jobs that need it; concurrent requests for the same key wait for one build.
+        """
+        key = pipeline_key(projection_name, sampler_name, kwargs)
+        with self._cond:
+            if key in self._pipelines:
+                self._pipelines.move_to_end(key)
+                return self._pipelines[key]
+            building = self._building.setdefault(key, threading.Lock())
+
+        with building:
+            with self._cond:
+                if key in self._pipelines:  # Built while this thread waited
+                    return self._pipelines[key]
+            pipeline = self._build_pipeline(projection_name, sampler_name)
+            with self._cond:
+                self._pipelines[key] = pipeline
+                self._building.pop(key, None)
+                while len(self._pipelines) > self.max_pipelines:
+                    self._pipelines.popitem(last=False)
+        return pipeline
+
+    def submit(self, payload: Dict[str, Any]) -> Job:
+        """
+        Queue a job.
+
+        Args:
+            payload (Dict[str, Any]): Job description (see execute_job).
+
+        Returns:
+            Job: The queued job; call job.wait() for its result.
+        """
+        job = Job(payload)
+        with self._cond:
+            if self._stopped:
+                raise RuntimeError("Scheduler is stopped.")
+            self._pending.setdefault(job.key, collections.deque()).append(job)
+            self._cond.notify()
+        return job
+
+    def _next_batch(self) -> Optional[List[Job]]:
+        with self._cond:
+            while not self._pending and not self._stopped:
+                self._cond.wait()
+            if self._stopped:
+                return None
+            key, queue = next(iter(self._pending.items()))
+            batch = [queue.popleft() for _ in range(min(self.max_batch, len(queue)))]
+            if not queue:
+                del self._pending[key]
+            self._in_flight += len(batch)
+            self._batches += 1
+            self._batched_jobs += len(batch)
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            payload = batch[0].payload
+            try:
+                pipeline = self.pipeline(payload.get("projection_name", "gnomonic"),
+                                         payload.get("sampler_name", "CubeSampler"), payload.get("kwargs"))
+            except Exception as e:
+                pipeline, error = None, repr(e)
+            for job in batch:
+                job.started = time.perf_counter()
+                try:
+                    if pipeline is None:
+                        raise RuntimeError(error)
+                    job.finish(response=execute_job(pipeline, job.payload, outputs=self.outputs, root=self.root))
+                except Exception as e:
+                    logging.exception("panorai-serve job failed.")
+                    job.finish(error=repr(e))
+                finished = time.perf_counter()
+                with self._cond:
+                    self._in_flight -= 1
+                    if job.error:
+                        self._failed += 1
+                    else:
+                        self._completed += 1
+                    self._latencies.append(finished - job.submitted)
+                    self._waits.append(job.started - job.submitted)
+
+    def _reap(self) -> None:
+        while not self._reaper_stop.wait(max(1.0, min(self.outputs.ttl, 60.0))):
+            self.outputs.reap()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Queue depth, job counts, latency percentiles (milliseconds), and geometry cache counters and
+        memory plans per pipeline.
+        """
+        with self._cond:
+            latencies = np.array(self._latencies) * 1000.0
+            waits = np.array(self._waits) * 1000.0
+            stats = {
+                "queue_depth": sum(len(q) for q in self._pending.values()),
+                "in_flight": self._in_flight,
+                "completed": self._completed,
+                "failed": self._failed,
+                "mean_batch_size": self._batched_jobs / self._batches if self._batches else 0.0,
+                "pipelines": {
+                    f"{p}/{s}" + (f" {k}" if k != "{}" else ""): dict(pl.geometry.stats(), memory=pl.stats()["memory"])
+                    for (p, s, k), pl in self._pipelines.items()
+                },
+            }
+        for name, values in (("latency_ms", latencies), ("queue_wait_ms", waits)):
+            stats[name] = (
+                {f"p{q}": round(float(np.percentile(values, q)), 3) for q in (50, 90, 99)} if values.size else {}
+            )
+        return stats
+
+    def stop(self) -> None:
+        """Stop the workers after their current batch; pending jobs fail and unread result blocks are removed."""
+        with self._cond:
+            self._stopped = True
+            pending = [job for queue in self._pending.values() for job in queue]
+            self._pending.clear()
+            self._cond.notify_all()
+        self._reaper_stop.set()
+        for job in pending:
+            job.finish(error="Server is shutting down.")
+        for thread in self._threads:
+            thread.join()
+        self.outputs.reap(everything=True)
+
+
+def _default_pipeline_builder(cache_dir: Optional[str] = None) -> Callable[[str, Optional[str]], Any]:
+    def build(projection_name: str, sampler_name: Optional[str]) -> Any:
+        from panorai.pipeline.pipeline import PipelineConfig, ProjectionPipeline
+
+        logging.info(f"Warming up pipeline {projection_name}/{sampler_name}.")
+        return ProjectionPipeline(projection_name=projection_name, sampler_name=sampler_name,
+                                  pipeline_cfg=PipelineConfig(cache_dir=cache_dir))
+    return build
+
+
+###############################################################################
+# HTTP transport (TCP or Unix socket)
+###############################################################################
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "panorai-serve"
+    protocol_version = "HTTP/1.1"
+
+    def _reply(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._reply(200, {"status": "ok"})
+        elif self.path == "/stats":
+            self._reply(200, self.server.scheduler.stats())
+        else:
+            self._reply(404, {"status": "failed", "error": f"Unknown path {self.path}"})
+
+    def do_POST(self) -> None:
+        if self.path != "/jobs":
+            self._reply(404, {"status": "failed", "error": f"Unknown path {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length).decode("utf-8"))
+            job = self.server.scheduler.submit(payload)
+        except (ValueError, RuntimeError) as e:
+            self._reply(400, {"status": "failed", "error": repr(e)})
+            return
+        job.wait()
+        if job.error:
+            self._reply(500, {"status": "failed", "error": job.error})
+        else:
+            self._reply(200, dict(job.response, status="done"))
+
+    def address_string(self) -> str:
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logging.debug(f"{self.address_string()} - {format % args}")
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class ProjectionServer:
+    """
+    panorai-serve: keeps pipelines warm and runs jobs received over HTTP on a local
+    TCP port or a Unix socket.
+
+    Jobs read their input and write their output with the server's permissions. The Unix
+    socket only accepts the server's user, but any local user can reach a TCP port, so
+    give the scheduler a root (--root) on shared machines.
+    """
+
+    def __init__(self, address: str, scheduler: JobScheduler) -> None:
+        """
+        Bind the server.
+
+        Args:
+            address (str): Unix socket path or host:port, see parse_address().
+            scheduler (JobScheduler): Scheduler running the jobs.
+        """
+        self.address = address
+        self.scheduler = scheduler
+        kind, target = parse_address(address)
+        if kind == "unix":
+            if os.path.exists(target):
+                if ServerClient(address).health():
+                    raise RuntimeError(f"A server is already running at {target}.")
+                os.unlink(target)  # Stale socket of a crashed server
+            self._httpd = _UnixHTTPServer(target, _Handler)
+            os.chmod(target, 0o600)  # Jobs run with the server's permissions: only its user may connect
+        else:
+            self._httpd = ThreadingHTTPServer(target, _Handler)
+            self._httpd.daemon_threads = True
+        self._httpd.scheduler = scheduler
+        self._kind, self._target = kind, target
+        self._thread: Optional[threading.Thread] = None
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def start(self) -> "ProjectionServer":
+        """Serve from a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True, name="panorai-serve")
+        self._thread.start()
+        return self
+
+    def shutdown(self) -> None:
+        """Stop serving, stop the scheduler and remove the Unix socket."""
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+        self._httpd.server_close()
+        self.scheduler.stop()
+        if self._kind == "unix" and os.path.exists(self._target):
+            os.unlink(self._target)
+
+
+###############################################################################
+# Entry point
+###############################################################################
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Long-running panorai projection server with warm pipelines and geometry caches.",
+        epilog="""
+Examples:
+
+1) Serve on a Unix socket with 4 workers, warming up the default pipeline
+   panorai-serve --socket /tmp/panorai.sock --workers 4 --preload gnomonic:CubeSampler
+
+2) Hand panorai-cli jobs to it
+   PANORAI_SERVER=/tmp/panorai.sock panorai-cli --input ../images/sample2.npz --array_files rgb z
+"""
+    )
+    parser.add_argument("--socket", type=str, default=None, help="Unix socket path to listen on.")
+    parser.add_argument("--host", type=str, default=DEFAULT_HOST, help=f"Host to listen on (default={DEFAULT_HOST}).")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port to listen on (default={DEFAULT_PORT}).")
+    parser.add_argument("--workers", type=int, default=2, help="Number of worker threads (default=2).")
+    parser.add_argument("--max_batch", type=int, default=8,
+                        help="Maximum number of same-configuration jobs run as one batch (default=8).")
+    parser.add_argument("--max_pipelines", type=int, default=DEFAULT_MAX_PIPELINES,
+                        help="Number of warm pipelines kept, one per projection, sampler and kwargs "
+                             f"(default={DEFAULT_MAX_PIPELINES}).")
+    parser.add_argument("--root", type=str, default=None,
+                        help="Directory that job input paths and output directories must be under "
+                             "(default: any path the server user can access).")
+    parser.add_argument("--output_ttl", type=float, default=DEFAULT_OUTPUT_TTL,
+                        help="Seconds after which shared memory results no client read are removed "
+                             f"(default={DEFAULT_OUTPUT_TTL:g}).")
+    parser.add_argument("--cache_dir", type=str, default=None,
+                        help="Directory of the on-disk geometry cache (default: $PANORAI_CACHE_DIR).")
+    parser.add_argument("--preload", type=str, nargs="*", default=[],
+                        help="Pipelines to build at startup, as projection[:sampler].")
+    parser.add_argument("--verbose", action="store_true", help="Enable debug logging.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    logging.basicConfig(format="%(asctime)s - %(levelname)s - %(message)s",
+                        level=logging.DEBUG if args.verbose else logging.INFO)
+
+    address = args.socket or f"{args.host}:{args.port}"
+    scheduler = JobScheduler(workers=args.workers, max_batch=args.max_batch,
+                             build_pipeline=_default_pipeline_builder(args.cache_dir),
+                             max_pipelines=args.max_pipelines, output_ttl=args.output_ttl, root=args.root)
+    for spec in args.preload:
+        projection_name, _, sampler_name = spec.partition(":")
+        scheduler.pipeline(projection_name, sampler_name or None)
+
+    try:
+        server = ProjectionServer(address, scheduler)
+    except (RuntimeError, OSError) as e:
+        scheduler.stop()
+        logging.error(f"Cannot start panorai-serve: {e}")
+        sys.exit(1)
+
+    def _terminate(signum: int, frame: Any) -> None:
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, _terminate)
+    logging.info(f"panorai-serve listening on {address} with {args.workers} workers.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logging.info("Shutting down.")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+# panorai/cli/writers.py
+
+import json
+import logging
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+OUTPUT_FORMATS = ("npz_compressed", "npz", "npy", "chunked")
+
+CHUNK_BYTES = 4 * 1024 * 1024
+
+
+def _get_codec() -> Tuple[str, Callable[[bytes], bytes], Callable[[bytes], bytes]]:
+    """
+    Pick the fastest available compressor: zstd, then lz4, then zlib at level 1.
+
+    Returns:
+        Tuple[str, Callable, Callable]: (codec name, compress, decompress).
+    """
+    try:
+        import zstandard
+
+        def compress(buf: bytes) -> bytes:
+            return zstandard.ZstdCompressor(level=1).compress(buf)
+
+        def decompress(buf: bytes) -> bytes:
+            return zstandard.ZstdDecompressor().decompress(buf)
+
+        return "zstd", compress, decompress
+    except ImportError:
+        pass
+
+    try:
+        import lz4.frame
+
+        return "lz4", lz4.frame.compress, lz4.frame.decompress
+    except ImportError:
+        pass
+
+    return "zlib", lambda buf: zlib.compress(buf, 1), zlib.decompress
+
+
+def _get_decompressor(codec: str) -> Callable[[bytes], bytes]:
+    if codec == "zstd":
+        import zstandard
+        return zstandard.ZstdDecompressor().decompress
+    if codec == "lz4":
+        import lz4.frame
+        return lz4.frame.decompress
+    if codec == "zlib":
+        return zlib.decompress
+    raise ValueError(f"Unknown codec '{codec}'.")
+
+
+def write_npy_dir(arrays: Dict[str, np.ndarray], path: str) -> None:
+    """
+    Write one raw .npy file per array, so outputs can be memory-mapped with np.load(..., mmap_mode="r").
+    """
+    os.makedirs(path, exist_ok=True)
+    for key, arr in arrays.items():
+        np.save(os.path.join(path, f"{key}.npy"), arr)
+
+
+def write_chunked(arrays: Dict[str, np.ndarray], path: str, executor: Optional[ThreadPoolExecutor] = None) -> str:
+    """
+    Write arrays as a chunked store: fixed-size chunks compressed in parallel plus an index.json.
+
+    Args:
+        arrays (Dict[str, np.ndarray]): Arrays to store by name.
+        path (str): Destination directory.
+        executor (Optional[ThreadPoolExecutor]): Pool used to compress chunks (the codecs release the GIL).
+
+    Returns:
+        str: Name of the codec used.
+    """
+    codec, compress, _ = _get_codec()
+    os.makedirs(path, exist_ok=True)
+
+    jobs = []
+    index = {"codec": codec, "arrays": {}}
+    for key, arr in arrays.items():
+        arr = np.asarray(arr)
+        flat = np.ascontiguousarray(arr).reshape(-1)
+        step = max(1, CHUNK_BYTES // max(1, arr.itemsize))
+        chunks = []
+        for i, start in enumerate(range(0, max(flat.size, 1), step)):
+            name = f"{key}.{i}"
+            chunks.append(name)
+            jobs.append((name, flat[start:start + step]))
+        index["arrays"][key] = {
+            "shape": list(arr.shape),
+            "dtype": arr.dtype.str,
+            "chunks": chunks,
+        }
+
+    def _write(job: Tuple[str, np.ndarray]) -> None:
+        name, block = job
+        with open(os.path.join(path, name), "wb") as f:
+            f.write(compress(block.tobytes()))
+
+    if executor is not None:
+        list(executor.map(_write, jobs))
+    else:
+        for job in jobs:
+            _write(job)
+
+    with open(os.path.join(path, "index.json"), "w") as f:
+        json.dump(index, f, indent=2)
+    return codec
+
+
+def load_chunked(path: str) -> Dict[str, np.ndarray]:
+    """
+    Read a store written by write_chunked().
+
+    Args:
+        path (str): Store directory.
+
+    Returns:
+        Dict[str, np.ndarray]: Arrays by name.
+    """
+    with open(os.path.join(path, "index.json")) as f:
+        index = json.load(f)
+    decompress = _get_decompressor(index["codec"])
+
+    arrays = {}
+    for key, meta in index["arrays"].items():
+        dtype = np.dtype(meta["dtype"])
+        parts = []
+        for name in meta["chunks"]:
+            with open(os.path.join(path, name), "rb") as f:
+                parts.append(np.frombuffer(decompress(f.read()), dtype=dtype))
+        arrays[key] = np.concatenate(parts).reshape(meta["shape"])
+    return arrays
+
+
+def write_arrays(
+    arrays: Dict[str, np.ndarray],
+    output_dir: str,
+    output_format: str = "npz_compressed",
+    executor: Optional[ThreadPoolExecutor] = None
+) -> str:
+    """
+    Save raw arrays in the selected format.
+
+    Formats:
+        - "npz_compressed": output.npz written with np.savez_compressed (smallest, slowest).
+        - "npz": output.npz without compression.
+        - "npy": output/ directory with one memory-mappable .npy file per array.
+        - "chunked": output.chunks/ directory with row chunks compressed by zstd or lz4 when
+          installed, zlib level 1 otherwise. Read it back with load_chunked().
+
+    Args:
+        arrays (Dict[str, np.ndarray]): Arrays to save by name.
+        output_dir (str): Output directory.
+        output_format (str): One of OUTPUT_FORMATS.
+        executor (Optional[ThreadPoolExecutor]): Pool used by the chunked writer.
+
+    Returns:
+        str: Path of the written file or directory.
+    """
+    if output_format == "npz_compressed":
+        path = os.path.join(output_dir, "output.npz")
+        np.savez_compressed(path, **arrays)
+    elif output_format == "npz":
+        path = os.path.join(output_dir, "output.npz")
+        np.savez(path, **arrays)
+    elif output_format == "npy":
+        path = os.path.join(output_dir, "output")
+        write_npy_dir(arrays, path)
+    elif output_format == "chunked":
+        path = os.path.join(output_dir, "output.chunks")
+        codec = write_chunked(arrays, path, executor=executor)
+        logging.debug(f"Chunked store written with codec '{codec}'.")
+    else:
+        raise ValueError(f"Unknown output format '{output_format}'. Available formats: {OUTPUT_FORMATS}.")
+    return path
@@ -0,0 +1,43 @@
+# panorai/log.py
+
+import logging
+import os
+import sys
+from typing import Optional, TextIO
+
+# Loggers used across the package: module loggers live under "panorai", the older
+# component loggers under "pipeline" and "sampler".
+PACKAGE_LOGGERS = ("panorai", "pipeline", "sampler")
+
+for _name in PACKAGE_LOGGERS:
+    logging.getLogger(_name).addHandler(logging.NullHandler())
+
+_handler: Optional[logging.Handler] = None
+
+
+def setup_logging(level: Optional[int] = None, stream: TextIO = sys.stdout) -> None:
+    """
+    Send panorai log records to a stream.
+
+    Importing panorai never touches logging handlers; applications that do not configure
+    logging themselves can call this instead. Calling it again replaces the handler.
+
+    Args:
+        level (Optional[int]): Logging level. Defaults to DEBUG if the DEBUG environment
+            variable is "true" or "1", INFO otherwise.
+        stream (TextIO): Destination stream. Defaults to stdout.
+    """
+    if level is None:
+        level = logging.DEBUG if os.environ.get('DEBUG', 'False').lower() in ('true', '1') else logging.INFO
+
+    global _handler
+    handler = logging.StreamHandler(stream)
+    handler.setLevel(level)
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    for name in PACKAGE_LOGGERS:
+        logger = logging.getLogger(name)
+        logger.setLevel(level)
+        if _handler is not None:
+            logger.removeHandler(_handler)
+        logger.addHandler(handler)
+    _handler = handler
@@ -1,14 +1,37 @@
 # pipeline/__init__.py
 
-from .pipeline import ProjectionPipeline, PipelineConfig
-from .pipeline_data import PipelineData
-from .utils.resizer import ResizerConfig
-from .utils.preprocess_eq import PreprocessEquirectangularImage
-
-__all__ = [
-    "ProjectionPipeline",
-    "PipelineConfig",
-    "PipelineData",
-    "ResizerConfig",
-    "PreprocessEquirectangularImage",
-]
\ No newline at end of file
+# Public names are resolved on first access, so importing a light submodule such as
+# panorai.pipeline.sources does not pull in OpenCV, scipy or the projections submodule.
+import importlib
+from typing import Any
+
+_LAZY_ATTRS = {
+    "ProjectionPipeline": ".pipeline",
+    "PipelineConfig": ".pipeline",
+    "PipelineData": ".pipeline_data",
+    "ProjectionContext": ".context",
+    "ProjectionCancelled": ".context",
+    "IncrementalBlend": ".incremental",
+    "SparseProjectionOperator": ".operators",
+    "ViewRenderer": ".viewport",
+    "LatLonBox": ".regions",
+    "Cone": ".regions",
+    "MaskRegion": ".regions",
+    "ResultCache": ".result_cache",
+    "ResizerConfig": ".utils.resizer",
+    "PreprocessEquirectangularImage": ".utils.preprocess_eq",
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_ATTRS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,144 @@
+import json
+import logging
+import os
+import platform
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger('pipeline.autotune')
+
+DEFAULT_TUNING_FILE = os.path.join("~", ".cache", "panorai", "autotune.json")
+
+# joblib backends tried by the calibration, besides running sequentially
+BACKENDS = ("threading", "loky")
+
+
+def machine_id() -> str:
+    """
+    Identifier of the machine the calibration ran on.
+
+    Returns:
+        str: Host name, architecture and CPU count.
+    """
+    return f"{platform.node()}/{platform.machine()}/{os.cpu_count()}"
+
+
+def candidate_settings(max_workers: Optional[int] = None) -> List[Tuple[str, int]]:
+    """
+    (backend, n_jobs) pairs tried by the calibration.
+
+    Args:
+        max_workers (Optional[int]): Largest worker count. Defaults to the CPU count.
+
+    Returns:
+        List[Tuple[str, int]]: Sequential first, then powers of two and max_workers for every backend.
+    """
+    max_workers = max(1, max_workers or os.cpu_count() or 1)
+    counts = sorted({2 ** k for k in range(1, max_workers.bit_length()) if 2 ** k < max_workers} | {max_workers})
+    counts = [n for n in counts if n > 1]
+    return [("sequential", 1)] + [(backend, n) for backend in BACKENDS for n in counts]
+
+
+def calibrate(
+    run: Callable[[str, int], Any],
+    candidates: Sequence[Tuple[str, int]],
+    warm_up: Optional[Callable[[str, int], Any]] = None
+) -> Tuple[Tuple[str, int], Dict[str, float]]:
+    """
+    Time a workload under every candidate setting and pick the fastest.
+
+    Args:
+        run (Callable[[str, int], Any]): Runs the workload with (backend, n_jobs).
+        candidates (Sequence[Tuple[str, int]]): Settings to try.
+        warm_up (Optional[Callable[[str, int], Any]]): Called untimed before each setting, e.g. to
+                                                       start worker processes that later calls reuse.
+
+    Returns:
+        Tuple[Tuple[str, int], Dict[str, float]]: The fastest (backend, n_jobs) and the seconds taken
+                                                  by every setting, keyed "backend:n_jobs".
+    """
+    timings: Dict[str, float] = {}
+    best, best_time = candidates[0], float("inf")
+    for backend, n_jobs in candidates:
+        if warm_up is not None:
+            warm_up(backend, n_jobs)
+        start = time.perf_counter()
+        run(backend, n_jobs)
+        elapsed = time.perf_counter() - start
+        timings[f"{backend}:{n_jobs}"] = elapsed
+        if elapsed < best_time:
+            best, best_time = (backend, n_jobs), elapsed
+    return best, timings
+
+
+class AutoTuner:
+    """
+    Calibrated parallel settings, persisted in a JSON file per machine and configuration.
+
+    The file maps machine_id() to entries keyed by a description of the workload (shapes,
+    dtypes, projection, sampler and blender), so a setting is only measured once per
+    machine and reused until the shapes change. Writes go through a temporary file and
+    an atomic rename, so concurrent processes never read a partial file.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        """
+        Initialize the tuner.
+
+        Args:
+            path (Optional[str]): JSON file of the calibrations. Defaults to ~/.cache/panorai/autotune.json.
+        """
+        self.path = os.path.abspath(os.path.expanduser(path or DEFAULT_TUNING_FILE))
+        self._lock = threading.Lock()
+        self._memory: Dict[str, Dict[str, Any]] = {}
+
+    def __repr__(self) -> str:
+        return f"AutoTuner(path='{self.path}')"
+
+    def _read(self) -> Dict[str, Any]:
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Stored calibration of a workload on this machine.
+
+        Args:
+            key (str): Workload description.
+
+        Returns:
+            Optional[Dict[str, Any]]: {"backend", "n_jobs", "timings"}, or None if not calibrated yet.
+        """
+        with self._lock:
+            if key in self._memory:
+                return self._memory[key]
+            entry = self._read().get(machine_id(), {}).get(key)
+            if entry is not None:
+                self._memory[key] = entry
+            return entry
+
+    def record(self, key: str, entry: Dict[str, Any]) -> None:
+        """
+        Store the calibration of a workload on this machine.
+
+        Args:
+            key (str): Workload description.
+            entry (Dict[str, Any]): {"backend", "n_jobs", "timings"}.
+        """
+        with self._lock:
+            self._memory[key] = entry
+            data = self._read()
+            data.setdefault(machine_id(), {})[key] = entry
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                tmp_path = f"{self.path}.{uuid.uuid4().hex}.tmp"
+                with open(tmp_path, "w") as f:
+                    json.dump(data, f, indent=2, sort_keys=True)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.warning(f"Could not persist the calibration to {self.path}: {e}")
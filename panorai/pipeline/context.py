@@ -0,0 +1,89 @@
+import threading
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .pipeline_data import PipelineData
+
+
+class ProjectionCancelled(Exception):
+    """
+    Raised inside a projection whose context was cancelled.
+    """
+    pass
+
+
+class ProjectionContext:
+    """
+    Per-request state of a projection.
+
+    Holds what a forward pass needs to remember for the matching backward pass (the
+    original PipelineData, its stacking order and the stacked shape), so requests that
+    share one pipeline do not overwrite each other's state, including the faces skipped
+    because they read no valid data and the projection and sampler config the faces were
+    projected with (per-request kwargs change the shared projector). It also carries a
+    cancellation flag that the pipeline checks between faces.
+    """
+
+    def __init__(
+        self,
+        original_data: Optional[PipelineData] = None,
+        keys_order: Optional[List[str]] = None,
+        stacked_shape: Optional[Tuple[int, ...]] = None,
+        skipped_faces: Optional[Set[Optional[int]]] = None,
+        projection_config: Optional[Dict[str, Any]] = None,
+        sampler_params: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Initialize a context.
+
+        Args:
+            original_data (Optional[PipelineData]): Input of the forward pass, used for un-stacking.
+            keys_order (Optional[List[str]]): Keys order returned by PipelineData.stack_all().
+            stacked_shape (Optional[Tuple[int, ...]]): Shape of the stacked equirectangular data.
+            skipped_faces (Optional[Set[Optional[int]]]): Tangent point indices of the faces skipped
+                                                          by the forward pass (None for a single projection).
+            projection_config (Optional[Dict[str, Any]]): Projector config of the forward pass.
+            sampler_params (Optional[Dict[str, Any]]): Sampler parameters of the forward pass.
+        """
+        self.original_data = original_data
+        self.keys_order = keys_order
+        self.stacked_shape = stacked_shape
+        self.skipped_faces = set(skipped_faces or ())
+        self.projection_config = projection_config
+        self.sampler_params = sampler_params
+        self._cancelled = threading.Event()
+
+    def __repr__(self) -> str:
+        return (f"ProjectionContext(keys_order={self.keys_order}, stacked_shape={self.stacked_shape}, "
+                f"skipped_faces={sorted(self.skipped_faces, key=str)}, cancelled={self.cancelled})")
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        """Ask the projection using this context to stop at the next face."""
+        self._cancelled.set()
+
+    def check(self) -> None:
+        """
+        Raises:
+            ProjectionCancelled: If the context was cancelled.
+        """
+        if self._cancelled.is_set():
+            raise ProjectionCancelled("Projection was cancelled.")
+
+    def unstack(self, stacked: np.ndarray) -> Optional[dict]:
+        """
+        Views of a stacked result per original key, if the input was PipelineData.
+
+        Args:
+            stacked (np.ndarray): Stacked face or equirectangular result.
+
+        Returns:
+            Optional[dict]: Unstacked arrays by key, or None for plain array inputs.
+        """
+        if self.original_data is None or not self.keys_order:
+            return None
+        return self.original_data.unstack_all(stacked, self.keys_order)
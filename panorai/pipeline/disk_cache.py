@@ -0,0 +1,218 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger('pipeline.disk_cache')
+
+DEFAULT_CACHE_MAX_BYTES = 4 * 1024 ** 3
+
+# Seconds after which a .tmp-/.trash- directory is assumed left behind by a crashed process
+STALE_SECONDS = 3600.0
+
+
+def cache_key(*parts: Any) -> str:
+    """
+    Content address of a cache entry.
+
+    Args:
+        *parts (Any): JSON-serializable description of the entry (kind, config signature, shapes...).
+
+    Returns:
+        str: Hex digest identifying the entry.
+    """
+    payload = json.dumps(parts, sort_keys=True, default=repr).encode("utf-8")
+    return hashlib.blake2b(payload, digest_size=20).hexdigest()
+
+
+class GeometryDiskCache:
+    """
+    Content-addressed on-disk store of geometry arrays, shared between processes.
+
+    Every entry is a directory named by its key and holding one .npy file per array.
+    Entries are written to a private temporary directory and published with a single
+    atomic rename, so concurrent writers never expose partial entries and the first
+    one to finish wins. Arrays are memory-mapped on load. When the store grows past
+    `max_bytes`, the least recently used entries are removed.
+
+    The size of the store is only measured (by listing every entry) when the last
+    measure plus this process's writes since exceed the budget, or after writing an
+    eighth of the budget, which bounds the overshoot caused by other processes.
+    """
+
+    def __init__(self, root: str, max_bytes: int = DEFAULT_CACHE_MAX_BYTES) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            root (str): Directory holding the cache entries. Created if missing.
+            max_bytes (int): Size budget of the cache directory in bytes.
+        """
+        self.root = os.path.abspath(os.path.expanduser(root))
+        self.max_bytes = max_bytes
+        self._measured: Optional[int] = None
+        self._written = 0
+        os.makedirs(self.root, exist_ok=True)
+
+    def __repr__(self) -> str:
+        return f"GeometryDiskCache(root='{self.root}', max_bytes={self.max_bytes})"
+
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def load(self, key: str, names: Tuple[str, ...]) -> Optional[Tuple[np.ndarray, ...]]:
+        """
+        Load an entry as read-only memory maps.
+
+        Args:
+            key (str): Entry key from cache_key().
+            names (Tuple[str, ...]): Array names to load, in order.
+
+        Returns:
+            Optional[Tuple[np.ndarray, ...]]: The arrays, or None if the entry is missing or incomplete.
+        """
+        entry = self._entry_dir(key)
+        try:
+            arrays = tuple(np.load(os.path.join(entry, f"{name}.npy"), mmap_mode="r") for name in names)
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+
+        try:
+            os.utime(entry)  # Mark as recently used for eviction
+        except OSError:
+            pass
+        return arrays
+
+    def load_all(self, key: str) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Load every array of an entry as read-only memory maps.
+
+        Args:
+            key (str): Entry key from cache_key().
+
+        Returns:
+            Optional[Dict[str, np.ndarray]]: Arrays by name, or None if the entry is missing.
+        """
+        try:
+            names = tuple(sorted(name[:-4] for name in os.listdir(self._entry_dir(key)) if name.endswith(".npy")))
+        except OSError:
+            return None
+        arrays = self.load(key, names) if names else None
+        return dict(zip(names, arrays)) if arrays is not None else None
+
+    def store(self, key: str, arrays: Dict[str, np.ndarray]) -> None:
+        """
+        Atomically publish an entry.
+
+        Write failures (e.g. a full disk or a read-only cache directory) are logged and
+        the entry is simply not cached.
+
+        Args:
+            key (str): Entry key from cache_key().
+            arrays (Dict[str, np.ndarray]): Arrays to store by name.
+        """
+        entry = self._entry_dir(key)
+        if os.path.isdir(entry):
+            return
+
+        tmp_dir = os.path.join(self.root, f".tmp-{uuid.uuid4().hex}")
+        try:
+            os.makedirs(tmp_dir)
+            for name, arr in arrays.items():
+                np.save(os.path.join(tmp_dir, f"{name}.npy"), np.ascontiguousarray(arr))
+            size = sum(f.stat().st_size for f in os.scandir(tmp_dir))
+            os.rename(tmp_dir, entry)
+            logger.debug(f"Stored geometry entry {key}.")
+        except OSError as e:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            if not os.path.isdir(entry):  # Otherwise another process published the same entry first
+                logger.debug(f"Could not store geometry entry {key}: {e}")
+            return
+
+        self._written += size
+        if (self._measured is None or self._measured + self._written > self.max_bytes
+                or self._written > self.max_bytes // 8):
+            self.evict()
+
+    def entries(self) -> List[Tuple[str, float, int]]:
+        """
+        List published entries.
+
+        Returns:
+            List[Tuple[str, float, int]]: (key, last use time, size in bytes) per entry.
+        """
+        result = []
+        for name in os.listdir(self.root):
+            if name.startswith("."):
+                continue
+            path = self._entry_dir(name)
+            try:
+                size = sum(f.stat().st_size for f in os.scandir(path) if f.is_file())
+                result.append((name, os.stat(path).st_mtime, size))
+            except OSError:
+                continue
+        return result
+
+    def size(self) -> int:
+        """
+        Total size of the published entries.
+
+        Returns:
+            int: Size in bytes.
+        """
+        return sum(size for _, _, size in self.entries())
+
+    def evict(self) -> None:
+        """
+        Remove least recently used entries until the cache fits in max_bytes.
+
+        Entries are renamed out of the way before deletion, so readers never see a
+        half-deleted entry. Files already memory-mapped by other processes stay valid.
+        Temporary directories older than STALE_SECONDS, left by crashed writers, are
+        removed as well.
+        """
+        self._sweep()
+        entries = sorted(self.entries(), key=lambda e: e[1])
+        total = sum(size for _, _, size in entries)
+        for key, _, size in entries:
+            if total <= self.max_bytes:
+                break
+            trash = os.path.join(self.root, f".trash-{uuid.uuid4().hex}")
+            try:
+                os.rename(self._entry_dir(key), trash)
+            except OSError:
+                continue
+            shutil.rmtree(trash, ignore_errors=True)
+            total -= size
+            logger.debug(f"Evicted geometry entry {key} ({size} bytes).")
+        self._measured = total
+        self._written = 0
+
+    def _sweep(self) -> None:
+        deadline = time.time() - STALE_SECONDS
+        try:
+            names = [name for name in os.listdir(self.root) if name.startswith((".tmp-", ".trash-"))]
+        except OSError:
+            return
+        for name in names:
+            path = os.path.join(self.root, name)
+            try:
+                if os.stat(path).st_mtime > deadline:
+                    continue  # Possibly still being written
+            except OSError:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            logger.debug(f"Removed stale cache directory {name}.")
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        for key, _, _ in self.entries():
+            shutil.rmtree(self._entry_dir(key), ignore_errors=True)
+        self._measured = 0
+        self._written = 0
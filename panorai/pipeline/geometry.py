@@ -0,0 +1,440 @@
+import logging
+import math
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .disk_cache import GeometryDiskCache, cache_key
+from .validity import footprint_runs
+
+logger = logging.getLogger('pipeline.geometry')
+
+
+def projection_signature(projector: Any) -> Tuple[Tuple[str, str], ...]:
+    """
+    Build a hashable signature of the projector's current configuration.
+
+    Args:
+        projector (Any): A ProjectionProcessor returned by the ProjectionRegistry.
+
+    Returns:
+        Tuple[Tuple[str, str], ...]: Sorted (name, repr(value)) pairs of the projection config.
+    """
+    params = projector.config.config_object.config.model_dump()
+    return tuple(sorted((k, repr(v)) for k, v in params.items()))
+
+
+def compute_forward_maps(projector: Any, img_shape: Tuple[int, ...]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute the remap grid used by the forward (equirectangular -> face) projection.
+
+    Mirrors ProjectionProcessor.forward without the interpolation step.
+
+    Args:
+        projector (Any): A ProjectionProcessor configured for the desired tangent point.
+        img_shape (Tuple[int, ...]): Shape of the equirectangular input (H, W[, C]).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (map_x, map_y) as float32 arrays of the face shape.
+    """
+    x_grid, y_grid = projector.grid_generation.projection_grid()
+    lat, lon = projector.projection.from_projection_to_spherical(x_grid, y_grid)
+    map_x, map_y = projector.transformer.spherical_to_image_coords(lat, lon, tuple(img_shape[:2]))
+    return map_x.astype(np.float32), map_y.astype(np.float32)
+
+
+def scaled_shape(img_shape: Tuple[int, ...], resize_factor: float) -> Tuple[int, ...]:
+    """
+    Shape of an image resized by `resize_factor`, rounded like ImageResizer.
+
+    Args:
+        img_shape (Tuple[int, ...]): (H, W[, C]).
+        resize_factor (float): Resize factor.
+
+    Returns:
+        Tuple[int, ...]: (H', W'[, C]).
+    """
+    if resize_factor == 1.0:
+        return tuple(img_shape)
+    h, w = (max(1, int(n * resize_factor)) for n in img_shape[:2])
+    return (h, w, *img_shape[2:])
+
+
+def compute_resampled_forward_maps(
+    projector: Any,
+    img_shape: Tuple[int, ...],
+    resize_factor: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Forward grid that samples the full-resolution image as if it had been resized first.
+
+    The grid is computed for the resized equirectangular shape and mapped back onto the
+    original pixels. When downsampling, every face pixel gets k x k taps (k = ceil(1 / factor))
+    spread evenly over the footprint of its resized pixel; averaging them is an area
+    (box) filter, so the image is resampled once, with anti-aliasing, instead of being
+    resized and then projected. Longitudes wrap around the seam.
+
+    Args:
+        projector (Any): A ProjectionProcessor configured for the desired tangent point.
+        img_shape (Tuple[int, ...]): Shape of the full-resolution equirectangular input.
+        resize_factor (float): Resize factor applied before projecting.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (map_x, map_y) as float32 arrays of shape (taps, face_h, face_w).
+    """
+    h, w = img_shape[:2]
+    small_h, small_w = scaled_shape(img_shape, resize_factor)[:2]
+    map_x, map_y = compute_forward_maps(projector, (small_h, small_w))
+
+    k = max(1, math.ceil(1.0 / resize_factor - 1e-9))
+    offsets = ((np.arange(k, dtype=np.float32) + 0.5) / k)[:, None, None]
+    xs = (map_x[None] + offsets) * (w / small_w) - 0.5
+    ys = (map_y[None] + offsets) * (h / small_h) - 0.5
+    xs = np.mod(xs + 0.5, w) - 0.5
+
+    taps_x = np.broadcast_to(xs[None], (k, k) + map_x.shape).reshape(k * k, *map_x.shape)
+    taps_y = np.broadcast_to(ys[:, None], (k, k) + map_y.shape).reshape(k * k, *map_y.shape)
+    return np.ascontiguousarray(taps_x, dtype=np.float32), np.ascontiguousarray(taps_y, dtype=np.float32)
+
+
+def compute_backward_maps(projector: Any) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compute the remap grid used by the backward (face -> equirectangular) projection.
+
+    Mirrors ProjectionProcessor.backward without the interpolation step. The vertical flip
+    applied by the processor is folded into the grid, so remapping with these maps
+    yields the equirectangular image in its final orientation.
+
+    Args:
+        projector (Any): A ProjectionProcessor configured for the desired tangent point.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: (map_x, map_y, mask) of the equirectangular shape.
+    """
+    lon_grid, lat_grid = projector.grid_generation.spherical_grid()
+    x, y, mask = projector.projection.from_spherical_to_projection(lat_grid, lon_grid)
+    map_x, map_y = projector.transformer.projection_to_image_coords(x, y, projector.config.config_object)
+    return (
+        np.ascontiguousarray(map_x[::-1], dtype=np.float32),
+        np.ascontiguousarray(map_y[::-1], dtype=np.float32),
+        np.ascontiguousarray(mask[::-1], dtype=bool),
+    )
+
+
+def footprint(map_x: np.ndarray, map_y: np.ndarray, mask: np.ndarray, face_shape: Tuple[int, int]) -> np.ndarray:
+    """
+    Boolean footprint of a face on the equirectangular grid.
+
+    Args:
+        map_x (np.ndarray): Backward map x-coordinates.
+        map_y (np.ndarray): Backward map y-coordinates.
+        mask (np.ndarray): Validity mask returned by the projection strategy.
+        face_shape (Tuple[int, int]): (height, width) of the face.
+
+    Returns:
+        np.ndarray: True where the equirectangular pixel samples inside the face.
+    """
+    h, w = face_shape
+    return mask & (map_x >= 0) & (map_x <= w - 1) & (map_y >= 0) & (map_y <= h - 1)
+
+
+def footprint_bbox(mask: np.ndarray) -> Tuple[slice, slice]:
+    """
+    Bounding box of a backward mask, grown by one pixel.
+
+    The extra pixel is outside the footprint, hence zero, so a distance transform of the
+    crop equals the distance transform of the whole image over the footprint.
+
+    Args:
+        mask (np.ndarray): Boolean backward mask on the equirectangular grid.
+
+    Returns:
+        Tuple[slice, slice]: Row and column slices. Empty footprints give empty slices.
+    """
+    rows = np.flatnonzero(mask.any(axis=1))
+    cols = np.flatnonzero(mask.any(axis=0))
+    if rows.size == 0:
+        return slice(0, 0), slice(0, 0)
+    h, w = mask.shape
+    return (slice(max(rows[0] - 1, 0), min(rows[-1] + 2, h)),
+            slice(max(cols[0] - 1, 0), min(cols[-1] + 2, w)))
+
+
+def feather_weights(valid_mask: np.ndarray) -> np.ndarray:
+    """
+    Feathered blending weights of a footprint, as used by backward_with_sampler.
+
+    Args:
+        valid_mask (np.ndarray): Boolean or {0, 1} footprint.
+
+    Returns:
+        np.ndarray: float32 weights in [0, 1] that fade towards the footprint edges.
+    """
+    from scipy.ndimage import distance_transform_edt
+
+    valid_mask = valid_mask.astype(np.float32)
+    distance = distance_transform_edt(valid_mask)
+    max_distance = distance.max()
+    if max_distance == 0:
+        return valid_mask
+    return (distance / max_distance).astype(np.float32)
+
+
+def remap(
+    img: np.ndarray,
+    map_x: np.ndarray,
+    map_y: np.ndarray,
+    interpolation: int = cv2.INTER_LINEAR,
+    border_mode: int = cv2.BORDER_CONSTANT,
+    border_value: Any = 0,
+    mask: Optional[np.ndarray] = None,
+    tile_rows: Optional[int] = None
+) -> np.ndarray:
+    """
+    Resample an image through a precomputed grid.
+
+    Grids with a leading taps axis (see compute_resampled_forward_maps) are resampled
+    once per tap and averaged; integer images are rounded back to their dtype.
+    With tile_rows, the grid is resampled in bands of rows, which bounds the temporary
+    buffers (the tap accumulator) to one band.
+
+    Args:
+        img (np.ndarray): Input image (H, W) or (H, W, C).
+        map_x (np.ndarray): float32 x-coordinates into img, (h, w) or (taps, h, w).
+        map_y (np.ndarray): float32 y-coordinates into img, same shape as map_x.
+        interpolation (int): OpenCV interpolation flag.
+        border_mode (int): OpenCV border mode.
+        border_value (Any): Value used for constant borders.
+        mask (Optional[np.ndarray]): Optional boolean mask applied to the output.
+        tile_rows (Optional[int]): Rows of the grid resampled at once. None resamples it whole.
+
+    Returns:
+        np.ndarray: The resampled image. A trailing channel axis of size 1 is preserved.
+    """
+    rows = map_x.shape[-2]
+    if tile_rows is not None and rows > tile_rows:
+        out = None
+        for r in range(0, rows, tile_rows):
+            band = slice(r, min(r + tile_rows, rows))
+            tile = remap(img, map_x[..., band, :], map_y[..., band, :], interpolation, border_mode, border_value,
+                         mask=mask[band] if mask is not None else None)
+            if out is None:
+                out = np.empty((rows,) + tile.shape[1:], dtype=tile.dtype)
+            out[band] = tile
+        return out
+
+    if map_x.ndim == 3:
+        acc = None
+        for tap_x, tap_y in zip(map_x, map_y):
+            tap = remap(img, tap_x, tap_y, interpolation, border_mode, border_value).astype(np.float32)
+            if acc is None:
+                acc = tap
+            else:
+                acc += tap
+        acc /= len(map_x)
+        out = np.rint(acc).astype(img.dtype) if np.issubdtype(img.dtype, np.integer) else acc.astype(img.dtype)
+        if mask is not None:
+            out *= mask[..., np.newaxis] if out.ndim == 3 else mask
+        return out
+
+    out = cv2.remap(
+        img, map_x, map_y,
+        interpolation=interpolation,
+        borderMode=border_mode,
+        borderValue=border_value
+    )
+    if img.ndim == 3 and out.ndim == 2:
+        out = out[..., np.newaxis]
+    if mask is not None:
+        out *= mask[..., np.newaxis] if out.ndim == 3 else mask
+    return out
+
+
+class GeometryCache:
+    """
+    LRU cache of per-face remap grids, optionally backed by a GeometryDiskCache.
+
+    Entries are keyed by the projection signature (which includes the tangent point) and,
+    for forward grids, by the equirectangular shape. Every pipeline owns one instance, so
+    repeated calls with the same configuration never recompute a grid. With a disk tier,
+    grids computed by any process are memory-mapped by the others instead of recomputed.
+    """
+
+    def __init__(self, max_entries: int = 512, disk: Optional[GeometryDiskCache] = None) -> None:
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries (int): Maximum number of grids kept in memory.
+            disk (Optional[GeometryDiskCache]): Persistent tier shared across processes.
+        """
+        self.max_entries = max_entries
+        self.disk = disk
+        self._entries: "OrderedDict[Hashable, Tuple[np.ndarray, ...]]" = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Drop every grid held in memory. The disk tier is left untouched."""
+        self._entries.clear()
+
+    def _get_or_compute(
+        self,
+        key: Hashable,
+        names: Tuple[str, ...],
+        compute: Callable[[], Tuple[np.ndarray, ...]]
+    ) -> Tuple[np.ndarray, ...]:
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+        value = None
+        if self.disk is not None:
+            disk_key = cache_key(*key)
+            value = self.disk.load(disk_key, names)
+            if value is not None:
+                self.disk_hits += 1
+
+        if value is None:
+            self.misses += 1
+            value = compute()
+            if self.disk is not None:
+                self.disk.store(disk_key, dict(zip(names, value)))
+
+        self._entries[key] = value
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return value
+
+    def forward(
+        self,
+        projector: Any,
+        img_shape: Tuple[int, ...],
+        resize_factor: float = 1.0
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Forward grid for the projector's current configuration.
+
+        Args:
+            projector (Any): A configured ProjectionProcessor.
+            img_shape (Tuple[int, ...]): Shape of the equirectangular input.
+            resize_factor (float): Resize factor folded into the grid (see compute_resampled_forward_maps).
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (map_x, map_y); with a leading taps axis if resize_factor != 1.
+        """
+        key = ("forward", projection_signature(projector), tuple(int(v) for v in img_shape[:2]))
+        if resize_factor == 1.0:
+            return self._get_or_compute(key, ("map_x", "map_y"), lambda: compute_forward_maps(projector, img_shape))
+        return self._get_or_compute(
+            key + (float(resize_factor),), ("map_x", "map_y"),
+            lambda: compute_resampled_forward_maps(projector, img_shape, resize_factor)
+        )
+
+    def forward_footprint(
+        self,
+        projector: Any,
+        img_shape: Tuple[int, ...],
+        resize_factor: float,
+        block: int
+    ) -> np.ndarray:
+        """
+        Blocks of the equirectangular input read by the forward grid, as row runs.
+
+        Args:
+            projector (Any): A configured ProjectionProcessor.
+            img_shape (Tuple[int, ...]): Shape of the equirectangular input.
+            resize_factor (float): Resize factor folded into the grid.
+            block (int): Block size in pixels (see validity.footprint_runs).
+
+        Returns:
+            np.ndarray: int32 (n, 3) runs of (block row, first block column, last block column).
+        """
+        key = ("footprint", projection_signature(projector), tuple(int(v) for v in img_shape[:2]),
+               float(resize_factor), int(block))
+
+        def compute() -> Tuple[np.ndarray]:
+            map_x, map_y = self.forward(projector, img_shape, resize_factor)
+            return (footprint_runs(map_x, map_y, img_shape, block),)
+
+        return self._get_or_compute(key, ("runs",), compute)[0]
+
+    def backward(self, projector: Any) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Backward grid and mask for the projector's current configuration.
+
+        Args:
+            projector (Any): A configured ProjectionProcessor.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: (map_x, map_y, mask).
+        """
+        key = ("backward", projection_signature(projector))
+        return self._get_or_compute(key, ("map_x", "map_y", "mask"), lambda: compute_backward_maps(projector))
+
+    def backward_crop(self, projector: Any) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Backward grid and mask cropped to the bounding box of the face's footprint.
+
+        Only the crop is kept, so the cache holds a fraction of the full-size grids.
+
+        Args:
+            projector (Any): A configured ProjectionProcessor.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: (box, map_x, map_y, mask), box being
+                                                                   [row start, row stop, col start, col stop].
+        """
+        key = ("backward_crop", projection_signature(projector))
+
+        def compute() -> Tuple[np.ndarray, ...]:
+            map_x, map_y, mask = compute_backward_maps(projector)
+            box = footprint_bbox(mask)
+            return (
+                np.array([box[0].start, box[0].stop, box[1].start, box[1].stop], dtype=np.int64),
+                np.ascontiguousarray(map_x[box]),
+                np.ascontiguousarray(map_y[box]),
+                np.ascontiguousarray(mask[box]),
+            )
+
+        return self._get_or_compute(key, ("box", "map_x", "map_y", "mask"), compute)
+
+    def weights(self, projector: Any) -> np.ndarray:
+        """
+        Geometric feather weights of the projector's current face on the equirectangular grid.
+
+        Args:
+            projector (Any): A configured ProjectionProcessor.
+
+        Returns:
+            np.ndarray: float32 feather weights.
+        """
+        key = ("weights", projection_signature(projector))
+
+        def compute() -> Tuple[np.ndarray]:
+            map_x, map_y, mask = self.backward(projector)
+            params = projector.config.config_object.config
+            return (feather_weights(footprint(map_x, map_y, mask, (params.y_points, params.x_points))),)
+
+        return self._get_or_compute(key, ("weights",), compute)[0]
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Cache counters.
+
+        Returns:
+            Dict[str, int]: Number of entries, memory hits, disk hits and misses.
+        """
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,146 @@
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from ..blender.feathering import feather
+from .context import ProjectionContext
+from .geometry import remap
+
+logger = logging.getLogger('pipeline.incremental')
+
+
+def feathered_contribution(
+    rect_img: np.ndarray,
+    map_x: np.ndarray,
+    map_y: np.ndarray,
+    mask: np.ndarray,
+    remap_kwargs: Dict[str, Any]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Back-project a face and weight it like FeatheringBlender.
+
+    Args:
+        rect_img (np.ndarray): Face image (h, w, C).
+        map_x (np.ndarray): Backward x-grid over the region to fill.
+        map_y (np.ndarray): Backward y-grid over the region to fill.
+        mask (np.ndarray): Backward mask over the region to fill.
+        remap_kwargs (Dict[str, Any]): Interpolation settings of the projection.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (weighted image, feather weights) over the region.
+    """
+    eq_img = remap(rect_img, map_x, map_y, mask=mask, **remap_kwargs)
+    feathered = feather(eq_img)
+    return eq_img * feathered[..., None], feathered
+
+
+class IncrementalBlend:
+    """
+    Stateful feathered blend of back-projected faces.
+
+    Keeps the weighted sum, the weight map and every face's contribution within the
+    bounding box of its footprint, so update_face() replaces one face at a cost
+    proportional to that face's footprint instead of re-projecting and re-blending all of
+    them. The blend matches ProjectionPipeline.backward_with_sampler with the
+    FeatheringBlender on the same faces.
+
+    Created by ProjectionPipeline.backward_incremental().
+    """
+
+    def __init__(
+        self,
+        img_shape: Tuple[int, ...],
+        geometry: Dict[int, Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]],
+        remap_kwargs: Dict[str, Any],
+        context: Optional[ProjectionContext] = None
+    ) -> None:
+        """
+        Initialize an empty blend.
+
+        Args:
+            img_shape (Tuple[int, ...]): Shape of the equirectangular output (H, W, C).
+            geometry (Dict[int, Tuple[np.ndarray, ...]]): Cropped backward (box, map_x, map_y, mask)
+                                                          per tangent point index (see GeometryCache.backward_crop).
+            remap_kwargs (Dict[str, Any]): Interpolation settings of the projection.
+            context (Optional[ProjectionContext]): Context of the forward pass, used for un-stacking.
+        """
+        self.img_shape = tuple(img_shape)
+        self.remap_kwargs = remap_kwargs
+        self.context = context or ProjectionContext()
+        # float64 accumulators, so subtracting old contributions does not drift
+        self._sum = np.zeros(self.img_shape, dtype=np.float64)
+        self._weight = np.zeros(self.img_shape[:2], dtype=np.float64)
+        self._output = np.zeros(self.img_shape, dtype=np.float32)
+
+        self._geometry: Dict[int, Tuple[Tuple[slice, slice], np.ndarray, np.ndarray, np.ndarray]] = {}
+        for idx, (box, map_x, map_y, mask) in geometry.items():
+            self._geometry[idx] = ((slice(box[0], box[1]), slice(box[2], box[3])), map_x, map_y, mask)
+        self._contributions: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def __repr__(self) -> str:
+        return f"IncrementalBlend(img_shape={self.img_shape}, faces={len(self._contributions)}/{len(self._geometry)})"
+
+    @property
+    def faces(self) -> Tuple[int, ...]:
+        """Tangent point indices of the faces currently in the blend."""
+        return tuple(sorted(self._contributions))
+
+    def update_face(self, point_idx: int, new_img: Optional[np.ndarray]) -> None:
+        """
+        Replace (or add, or with None remove) the image of one face.
+
+        Args:
+            point_idx (int): Tangent point index, as in "point_<idx>".
+            new_img (Optional[np.ndarray]): New face image (h, w, C), or None to remove the face.
+        """
+        if point_idx not in self._geometry:
+            raise KeyError(f"No face point_{point_idx} in this blend.")
+        box, map_x, map_y, mask = self._geometry[point_idx]
+        if box[0].stop == 0:
+            return
+
+        old = self._contributions.pop(point_idx, None)
+        if old is not None:
+            self._sum[box] -= old[0]
+            self._weight[box] -= old[1]
+
+        if new_img is not None:
+            if new_img.shape[-1] != self.img_shape[-1]:
+                raise ValueError(
+                    f"point_{point_idx} has {new_img.shape[-1]} channels, but the blend has {self.img_shape[-1]}."
+                )
+            weighted, weights = feathered_contribution(new_img, map_x, map_y, mask, self.remap_kwargs)
+            self._sum[box] += weighted
+            self._weight[box] += weights
+            self._contributions[point_idx] = (weighted, weights)
+
+        self._normalize(box)
+
+    def _normalize(self, box: Tuple[slice, slice]) -> None:
+        weight = self._weight[box]
+        # Removing the last face of a pixel can leave rounding residue instead of an exact zero
+        valid = weight > 1e-9
+        out = np.zeros(weight.shape + self.img_shape[2:], dtype=np.float32)
+        out[valid] = self._sum[box][valid] / weight[valid, None]
+        self._output[box] = out
+
+    @property
+    def stacked(self) -> np.ndarray:
+        """
+        The blended image. It is updated in place by update_face().
+        """
+        return self._output
+
+    def result(self) -> Dict[str, Any]:
+        """
+        The blend in the format of ProjectionPipeline.backward().
+
+        Returns:
+            Dict[str, Any]: "stacked" plus unstacked views if the forward input was PipelineData.
+        """
+        output: Dict[str, Any] = {"stacked": self._output}
+        unstacked = self.context.unstack(self._output)
+        if unstacked is not None:
+            output.update(unstacked)
+        return output
@@ -0,0 +1,277 @@
+import logging
+import os
+import threading
+import tracemalloc
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger('pipeline.memory')
+
+# Smallest row tile of a face remap chosen by the planner
+MIN_TILE_ROWS = 16
+
+# Seconds between two RSS samples of PeakMemory
+RSS_SAMPLE_INTERVAL = 0.005
+
+# Active PeakMemory blocks; tracemalloc is started by the first and stopped by the last,
+# unless the application was already tracing
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_owns_tracing = False
+
+
+def _nbytes(shape: Tuple[int, ...], itemsize: int) -> int:
+    return int(np.prod(shape, dtype=np.int64)) * itemsize
+
+
+class MemoryPlan:
+    """
+    Execution settings chosen by plan_forward / plan_backward, with the estimates behind them.
+
+    Attributes:
+        stage (str): "forward" or "backward".
+        budget (Optional[int]): Memory budget in bytes (None: unlimited).
+        n_jobs (int): Worker count.
+        in_flight (int): Back-projected faces held at once before being folded into the blend.
+        tile_rows (Optional[int]): Row tile of the face remaps (None: whole faces).
+        estimates (Dict[str, int]): Estimated bytes per component at the chosen settings.
+    """
+
+    def __init__(
+        self,
+        stage: str,
+        budget: Optional[int],
+        n_jobs: int,
+        in_flight: int,
+        tile_rows: Optional[int],
+        estimates: Dict[str, int]
+    ) -> None:
+        self.stage = stage
+        self.budget = budget
+        self.n_jobs = n_jobs
+        self.in_flight = in_flight
+        self.tile_rows = tile_rows
+        self.estimates = estimates
+
+    def __repr__(self) -> str:
+        return (f"MemoryPlan(stage='{self.stage}', budget={self.budget}, n_jobs={self.n_jobs}, "
+                f"in_flight={self.in_flight}, tile_rows={self.tile_rows}, total={self.total})")
+
+    @property
+    def total(self) -> int:
+        """Estimated peak in bytes."""
+        return sum(self.estimates.values())
+
+    @property
+    def fits(self) -> bool:
+        """Whether the estimated peak is within the budget."""
+        return self.budget is None or self.total <= self.budget
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "stage": self.stage,
+            "budget": self.budget,
+            "n_jobs": self.n_jobs,
+            "in_flight": self.in_flight,
+            "tile_rows": self.tile_rows,
+            "estimated_bytes": self.total,
+            "fits": self.fits,
+            "estimates": dict(self.estimates),
+        }
+
+
+def _check(plan: MemoryPlan) -> MemoryPlan:
+    if not plan.fits:
+        logger.warning(
+            f"The {plan.stage} pass needs an estimated {plan.total} bytes at its leanest settings, "
+            f"over the max_memory budget of {plan.budget} bytes: {plan.estimates}."
+        )
+    return plan
+
+
+def plan_forward(
+    budget: Optional[int],
+    input_shape: Tuple[int, ...],
+    dtype: np.dtype,
+    n_faces: int,
+    face_shape: Tuple[int, int],
+    taps: int
+) -> MemoryPlan:
+    """
+    Plan a forward pass.
+
+    Faces are resampled one after the other and all of them are returned, so the only
+    setting is the row tile of each remap, which bounds the float32 accumulator used to
+    average the taps of a resampled grid.
+
+    Args:
+        budget (Optional[int]): Memory budget in bytes, or None.
+        input_shape (Tuple[int, ...]): Shape of the (stacked) equirectangular input.
+        dtype (np.dtype): dtype of the input.
+        n_faces (int): Number of faces.
+        face_shape (Tuple[int, int]): (height, width) of a face.
+        taps (int): Samples per face pixel of the forward grids (1 without resizing).
+
+    Returns:
+        MemoryPlan: The plan.
+    """
+    itemsize = np.dtype(dtype).itemsize
+    channels = tuple(input_shape[2:])
+    h, w = face_shape
+    c = int(np.prod(channels, dtype=np.int64))
+
+    def estimate(tile_rows: int) -> Dict[str, int]:
+        return {
+            "input": _nbytes(input_shape, itemsize),
+            "grids": n_faces * _nbytes((taps, h, w), 8),
+            "faces": n_faces * _nbytes((h, w) + channels, itemsize),
+            # Accumulator and current tap of a resampled tile
+            "remap": _nbytes((2, tile_rows, w, c), 4) if taps > 1 else 0,
+        }
+
+    tile_rows = h
+    while budget is not None and sum(estimate(tile_rows).values()) > budget and tile_rows > MIN_TILE_ROWS:
+        tile_rows = max(MIN_TILE_ROWS, tile_rows // 2)
+    return _check(MemoryPlan("forward", budget, 1, 1, tile_rows if tile_rows < h else None, estimate(tile_rows)))
+
+
+def plan_backward(
+    budget: Optional[int],
+    img_shape: Tuple[int, ...],
+    face_shape: Tuple[int, ...],
+    face_itemsize: int,
+    crop_pixels: int,
+    n_faces: int,
+    n_jobs: int,
+    streaming: bool
+) -> MemoryPlan:
+    """
+    Plan a backward pass.
+
+    Every face is back-projected into a float32 crop of its footprint. A streaming blender
+    folds crops into the output as they arrive, so only `in_flight` of them are held; other
+    blenders (e.g. MultiBandBlender) need all of them, plus a pyramid of the output. The
+    planner lowers `in_flight` first, then `n_jobs`, until the estimate fits the budget.
+
+    Args:
+        budget (Optional[int]): Memory budget in bytes, or None.
+        img_shape (Tuple[int, ...]): Shape of the equirectangular output (H, W, C).
+        face_shape (Tuple[int, ...]): Shape of a face image.
+        face_itemsize (int): Item size of the face images.
+        crop_pixels (int): Pixels in the largest footprint crop.
+        n_faces (int): Number of faces to blend.
+        n_jobs (int): Requested worker count, positive (see joblib.effective_n_jobs).
+        streaming (bool): Whether the blender consumes faces one at a time.
+
+    Returns:
+        MemoryPlan: The plan.
+    """
+    channels = int(np.prod(img_shape[2:], dtype=np.int64))
+    h, w = img_shape[:2]
+    crop = crop_pixels * channels * 4
+    n_faces = max(n_faces, 1)
+
+    def estimate(in_flight: int, jobs: int) -> Dict[str, int]:
+        held = in_flight if streaming else n_faces
+        estimates = {
+            "output": h * w * (channels + 1) * 4,
+            "grids": n_faces * crop_pixels * 9,
+            "faces": n_faces * _nbytes(face_shape, face_itemsize),
+            # Back-projected crops waiting for the blender, and those being computed
+            "crops": (held + jobs) * crop,
+            # float64 distance transform of the crops being feathered
+            "feather": jobs * crop_pixels * 8,
+        }
+        if not streaming:
+            # Output pyramid of bands and weights, and the pyramids of the faces being decomposed
+            estimates["pyramids"] = h * w * (channels + 1) * 4 * 4 // 3 + jobs * crop * 4
+        return estimates
+
+    jobs = max(1, n_jobs)
+    in_flight = jobs if streaming else n_faces
+    if budget is not None:
+        while sum(estimate(in_flight, jobs).values()) > budget:
+            if streaming and in_flight > 1:
+                in_flight = max(1, in_flight // 2)
+            elif jobs > 1:
+                jobs -= 1
+            else:
+                break
+    return _check(MemoryPlan("backward", budget, jobs, min(in_flight, n_faces), None, estimate(in_flight, jobs)))
+
+
+def _current_rss() -> Optional[int]:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class PeakMemory:
+    """
+    Context manager measuring the peak memory of a block of code.
+
+    `traced` is the peak of the Python and NumPy allocations seen by tracemalloc, which
+    runs while any PeakMemory block does (unless the application traces already). `rss`
+    is the peak resident set size sampled by a background thread, where /proc is
+    available. Both are process-wide, so they also count concurrent requests, and
+    neither sees joblib worker processes.
+
+    Python < 3.9 has no tracemalloc.reset_peak(): unless the block started tracing
+    itself, a peak reached before the block and never exceeded inside it is reported,
+    so `traced` is then an upper bound.
+    """
+
+    def __init__(self) -> None:
+        self.traced: Optional[int] = None
+        self.rss: Optional[int] = None
+        self._entry_peak = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __repr__(self) -> str:
+        return f"PeakMemory(traced={self.traced}, rss={self.rss})"
+
+    def _sample(self) -> None:
+        while not self._stop.wait(RSS_SAMPLE_INTERVAL):
+            rss = _current_rss()
+            if rss is not None:
+                self.rss = max(self.rss or 0, rss)
+
+    def __enter__(self) -> "PeakMemory":
+        global _tracing_users, _owns_tracing
+        with _tracing_lock:
+            if _tracing_users == 0:
+                _owns_tracing = not tracemalloc.is_tracing()
+                if _owns_tracing:
+                    tracemalloc.start()
+            _tracing_users += 1
+            if hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+            self._entry_peak = tracemalloc.get_traced_memory()[1]
+        self.rss = _current_rss()
+        if self.rss is not None:
+            self._thread = threading.Thread(target=self._sample, name="panorai-rss", daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        global _tracing_users
+        with _tracing_lock:
+            current, peak = tracemalloc.get_traced_memory()
+            # Without reset_peak, a peak unchanged since entry was reached before the block
+            self.traced = peak if peak > self._entry_peak else max(current, self._entry_peak)
+            _tracing_users -= 1
+            if _tracing_users == 0 and _owns_tracing:
+                tracemalloc.stop()
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            rss = _current_rss()
+            if rss is not None:
+                self.rss = max(self.rss or 0, rss)
+
+    def as_dict(self) -> Dict[str, Optional[int]]:
+        return {"traced_bytes": self.traced, "rss_bytes": self.rss}
@@ -0,0 +1,295 @@
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import cv2
+import numpy as np
+from scipy import sparse
+
+logger = logging.getLogger('pipeline.operators')
+
+
+def remap_matrix(
+    map_x: np.ndarray,
+    map_y: np.ndarray,
+    src_shape: Tuple[int, int],
+    interpolation: int = cv2.INTER_LINEAR,
+    row_weights: Optional[np.ndarray] = None,
+    border_mode: Optional[int] = cv2.BORDER_CONSTANT,
+    border_value: Any = 0
+) -> sparse.csr_matrix:
+    """
+    Express a cv2.remap call (see geometry.remap) as a sparse matrix.
+
+    Row i of the result holds the interpolation weights that output pixel i (in raster
+    order of the map) gives to the source pixels. Taps that fall outside the source are
+    dropped, so only cv2.BORDER_CONSTANT with a zero border value can be expressed; other
+    border settings are not linear in the source (or read other pixels) and are rejected.
+    Grids with a leading taps axis are averaged over their taps, like geometry.remap.
+
+    Args:
+        map_x (np.ndarray): x-coordinates into the source image, (h, w) or (taps, h, w).
+        map_y (np.ndarray): y-coordinates into the source image, same shape as map_x.
+        src_shape (Tuple[int, int]): (height, width) of the source image.
+        interpolation (int): cv2.INTER_LINEAR or cv2.INTER_NEAREST.
+        row_weights (Optional[np.ndarray]): Per-output-pixel factors multiplied into each row.
+        border_mode (Optional[int]): OpenCV border mode of the remap.
+        border_value (Any): Value used for constant borders.
+
+    Returns:
+        sparse.csr_matrix: Matrix of shape (h * w, src_h * src_w) with float32 weights.
+
+    Raises:
+        ValueError: If the interpolation flag or the border settings are not supported.
+    """
+    if border_mode not in (None, cv2.BORDER_CONSTANT) or np.any(np.asarray(0 if border_value is None else border_value) != 0):
+        raise ValueError(
+            f"Unsupported border settings (borderMode={border_mode}, borderValue={border_value}); "
+            "only cv2.BORDER_CONSTANT with a zero border value can be expressed as sparse operators."
+        )
+    src_h, src_w = src_shape
+    n_pixels = map_x.shape[-2] * map_x.shape[-1]
+    n_taps = map_x.size // n_pixels
+    x = map_x.astype(np.float64).ravel()
+    y = map_y.astype(np.float64).ravel()
+    rows = np.tile(np.arange(n_pixels), n_taps)
+    scale = np.ones(n_pixels) if row_weights is None else row_weights.astype(np.float64).ravel()
+    scale = np.tile(scale / n_taps, n_taps)
+
+    if interpolation == cv2.INTER_NEAREST:
+        taps = [(np.rint(x), np.rint(y), scale)]
+    elif interpolation == cv2.INTER_LINEAR:
+        x0, y0 = np.floor(x), np.floor(y)
+        fx, fy = x - x0, y - y0
+        taps = [
+            (x0, y0, (1 - fx) * (1 - fy) * scale),
+            (x0 + 1, y0, fx * (1 - fy) * scale),
+            (x0, y0 + 1, (1 - fx) * fy * scale),
+            (x0 + 1, y0 + 1, fx * fy * scale),
+        ]
+    else:
+        raise ValueError(
+            f"Unsupported interpolation flag {interpolation}; "
+            "only cv2.INTER_LINEAR and cv2.INTER_NEAREST can be expressed as sparse operators."
+        )
+
+    all_rows, all_cols, all_vals = [], [], []
+    for tx, ty, w in taps:
+        keep = (tx >= 0) & (tx <= src_w - 1) & (ty >= 0) & (ty <= src_h - 1) & (w != 0)
+        all_rows.append(rows[keep])
+        all_cols.append(ty[keep].astype(np.int64) * src_w + tx[keep].astype(np.int64))
+        all_vals.append(w[keep])
+
+    return sparse.csr_matrix(
+        (np.concatenate(all_vals).astype(np.float32), (np.concatenate(all_rows), np.concatenate(all_cols))),
+        shape=(n_pixels, src_h * src_w),
+    )
+
+
+class SparseProjectionOperator:
+    """
+    Forward and backward projection of a sampler configuration as sparse matrices.
+
+    For a fixed projection config, sampler and image shape, both directions are fixed
+    linear maps between pixel spaces:
+
+    - ``forward`` has shape (n_faces * h * w, H * W) and produces every face at once.
+    - ``backward`` has shape (H' * W', n_faces * h * w) and has the feather weights and the
+      per-pixel normalization of the blend baked in. (H', W') is the equirectangular shape
+      resized by the pipeline's resize_factor, like the output of backward_with_sampler.
+
+    Channels and panoramas are handled as extra columns, so any number of them is
+    projected in a single sparse product. Unlike backward_with_sampler, the feather
+    weights come from each face's geometric footprint rather than from the pixel values,
+    which is what makes the backward map linear.
+    """
+
+    def __init__(
+        self,
+        forward: sparse.csr_matrix,
+        backward: sparse.csr_matrix,
+        img_shape: Tuple[int, int],
+        face_shape: Tuple[int, int],
+        tangent_points: Sequence[Tuple[float, float]],
+        out_shape: Optional[Tuple[int, int]] = None
+    ) -> None:
+        """
+        Initialize the operator from prebuilt matrices.
+
+        Args:
+            forward (sparse.csr_matrix): Stacked forward matrix.
+            backward (sparse.csr_matrix): Blended backward matrix.
+            img_shape (Tuple[int, int]): (H, W) of the equirectangular input.
+            face_shape (Tuple[int, int]): (h, w) of each face.
+            tangent_points (Sequence[Tuple[float, float]]): (lat_deg, lon_deg) of each face.
+            out_shape (Optional[Tuple[int, int]]): (H', W') of the back-projected image. Defaults to img_shape.
+        """
+        self.forward = forward.tocsr()
+        self.backward = backward.tocsr()
+        self.img_shape = tuple(int(v) for v in img_shape[:2])
+        self.out_shape = tuple(int(v) for v in (out_shape or img_shape)[:2])
+        self.face_shape = tuple(int(v) for v in face_shape[:2])
+        self.tangent_points = [tuple(float(v) for v in p) for p in tangent_points]
+
+    @property
+    def n_faces(self) -> int:
+        return len(self.tangent_points)
+
+    def __repr__(self) -> str:
+        return (f"SparseProjectionOperator(n_faces={self.n_faces}, img_shape={self.img_shape}, "
+                f"out_shape={self.out_shape}, face_shape={self.face_shape}, nnz_forward={self.forward.nnz}, nnz_backward={self.backward.nnz})")
+
+    @classmethod
+    def from_geometry(
+        cls,
+        forward_maps: List[Tuple[np.ndarray, np.ndarray]],
+        backward_maps: List[Tuple[np.ndarray, np.ndarray, np.ndarray]],
+        weights: List[np.ndarray],
+        img_shape: Tuple[int, int],
+        face_shape: Tuple[int, int],
+        tangent_points: Sequence[Tuple[float, float]],
+        interpolation: int = cv2.INTER_LINEAR,
+        border_mode: Optional[int] = cv2.BORDER_CONSTANT,
+        border_value: Any = 0,
+        out_shape: Optional[Tuple[int, int]] = None
+    ) -> "SparseProjectionOperator":
+        """
+        Build the operator from per-face remap grids.
+
+        Args:
+            forward_maps (List[Tuple[np.ndarray, np.ndarray]]): (map_x, map_y) per face, with a
+                                                             leading taps axis when resized.
+            backward_maps (List[Tuple[np.ndarray, np.ndarray, np.ndarray]]): (map_x, map_y, mask) per face.
+            weights (List[np.ndarray]): Feather weights per face on the back-projected grid.
+            img_shape (Tuple[int, int]): (H, W) of the equirectangular input.
+            face_shape (Tuple[int, int]): (h, w) of each face.
+            tangent_points (Sequence[Tuple[float, float]]): (lat_deg, lon_deg) of each face.
+            interpolation (int): OpenCV interpolation flag of the projection.
+            border_mode (Optional[int]): OpenCV border mode of the projection.
+            border_value (Any): Border value of the projection.
+            out_shape (Optional[Tuple[int, int]]): (H', W') of the back-projected image. Defaults to img_shape.
+
+        Returns:
+            SparseProjectionOperator: The assembled operator.
+
+        Raises:
+            ValueError: If the interpolation or border settings cannot be expressed (see remap_matrix).
+        """
+        img_shape = tuple(img_shape[:2])
+        face_shape = tuple(face_shape[:2])
+        border = {"border_mode": border_mode, "border_value": border_value}
+
+        forward = sparse.vstack(
+            [remap_matrix(mx, my, img_shape, interpolation, **border) for mx, my in forward_maps],
+            format="csr",
+        )
+
+        weight_sum = np.sum(weights, axis=0, dtype=np.float64)
+        norm = np.divide(1.0, weight_sum, out=np.zeros_like(weight_sum), where=weight_sum > 0)
+        blocks = [
+            remap_matrix(mx, my, face_shape, interpolation, row_weights=w * mask * norm, **border)
+            for (mx, my, mask), w in zip(backward_maps, weights)
+        ]
+        backward = sparse.hstack(blocks, format="csr")
+        backward.eliminate_zeros()
+
+        return cls(forward, backward, img_shape, face_shape, tangent_points, out_shape=out_shape)
+
+    @staticmethod
+    def _to_columns(arrays: List[np.ndarray], lead_shape: Tuple[int, ...]) -> Tuple[np.ndarray, List[Tuple[int, ...]]]:
+        n_lead = len(lead_shape)
+        for arr in arrays:
+            if tuple(arr.shape[:n_lead]) != tuple(lead_shape):
+                raise ValueError(f"Expected arrays with leading shape {lead_shape}, got {arr.shape}.")
+        n_pixels = int(np.prod(lead_shape))
+        trailing = [tuple(arr.shape[n_lead:]) for arr in arrays]
+        columns = np.concatenate(
+            [np.asarray(arr, dtype=np.float32).reshape(n_pixels, -1) for arr in arrays], axis=1
+        )
+        return columns, trailing
+
+    @staticmethod
+    def _from_columns(matrix: np.ndarray, lead_shape: Tuple[int, ...], trailing: List[Tuple[int, ...]]) -> List[np.ndarray]:
+        outputs, start = [], 0
+        for shape in trailing:
+            n = int(np.prod(shape))
+            outputs.append(np.asarray(matrix[:, start:start + n]).reshape(*lead_shape, *shape))
+            start += n
+        return outputs
+
+    def project(self, data: Union[np.ndarray, Sequence[np.ndarray]]) -> Union[np.ndarray, List[np.ndarray]]:
+        """
+        Forward-project one or several equirectangular images.
+
+        Args:
+            data (Union[np.ndarray, Sequence[np.ndarray]]): An (H, W[, C]) array or a list of them.
+
+        Returns:
+            Union[np.ndarray, List[np.ndarray]]: (n_faces, h, w[, C]) faces, or a list matching the input.
+        """
+        arrays = [data] if isinstance(data, np.ndarray) else list(data)
+        columns, trailing = self._to_columns(arrays, self.img_shape)
+        faces = self._from_columns(self.forward @ columns, (self.n_faces, *self.face_shape), trailing)
+        return faces[0] if isinstance(data, np.ndarray) else faces
+
+    def backproject(self, faces: Union[np.ndarray, Sequence[np.ndarray]]) -> Union[np.ndarray, List[np.ndarray]]:
+        """
+        Back-project and blend stacked faces into equirectangular images.
+
+        Args:
+            faces (Union[np.ndarray, Sequence[np.ndarray]]): An (n_faces, h, w[, C]) array or a list of them.
+
+        Returns:
+            Union[np.ndarray, List[np.ndarray]]: (H', W'[, C]) images, or a list matching the input.
+        """
+        arrays = [faces] if isinstance(faces, np.ndarray) else list(faces)
+        columns, trailing = self._to_columns(arrays, (self.n_faces, *self.face_shape))
+        images = self._from_columns(self.backward @ columns, self.out_shape, trailing)
+        return images[0] if isinstance(faces, np.ndarray) else images
+
+    def save(self, path: str) -> None:
+        """
+        Save both matrices and their metadata into a single .npz file.
+
+        Args:
+            path (str): Destination file.
+        """
+        arrays: Dict[str, Any] = {
+            "img_shape": np.array(self.img_shape),
+            "out_shape": np.array(self.out_shape),
+            "face_shape": np.array(self.face_shape),
+            "tangent_points": np.array(self.tangent_points, dtype=np.float64).reshape(-1, 2),
+        }
+        for name in ("forward", "backward"):
+            mat = getattr(self, name)
+            arrays[f"{name}_data"] = mat.data
+            arrays[f"{name}_indices"] = mat.indices
+            arrays[f"{name}_indptr"] = mat.indptr
+            arrays[f"{name}_shape"] = np.array(mat.shape)
+        np.savez(path, **arrays)
+        logger.info(f"Saved sparse projection operator to {path}.")
+
+    @classmethod
+    def load(cls, path: str) -> "SparseProjectionOperator":
+        """
+        Load an operator written by save().
+
+        Args:
+            path (str): Source .npz file.
+
+        Returns:
+            SparseProjectionOperator: The restored operator.
+        """
+        with np.load(path) as data:
+            mats = {
+                name: sparse.csr_matrix(
+                    (data[f"{name}_data"], data[f"{name}_indices"], data[f"{name}_indptr"]),
+                    shape=tuple(data[f"{name}_shape"]),
+                )
+                for name in ("forward", "backward")
+            }
+            return cls(
+                mats["forward"], mats["backward"],
+                tuple(data["img_shape"]), tuple(data["face_shape"]),
+                [tuple(p) for p in data["tangent_points"]],
+                out_shape=tuple(data["out_shape"]) if "out_shape" in data.files else None,
+            )
@@ -1,28 +1,46 @@
 import numpy as np
+import asyncio
+import copy
+import functools
 import logging
 import os
-import sys
 import math
-from typing import Any, Dict, List, Optional, Tuple, Union
-
-from joblib import Parallel, delayed
+import threading
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 from .pipeline_data import PipelineData
+from .context import ProjectionContext
+from .incremental import IncrementalBlend
+from .geometry import GeometryCache, compute_forward_maps, projection_signature, remap, scaled_shape
+from .disk_cache import DEFAULT_CACHE_MAX_BYTES, GeometryDiskCache, cache_key
+from .result_cache import ResultCache, content_hash
+from .validity import DEFAULT_VALIDITY_BLOCK, ValidityIndex, derive_valid_mask
+from .memory import MemoryPlan, PeakMemory, plan_backward, plan_forward
+from .autotune import AutoTuner, calibrate, candidate_settings
+from .tasks import backward_face, footprint_rows, forward_face, geometry_key
+from .viewport import ViewGridCache, ViewRenderer
+from .regions import DEFAULT_INDEX_RESOLUTION, FootprintIndex, Region, as_region, index_shape
+from .validity import footprint_runs
+from .streaming import stream as _stream
 from .utils.resizer import ResizerConfig
 
+from ..blender import BlenderRegistry
+from ..blender.base_blenders import BaseBlender
 from ..sampler import SamplerRegistry
 from ..sampler.base_samplers import Sampler  # For type hints
+from ..sampler.coverage import auto_fov, face_pixels
 from ..submodules.projections import ProjectionRegistry
 
-# Configure logging
+if TYPE_CHECKING:
+    from .operators import SparseProjectionOperator  # Imports scipy.sparse
+
+# Handlers are left to the application (see panorai.setup_logging)
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG if os.environ.get('DEBUG', 'False').lower() in ('true', '1') else logging.INFO)
 
-stream_handler = logging.StreamHandler(sys.stdout)
-stream_handler.setLevel(logger.level)
-formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-stream_handler.setFormatter(formatter)
-logger.handlers = [stream_handler]  # Replace existing handlers
+# Projections with square tangent-plane faces, which PipelineConfig.auto_size can size
+AUTO_SIZE_PROJECTIONS = ("gnomonic",)
 
 
 def deg_to_rad(degrees: float) -> float:
@@ -51,6 +69,53 @@ def rad_to_deg(radians: float) -> float:
     return radians * 180.0 / math.pi
 
 
+def _measured(stage: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Record the peak memory of a pipeline method in its stats when max_memory is set.
+
+    Args:
+        stage (str): Stage name in ProjectionPipeline.stats()["memory"].
+    """
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(fn)
+        def wrapper(self: "ProjectionPipeline", *args: Any, **kwargs: Any) -> Any:
+            if self.pipeline_cfg.max_memory is None:
+                return fn(self, *args, **kwargs)
+            with PeakMemory() as peak:
+                result = fn(self, *args, **kwargs)
+            self._memory_stats.setdefault(stage, {})["peak"] = peak.as_dict()
+            return result
+        return wrapper
+    return decorator
+
+
+def _backward_task(
+    idx: int,
+    rect_img: np.ndarray,
+    map_x: np.ndarray,
+    map_y: np.ndarray,
+    mask: np.ndarray,
+    remap_kwargs: Dict[str, Any]
+) -> Tuple[int, np.ndarray, np.ndarray]:
+    """
+    Worker function for parallel backward projection.
+
+    Args:
+        idx (int): Index of the tangent point.
+        rect_img (np.ndarray): Face image to back-project.
+        map_x (np.ndarray): Cached backward x-grid of the face.
+        map_y (np.ndarray): Cached backward y-grid of the face.
+        mask (np.ndarray): Validity mask of the face on the equirectangular grid.
+        remap_kwargs (Dict[str, Any]): Interpolation settings of the projection.
+
+    Returns:
+        Tuple[int, np.ndarray, np.ndarray]: (idx, equirectangular image, mask).
+    """
+    logger.debug(f"[Parallel] Backward projecting point_{idx}...")
+    equirect_img = remap(rect_img, map_x, map_y, mask=mask, **remap_kwargs)
+    return idx, equirect_img, mask
+
+
 class PipelineConfig:
     """
     Configuration class for the ProjectionPipeline.
@@ -60,7 +125,21 @@ class PipelineConfig:
         self,
         resizer_cfg: Optional[ResizerConfig] = None,
         resize_factor: float = 1.0,
-        n_jobs: int = 1
+        n_jobs: Union[int, str] = 1,
+        cache_dir: Optional[str] = None,
+        cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        async_workers: int = 4,
+        result_cache_bytes: int = 0,
+        result_cache_dir: Optional[str] = None,
+        skip_empty_faces: bool = False,
+        validity_block: int = DEFAULT_VALIDITY_BLOCK,
+        blender: str = "FeatheringBlender",
+        blender_params: Optional[Dict[str, Any]] = None,
+        auto_size: bool = False,
+        fov_margin_deg: float = 2.0,
+        max_memory: Optional[int] = None,
+        tuning_file: Optional[str] = None,
+        executor: Optional[Executor] = None
     ) -> None:
         """
         Initialize pipeline-level configuration.
@@ -68,21 +147,73 @@ class PipelineConfig:
         Args:
             resizer_cfg (Optional[ResizerConfig]): Configuration for the image resizer.
             resize_factor (float): Factor by which to resize input images before projection.
-            n_jobs (int): Number of parallel jobs to use.
+            n_jobs (Union[int, str]): Number of parallel jobs to use, or "auto" to calibrate the joblib
+                                      backend and worker count on the actual shapes (see tuning_file).
+            cache_dir (Optional[str]): Directory of the on-disk geometry cache shared across processes.
+                                       Defaults to the PANORAI_CACHE_DIR environment variable; disabled if neither is set.
+            cache_max_bytes (int): Size budget of the on-disk geometry cache.
+            async_workers (int): Number of threads running aproject/abackward requests.
+            result_cache_bytes (int): Memory budget of the result cache, which returns repeated
+                                      project/backward calls on identical inputs and configuration
+                                      without recomputing them. 0 disables the memory tier. A
+                                      repeated call returns read-only arrays shared with the cache.
+            result_cache_dir (Optional[str]): Directory of the on-disk result cache tier, limited to
+                                              cache_max_bytes. Disabled if None.
+            skip_empty_faces (bool): Skip the forward and backward work of faces that only read
+                                     invalid (all-zero) pixels; they come out zero-filled, and
+                                     backward() leaves them out of the blend while still all zeros.
+                                     Passing valid_mask to project() enables this per call.
+            validity_block (int): Block size in pixels of the downsampled validity mask.
+            blender (str): Name of the blender combining back-projected faces (see BlenderRegistry):
+                           "FeatheringBlender" (default) or "MultiBandBlender".
+            blender_params (Optional[Dict[str, Any]]): Parameters of the blender.
+            auto_size (bool): Derive the faces' field of view from the sampler's point spacing and
+                              their pixel size from the input's angular resolution, overriding
+                              fov_deg, x_points and y_points (gnomonic projection with a sampler).
+            fov_margin_deg (float): Overlap margin in degrees added to the auto-sized field of view.
+            max_memory (Optional[int]): Memory budget in bytes. The forward and backward passes then
+                                        plan their worker count, faces in flight and remap tile size
+                                        from the shapes and dtypes to stay under it, and measure
+                                        their peak memory (see ProjectionPipeline.stats()).
+            tuning_file (Optional[str]): JSON file persisting the n_jobs="auto" calibrations per machine
+                                         and configuration. Defaults to the PANORAI_TUNING_FILE environment
+                                         variable, then ~/.cache/panorai/autotune.json.
+            executor (Optional[Executor]): concurrent.futures executor (thread or process pool, or a
+                                           cluster executor) running the face-level forward and backward
+                                           tasks of pipeline/tasks.py instead of the current process and
+                                           joblib. n_jobs is then ignored.
         """
         self.resizer_cfg = resizer_cfg or ResizerConfig(resize_factor=resize_factor)
         self.n_jobs = n_jobs
+        self.cache_dir = cache_dir or os.environ.get("PANORAI_CACHE_DIR")
+        self.cache_max_bytes = cache_max_bytes
+        self.async_workers = async_workers
+        self.result_cache_bytes = result_cache_bytes
+        self.result_cache_dir = result_cache_dir
+        self.skip_empty_faces = skip_empty_faces
+        self.validity_block = validity_block
+        self.blender = blender
+        self.blender_params = blender_params
+        self.auto_size = auto_size
+        self.fov_margin_deg = fov_margin_deg
+        self.max_memory = max_memory
+        self.tuning_file = tuning_file or os.environ.get("PANORAI_TUNING_FILE")
+        self.executor = executor
 
     def update(self, **kwargs: Any) -> None:
         """
         Update configuration using keyword arguments.
 
+        resize_factor is forwarded to resizer_cfg.
+
         Args:
             **kwargs (Any): Dictionary of attributes to update.
         """
         for key, value in kwargs.items():
             if hasattr(self, key):
                 setattr(self, key, value)
+            elif key == "resize_factor":
+                self.resizer_cfg.resize_factor = value
 
 
 class ProjectionPipeline:
@@ -129,10 +260,35 @@ class ProjectionPipeline:
         # Parallel jobs
         self.n_jobs = self.pipeline_cfg.n_jobs
 
+        # Per-face remap grids and sparse operators, reused across calls
+        self.geometry = GeometryCache(disk=self._create_disk_cache())
+        self._operators: Dict[Any, "SparseProjectionOperator"] = {}
+        self._footprint_indexes: Dict[Any, FootprintIndex] = {}
+        # Pipelines of the other projections of project_many(), by projection and sampler name
+        self._fanout: Dict[Tuple[str, Optional[str]], "ProjectionPipeline"] = {}
+        # Optional memoization of whole results by input content and configuration
+        self.result_cache = self._create_result_cache()
+        # Combines the back-projected faces
+        self.blender = self._create_blender()
+        # Calibrated parallel settings for n_jobs="auto"
+        self.tuner = AutoTuner(self.pipeline_cfg.tuning_file)
+        # Perspective view grids by quantized orientation, and the renderer of the last panorama viewed
+        self.view_grids = ViewGridCache()
+        self._viewer: Optional[Tuple[Any, ViewRenderer, ProjectionContext]] = None
+
+        # Guards the shared projector config and geometry cache across concurrent requests
+        self._lock = threading.RLock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
         # Internal references for un-stacking after backward
         self._original_data: Optional[PipelineData] = None
         self._keys_order: Optional[List[str]] = None
         self._stacked_shape: Optional[Tuple[int, int, int]] = None
+        self._skipped_faces: set = set()
+        self._projection_config: Optional[Dict[str, Any]] = None
+        self._sampler_params: Optional[Dict[str, Any]] = None
+        # Last memory plan and measured peak per stage
+        self._memory_stats: Dict[str, Dict[str, Any]] = {}
 
     @classmethod
     def list_samplers(cls) -> List[str]:
@@ -184,8 +340,110 @@ Note: You can pass any updates to these configurations via kwargs.
         if self.sampler:
             self.sampler.update(**kwargs)
         self.pipeline_cfg.update(**kwargs)
-        self.resizer = self.pipeline_cfg.resizer_cfg.create_resizer()
+        if "resizer_cfg" in kwargs or "resize_factor" in kwargs:
+            self.resizer = self.pipeline_cfg.resizer_cfg.create_resizer()
         self.n_jobs = self.pipeline_cfg.n_jobs
+        if "cache_dir" in kwargs or "cache_max_bytes" in kwargs:
+            self.geometry.disk = self._create_disk_cache()
+        if any(k in kwargs for k in ("result_cache_bytes", "result_cache_dir", "cache_max_bytes")):
+            self.result_cache = self._create_result_cache()
+        if "blender" in kwargs or "blender_params" in kwargs:
+            self.blender = self._create_blender()
+        if "tuning_file" in kwargs:
+            self.tuner = AutoTuner(self.pipeline_cfg.tuning_file)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Counters of the pipeline's caches and its memory plans.
+
+        Returns:
+            Dict[str, Any]: "geometry" and "result_cache" counters (None without a result cache),
+                            "memory": max_memory and, per stage ("forward", "backward"), the last
+                            "plan" and, when max_memory is set, its measured "peak", and "views":
+                            counters of the perspective view grids.
+        """
+        memory: Dict[str, Any] = {"max_memory": self.pipeline_cfg.max_memory}
+        memory.update({stage: dict(entry) for stage, entry in self._memory_stats.items()})
+        return {
+            "geometry": self.geometry.stats(),
+            "result_cache": self.result_cache.stats() if self.result_cache is not None else None,
+            "memory": memory,
+            "views": self.view_grids.stats(),
+        }
+
+    def _record_plan(self, plan: MemoryPlan) -> MemoryPlan:
+        logger.debug(f"Memory plan: {plan}.")
+        self._memory_stats.setdefault(plan.stage, {})["plan"] = plan.as_dict()
+        return plan
+
+    def _create_disk_cache(self) -> Optional[GeometryDiskCache]:
+        """
+        Create the on-disk geometry cache configured in the pipeline config, if any.
+
+        Returns:
+            Optional[GeometryDiskCache]: The disk cache, or None when caching to disk is disabled.
+        """
+        if not self.pipeline_cfg.cache_dir:
+            return None
+        return GeometryDiskCache(self.pipeline_cfg.cache_dir, max_bytes=self.pipeline_cfg.cache_max_bytes)
+
+    def _create_result_cache(self) -> Optional[ResultCache]:
+        """
+        Create the result cache configured in the pipeline config, if any.
+
+        Returns:
+            Optional[ResultCache]: The result cache, or None when neither tier is enabled.
+        """
+        cfg = self.pipeline_cfg
+        if not cfg.result_cache_bytes and not cfg.result_cache_dir:
+            return None
+        disk = GeometryDiskCache(cfg.result_cache_dir, max_bytes=cfg.cache_max_bytes) if cfg.result_cache_dir else None
+        return ResultCache(max_bytes=cfg.result_cache_bytes, disk=disk)
+
+    def _create_blender(self) -> BaseBlender:
+        """
+        Create the blender configured in the pipeline config.
+
+        Returns:
+            BaseBlender: The blender.
+        """
+        cfg = self.pipeline_cfg
+        return BlenderRegistry.get_blender(cfg.blender, **(cfg.blender_params or {}))
+
+    def face_size(self, img_shape: Tuple[int, ...]) -> Dict[str, Any]:
+        """
+        Field of view and pixel size of the faces, as chosen by PipelineConfig.auto_size.
+
+        The field of view is the sampler's largest nearest-neighbour spacing, grown if needed
+        until the faces cover the whole sphere, plus fov_margin_deg of overlap. The faces are
+        square, with the source's pixels per degree at their centre, so they neither oversample
+        the input nor leave gaps that would call for more tangent points.
+
+        Args:
+            img_shape (Tuple[int, ...]): Shape of the equirectangular input, after resizing.
+
+        Returns:
+            Dict[str, Any]: Projector config updates: fov_deg, x_points and y_points.
+        """
+        if self.projection_name not in AUTO_SIZE_PROJECTIONS:
+            raise ValueError(f"auto_size supports the {AUTO_SIZE_PROJECTIONS} projections, not '{self.projection_name}'.")
+        if not self.sampler:
+            raise ValueError("auto_size requires a sampler.")
+
+        fov = auto_fov(self.sampler.get_tangent_points(), margin_deg=self.pipeline_cfg.fov_margin_deg)
+        side = face_pixels(fov, img_shape[1] / 360.0)
+        return {"fov_deg": fov, "x_points": side, "y_points": side}
+
+    @property
+    def resize_factor(self) -> float:
+        """
+        Resize factor of the resize stage, folded into the forward grids.
+
+        The pipeline works at the resized resolution: faces sample the input as if it had
+        been resized by this factor (with area anti-aliasing when downsampling), and
+        backward reconstructs the equirectangular image at the resized shape.
+        """
+        return self.pipeline_cfg.resizer_cfg.resize_factor
 
     def _resize_image(self, img: np.ndarray, upsample: bool = True) -> np.ndarray:
         """
@@ -200,79 +458,426 @@ Note: You can pass any updates to these configurations via kwargs.
         """
         return self.resizer.resize_image(img, upsample)
 
-    def _prepare_data(self, data: Union[PipelineData, np.ndarray]) -> Tuple[np.ndarray, Optional[List[str]]]:
+    def _remap_kwargs(self) -> Dict[str, Any]:
+        """
+        Interpolation settings of the current projection config, as accepted by geometry.remap.
+
+        Returns:
+            Dict[str, Any]: interpolation, border_mode and border_value.
+        """
+        params = self.projector.config.config_object.config
+        return {
+            "interpolation": params.interpolation,
+            "border_mode": params.borderMode,
+            "border_value": params.borderValue,
+        }
+
+    def _context(self) -> ProjectionContext:
+        """
+        Context built from the state of the last synchronous forward pass.
+
+        Returns:
+            ProjectionContext: Context referencing the pipeline's own state.
+        """
+        return ProjectionContext(self._original_data, self._keys_order, self._stacked_shape, self._skipped_faces,
+                                 self._projection_config, self._sampler_params)
+
+    def _adopt_context(self, ctx: ProjectionContext) -> None:
+        """
+        Store a context as the pipeline's own state, for backward calls without a context.
+
+        Args:
+            ctx (ProjectionContext): Context of a finished forward pass.
+        """
+        self._original_data = ctx.original_data
+        self._keys_order = ctx.keys_order
+        self._stacked_shape = ctx.stacked_shape
+        self._skipped_faces = ctx.skipped_faces
+        self._projection_config = ctx.projection_config
+        self._sampler_params = ctx.sampler_params
+
+    def _record_config(self, ctx: ProjectionContext) -> None:
+        """
+        Store the projector and sampler config of a forward pass in its context. Call under the lock.
+
+        Args:
+            ctx (ProjectionContext): Context of the forward pass.
+        """
+        ctx.projection_config = self.projector.config.config_object.config.model_dump()
+        ctx.sampler_params = dict(self.sampler.params) if self.sampler else None
+
+    def _restore_config(self, ctx: ProjectionContext) -> None:
+        """
+        Re-apply the projector and sampler config recorded by a forward pass, so a backward
+        pass uses the geometry its faces were projected with even if other requests changed
+        the shared config since. Call under the lock.
+
+        Args:
+            ctx (ProjectionContext): Context of the matching forward pass.
+        """
+        if ctx.projection_config is not None:
+            self.projector.config.update(**ctx.projection_config)
+        if self.sampler and ctx.sampler_params is not None:
+            self.sampler.params = dict(ctx.sampler_params)
+
+    def _prepare_data(self, data: Union[PipelineData, np.ndarray], ctx: ProjectionContext) -> np.ndarray:
         """
         Prepare the data for processing. If it's PipelineData, stack all channels; if it's a NumPy array, use as is.
 
         Args:
             data (Union[PipelineData, np.ndarray]): The input data.
+            ctx (ProjectionContext): Context receiving the original data and keys order.
 
         Returns:
-            Tuple[np.ndarray, Optional[List[str]]]: (stacked_array, keys_order_if_any).
+            np.ndarray: The stacked array.
         """
         if isinstance(data, PipelineData):
             stacked, keys_order = data.stack_all()
-            self._original_data = data
-            self._keys_order = keys_order
-            return stacked, keys_order
+            ctx.original_data = data
+            ctx.keys_order = keys_order
+            return stacked
         elif isinstance(data, np.ndarray):
-            self._original_data = None
-            self._keys_order = None
-            return data, None
+            ctx.original_data = None
+            ctx.keys_order = None
+            return data
         else:
             raise TypeError("Data must be either PipelineData or np.ndarray.")
 
-    def project_with_sampler(
+    @_measured("forward")
+    def _forward(
         self,
         data: Union[PipelineData, np.ndarray],
-        **kwargs: Any
-    ) -> Dict[str, Any]:
+        ctx: ProjectionContext,
+        kwargs: Dict[str, Any],
+        use_sampler: bool,
+        shape_updates: Optional[Dict[str, int]] = None,
+        valid_mask: Optional[np.ndarray] = None,
+        region: Optional[Region] = None,
+        index_resolution: float = DEFAULT_INDEX_RESOLUTION
+    ) -> Dict[Optional[int], np.ndarray]:
         """
-        Forward projection on a single stacked array for all tangent points (from the sampler).
+        Forward-project data for every tangent point (or once with the current config).
+
+        The shared projector is only reconfigured, and the grids looked up, while holding
+        the pipeline lock; the resampling itself runs outside of it, so concurrent requests
+        only serialize on the cheap part. The context is checked for cancellation between faces.
+        With a result cache, faces of an input already projected with the same configuration
+        are returned from the cache. With a validity mask (given, or derived from the data when
+        skip_empty_faces is set), faces whose footprint holds no valid block of the mask are
+        zero-filled instead of resampled and recorded in ctx.skipped_faces. With a region, only
+        the faces that the footprint index reports as intersecting it are projected.
 
         Args:
-            data (Union[PipelineData, np.ndarray]): Input data for projection.
+            data (Union[PipelineData, np.ndarray]): Input data.
+            ctx (ProjectionContext): Per-request state.
+            kwargs (Dict[str, Any]): Overrides for projector, sampler and pipeline config.
+            use_sampler (bool): Project at every tangent point of the sampler.
+            shape_updates (Optional[Dict[str, int]]): Equirectangular grid size set by project().
+            valid_mask (Optional[np.ndarray]): Boolean (H, W) mask of the valid input pixels.
+            region (Optional[Region]): Spherical region restricting the faces (sampler only).
+            index_resolution (float): Cell size of the footprint index in degrees.
+
+        Returns:
+            Dict[Optional[int], np.ndarray]: Faces by tangent point index (None without sampler).
+        """
+        prepared_data = self._prepare_data(data, ctx)
+        ctx.skipped_faces = set()
+        # Hashed and indexed before taking the lock, so concurrent requests do not wait on it
+        data_hash = content_hash(prepared_data) if self.result_cache is not None else None
+        validity = None
+        if valid_mask is not None or self.pipeline_cfg.skip_empty_faces:
+            if valid_mask is None:
+                valid_mask = derive_valid_mask(prepared_data)
+            elif valid_mask.shape[:2] != prepared_data.shape[:2]:
+                raise ValueError(f"valid_mask has shape {valid_mask.shape[:2]}, "
+                                 f"but the input has shape {prepared_data.shape[:2]}.")
+            validity = ValidityIndex(valid_mask, block=self.pipeline_cfg.validity_block)
+
+        with self._lock:
+            if shape_updates:
+                logger.debug(f"Updating x_points and y_points to {shape_updates}.")
+                self.update(**shape_updates)
+            self.update(**kwargs)
+            resize_factor = self.resize_factor
+            executor = self.pipeline_cfg.executor
+            ctx.stacked_shape = scaled_shape(prepared_data.shape, resize_factor)
+            if use_sampler and self.pipeline_cfg.auto_size:
+                sizing = self.face_size(ctx.stacked_shape)
+                logger.debug(f"Auto-sized faces: {sizing}.")
+                self.projector.config.update(**sizing)
+            self._record_config(ctx)
+
+            # Projector config updates of each face
+            points: List[Tuple[Optional[int], Dict[str, float]]] = []
+            if use_sampler:
+                points.extend(self._sampler_points())
+            else:
+                points.append((None, {}))
+            if region is not None:
+                selected = set(self._footprint_index(points, index_resolution).query(region).tolist())
+                points = [(idx, updates) for idx, updates in points if idx in selected]
+                logger.debug(f"Faces intersecting {region!r}: {sorted(selected)}.")
+                if not points:
+                    return {}
+
+            result_key = None
+            cache = self.result_cache
+            if cache is not None:
+                signatures = []
+                skipped = set()
+                for idx, updates in points:
+                    self.projector.config.update(**updates)
+                    signatures.append(projection_signature(self.projector))
+                    # Footprints are cached, so a hit reports the same skipped faces as a miss
+                    if validity is not None and not validity.any_valid(self.geometry.forward_footprint(
+                        self.projector, prepared_data.shape, resize_factor, validity.block
+                    )):
+                        skipped.add(idx)
+                mask_hash = content_hash(validity.coarse) if validity is not None else None
+                result_key = cache_key("forward", data_hash, resize_factor, signatures, mask_hash)
+                cached = cache.get(result_key)
+                if cached is not None:
+                    logger.debug(f"Forward result {result_key} found in the result cache.")
+                    ctx.skipped_faces = skipped
+                    return {idx: cached[f"point_{idx}"] for idx, _ in points}
+
+            grids = []
+            for idx, updates in points:
+                logger.debug(f"Forward projecting for point {idx}, {updates}.")
+                # Update projector config for each tangent point
+                self.projector.config.update(**updates)
+                map_x, map_y = self.geometry.forward(self.projector, prepared_data.shape, resize_factor)
+                empty = validity is not None and not validity.any_valid(
+                    self.geometry.forward_footprint(self.projector, prepared_data.shape, resize_factor, validity.block)
+                )
+                key = geometry_key(self.projection_name, self.projector) if executor is not None else None
+                grids.append((idx, map_x, map_y, empty, key))
+            remap_kwargs = self._remap_kwargs()
+            first_x = grids[0][1]
+            plan = self._record_plan(plan_forward(
+                self.pipeline_cfg.max_memory, prepared_data.shape, prepared_data.dtype, len(grids),
+                first_x.shape[-2:], first_x.shape[0] if first_x.ndim == 3 else 1
+            ))
+
+        ctx.skipped_faces = {idx for idx, _, _, empty, _ in grids if empty}
+        if ctx.skipped_faces:
+            logger.debug(f"Skipping faces without valid data: {sorted(ctx.skipped_faces, key=str)}.")
+
+        # With an executor, each task only receives the rows its face reads
+        futures: Dict[Optional[int], Future] = {}
+        if executor is not None:
+            for idx, _, map_y, empty, key in grids:
+                if not empty:
+                    start, stop = footprint_rows(map_y, prepared_data.shape[0])
+                    futures[idx] = executor.submit(
+                        forward_face, key, prepared_data[start:stop], prepared_data.shape, start,
+                        resize_factor, remap_kwargs, plan.tile_rows
+                    )
+
+        faces = {}
+        try:
+            for idx, map_x, map_y, empty, _ in grids:
+                ctx.check()
+                if empty:
+                    faces[idx] = np.zeros(map_x.shape[-2:] + prepared_data.shape[2:], dtype=prepared_data.dtype)
+                elif executor is not None:
+                    faces[idx] = futures[idx].result()
+                else:
+                    faces[idx] = remap(prepared_data, map_x, map_y, tile_rows=plan.tile_rows, **remap_kwargs)
+        finally:
+            for future in futures.values():
+                future.cancel()
+        if result_key is not None:
+            cache.put(result_key, {f"point_{idx}": face for idx, face in faces.items()})
+        return faces
+
+    def _sampler_points(self) -> List[Tuple[int, Dict[str, float]]]:
+        """
+        Projector config updates of every tangent point of the sampler.
+
+        Returns:
+            List[Tuple[int, Dict[str, float]]]: (tangent point index, {"phi1_deg", "lam0_deg"}) pairs.
+        """
+        points = []
+        for idx, (lat_deg, lon_deg) in enumerate(self.sampler.get_tangent_points(), start=1):
+            lat = deg_to_rad(lat_deg)
+            lon = deg_to_rad(lon_deg)
+            points.append((idx, {"phi1_deg": rad_to_deg(lat), "lam0_deg": rad_to_deg(lon)}))
+        return points
+
+    def _footprint_index(
+        self,
+        points: List[Tuple[Optional[int], Dict[str, float]]],
+        resolution_deg: float
+    ) -> FootprintIndex:
+        """
+        Footprint index of the faces at the given tangent points, built once per configuration.
+
+        Call with the pipeline lock held and the face configuration applied to the projector.
+
+        Args:
+            points (List[Tuple[Optional[int], Dict[str, float]]]): (index, projector updates) per face.
+            resolution_deg (float): Cell size of the index in degrees.
+
+        Returns:
+            FootprintIndex: The index.
+        """
+        shape = index_shape(resolution_deg)
+        signatures = []
+        for _, updates in points:
+            self.projector.config.update(**updates)
+            signatures.append(projection_signature(self.projector))
+        key = (self.projection_name, shape, tuple(signatures))
+
+        index = self._footprint_indexes.get(key)
+        if index is None:
+            runs = []
+            for _, updates in points:
+                self.projector.config.update(**updates)
+                map_x, map_y = compute_forward_maps(self.projector, shape)
+                runs.append(footprint_runs(map_x, map_y, shape, 1))
+            index = FootprintIndex(shape, [idx for idx, _ in points], runs)
+            self._footprint_indexes[key] = index
+            logger.debug(f"Built {index!r}.")
+        return index
+
+    def face_indices(self, region: Union[Region, np.ndarray], resolution_deg: float = DEFAULT_INDEX_RESOLUTION,
+                     **kwargs: Any) -> List[int]:
+        """
+        Tangent point indices of the sampler's faces that intersect a region.
+
+        The answer is conservative: a face barely missing the region may be listed, one
+        overlapping it never is missed.
+
+        Args:
+            region (Union[Region, np.ndarray]): LatLonBox, Cone, MaskRegion or boolean equirectangular mask.
+            resolution_deg (float): Cell size of the footprint index in degrees.
             **kwargs (Any): Additional overrides for projector or sampler.
 
         Returns:
-            Dict[str, Any]: Dictionary with key "stacked" containing tangent-point projections.
-                            If original data was PipelineData, also includes unstacked versions.
+            List[int]: Sorted tangent point indices, as in "point_<idx>".
         """
+        if not self.sampler:
+            raise ValueError("Sampler is not set. Provide 'sampler_name' to query faces.")
+        region = as_region(region)
+        with self._lock:
+            self.update(**kwargs)
+            return self._footprint_index(self._sampler_points(), resolution_deg).query(region).tolist()
+
+    def _project_with_sampler(
+        self,
+        data: Union[PipelineData, np.ndarray],
+        context: Optional[ProjectionContext],
+        kwargs: Dict[str, Any],
+        shape_updates: Optional[Dict[str, int]] = None,
+        valid_mask: Optional[np.ndarray] = None,
+        region: Optional[Region] = None,
+        index_resolution: float = DEFAULT_INDEX_RESOLUTION
+    ) -> Dict[str, Any]:
         if not self.sampler:
             raise ValueError("Sampler is not set. Provide 'sampler_name' or use single_projection().")
 
-        # Update pipeline with any additional kwargs
-        self.update(**kwargs)
+        ctx = context or ProjectionContext()
+        faces = self._forward(data, ctx, kwargs, use_sampler=True, shape_updates=shape_updates, valid_mask=valid_mask,
+                              region=region, index_resolution=index_resolution)
 
-        tangent_points = self.sampler.get_tangent_points()
-        prepared_data, _ = self._prepare_data(data)
+        projections: Dict[str, Any] = {"stacked": {}}
+        for idx, out_img in faces.items():
+            projections["stacked"][f"point_{idx}"] = out_img
+            unstacked = ctx.unstack(out_img)
+            if unstacked is not None:
+                # Also provide unstacked version
+                projections[f"point_{idx}"] = unstacked
 
-        if isinstance(prepared_data, np.ndarray):
-            self._stacked_shape = prepared_data.shape
+        if context is None:
+            self._adopt_context(ctx)
+        return projections
 
-        projections: Dict[str, Any] = {"stacked": {}}
+    def project_with_sampler(
+        self,
+        data: Union[PipelineData, np.ndarray],
+        context: Optional[ProjectionContext] = None,
+        valid_mask: Optional[np.ndarray] = None,
+        **kwargs: Any
+    ) -> Dict[str, Any]:
+        """
+        Forward projection on a single stacked array for all tangent points (from the sampler).
 
-        for idx, (lat_deg, lon_deg) in enumerate(tangent_points, start=1):
-            lat = deg_to_rad(lat_deg)
-            lon = deg_to_rad(lon_deg)
-            logger.debug(f"Forward projecting for point {idx}, lat={lat_deg}, lon={lon_deg}.")
+        Args:
+            data (Union[PipelineData, np.ndarray]): Input data for projection.
+            context (Optional[ProjectionContext]): Per-request state. If None, the state is kept
+                                                   on the pipeline for the next backward call.
+            valid_mask (Optional[np.ndarray]): Boolean (H, W) mask of the valid input pixels; faces
+                                               reading no valid pixel are skipped and zero-filled.
+            **kwargs (Any): Additional overrides for projector or sampler.
+
+        Returns:
+            Dict[str, Any]: Dictionary with key "stacked" containing tangent-point projections.
+                            If original data was PipelineData, also includes unstacked versions.
+        """
+        return self._project_with_sampler(data, context, kwargs, valid_mask=valid_mask)
 
-            # Update projector config for each tangent point
-            self.projector.config.update(phi1_deg=rad_to_deg(lat), lam0_deg=rad_to_deg(lon))
+    def project_region(
+        self,
+        data: Union[PipelineData, np.ndarray],
+        region: Union[Region, np.ndarray],
+        context: Optional[ProjectionContext] = None,
+        valid_mask: Optional[np.ndarray] = None,
+        index_resolution: float = DEFAULT_INDEX_RESOLUTION,
+        **kwargs: Any
+    ) -> Dict[str, Any]:
+        """
+        Forward projection of only the sampler's faces that intersect a spherical region.
 
-            out_img = self.projector.forward(prepared_data)
-            projections["stacked"][f"point_{idx}"] = out_img
+        The faces are found in a footprint index built once per configuration (see
+        face_indices()), so a query around a detected object costs time proportional to
+        the region instead of projecting every tangent point.
 
-            if self._original_data:
-                # Also provide unstacked version
-                unstacked = self._original_data.unstack_new_instance(out_img, self._keys_order).as_dict()
-                projections[f"point_{idx}"] = unstacked
+        Args:
+            data (Union[PipelineData, np.ndarray]): Input data for projection.
+            region (Union[Region, np.ndarray]): LatLonBox, Cone, MaskRegion or boolean equirectangular mask.
+            context (Optional[ProjectionContext]): Per-request state. If None, the state is kept
+                                                   on the pipeline for the next backward call.
+            valid_mask (Optional[np.ndarray]): Boolean (H, W) mask of the valid input pixels.
+            index_resolution (float): Cell size of the footprint index in degrees.
+            **kwargs (Any): Additional overrides for projector or sampler.
 
+        Returns:
+            Dict[str, Any]: As project_with_sampler(), with only the selected faces, plus "indices":
+                            their sorted tangent point indices.
+        """
+        projections = self._project_with_sampler(data, context, kwargs, valid_mask=valid_mask,
+                                                  region=as_region(region), index_resolution=index_resolution)
+        projections["indices"] = sorted(int(name.split("_")[1]) for name in projections["stacked"])
         return projections
 
+    def _single_projection(
+        self,
+        data: Union[PipelineData, np.ndarray],
+        context: Optional[ProjectionContext],
+        kwargs: Dict[str, Any],
+        shape_updates: Optional[Dict[str, int]] = None,
+        valid_mask: Optional[np.ndarray] = None
+    ) -> Union[np.ndarray, Dict[str, Any]]:
+        ctx = context or ProjectionContext()
+        out_img = self._forward(data, ctx, kwargs, use_sampler=False, shape_updates=shape_updates,
+                                valid_mask=valid_mask)[None]
+        if context is None:
+            self._adopt_context(ctx)
+
+        unstacked = ctx.unstack(out_img)
+        if unstacked is not None:
+            output = {'stacked': out_img}
+            output.update(unstacked)
+            return output
+        else:
+            return out_img
+
     def single_projection(
         self,
         data: Union[PipelineData, np.ndarray],
+        context: Optional[ProjectionContext] = None,
+        valid_mask: Optional[np.ndarray] = None,
         **kwargs: Any
     ) -> Union[np.ndarray, Dict[str, Any]]:
         """
@@ -280,143 +885,445 @@ Note: You can pass any updates to these configurations via kwargs.
 
         Args:
             data (Union[PipelineData, np.ndarray]): Input data for projection.
+            context (Optional[ProjectionContext]): Per-request state. If None, the state is kept
+                                                   on the pipeline for the next backward call.
+            valid_mask (Optional[np.ndarray]): Boolean (H, W) mask of the valid input pixels; the
+                                               face is zero-filled if it reads no valid pixel.
             **kwargs (Any): Additional overrides for the projector config.
 
         Returns:
             Union[np.ndarray, Dict[str, Any]]: Projected image (stacked array), or if input was PipelineData,
                                               a dict with both "stacked" and unstacked components.
         """
-        self.update(**kwargs)
+        return self._single_projection(data, context, kwargs, valid_mask=valid_mask)
 
-        prepared_data, _ = self._prepare_data(data)
-        if isinstance(prepared_data, np.ndarray):
-            self._stacked_shape = prepared_data.shape
+    def viewer(self, data: Union[PipelineData, np.ndarray]) -> ViewRenderer:
+        """
+        Renderer of perspective views of a panorama, for interactive viewers.
 
-        out_img = self.projector.forward(prepared_data)
+        The renderer keeps a downsampled pyramid of the (stacked) panorama and shares the
+        pipeline's view grids, which are cached by quantized pitch, roll and field of view
+        and turned to any yaw by a longitude shift. Views are perspective (gnomonic)
+        whatever the pipeline's projection; the interpolation settings are the projection's.
 
-        if self._original_data:
-            unstacked = self._original_data.unstack_new_instance(out_img, self._keys_order)
-            output = {'stacked': out_img}
-            output.update(unstacked.as_dict())
+        Args:
+            data (Union[PipelineData, np.ndarray]): Equirectangular panorama.
+
+        Returns:
+            ViewRenderer: The renderer.
+        """
+        ctx = ProjectionContext()
+        with self._lock:
+            renderer = ViewRenderer(self._prepare_data(data, ctx), self.view_grids, self._remap_kwargs())
+        return renderer
+
+    def render_view(
+        self,
+        data: Union[PipelineData, np.ndarray],
+        yaw: float,
+        pitch: float,
+        roll: float = 0.0,
+        fov_deg: float = 90.0,
+        width: int = 640,
+        height: int = 480,
+        level: Optional[int] = None
+    ) -> Union[np.ndarray, Dict[str, Any]]:
+        """
+        Render a perspective view of a panorama.
+
+        Successive calls with the same data object reuse its renderer (see viewer()), so
+        the pyramid is built once and every frame costs one cached-grid lookup, a shift
+        and a remap. Pass a new object, not one modified in place, when the panorama changes.
+
+        Args:
+            data (Union[PipelineData, np.ndarray]): Equirectangular panorama.
+            yaw (float): Longitude of the view centre in degrees.
+            pitch (float): Latitude of the view centre in degrees.
+            roll (float): Rotation of the view about its axis in degrees, counter-clockwise.
+            fov_deg (float): Horizontal field of view in degrees.
+            width (int): Width of the view in pixels.
+            height (int): Height of the view in pixels.
+            level (Optional[int]): Pyramid level to sample; by default the coarsest that resolves the view.
+
+        Returns:
+            Union[np.ndarray, Dict[str, Any]]: The view, or if input was PipelineData, a dict with
+                                              both "stacked" and unstacked components.
+        """
+        with self._lock:
+            cached = self._viewer
+            if cached is None or cached[0] is not data:
+                ctx = ProjectionContext()
+                renderer = ViewRenderer(self._prepare_data(data, ctx), self.view_grids, self._remap_kwargs())
+                cached = self._viewer = (data, renderer, ctx)
+            else:
+                cached[1].remap_kwargs = self._remap_kwargs()
+        _, renderer, ctx = cached
+
+        view = renderer.render(yaw, pitch, roll, fov_deg, width, height, level=level)
+        unstacked = ctx.unstack(view)
+        if unstacked is not None:
+            output = {'stacked': view}
+            output.update(unstacked)
             return output
-        else:
-            return out_img
+        return view
 
+    @_measured("backward")
     def backward_with_sampler(
         self,
         rect_data: Dict[str, Any],
         img_shape: Optional[Tuple[int, int, int]] = None,
+        context: Optional[ProjectionContext] = None,
         **kwargs: Any
     ) -> Dict[str, np.ndarray]:
         """
         Handles backward projection and blends multiple equirectangular images into one
-        using feathered blending to reduce visible edges.
+        with the configured blender (feathered blending by default) to reduce visible edges.
+
+        Every face is back-projected over the bounding box of its footprint only.
 
         Args:
             rect_data (Dict[str, Any]): Dictionary containing "stacked" key with tangent-point images.
             img_shape (Optional[Tuple[int,int,int]]): Desired final shape. Overridden if pipeline had a forward pass.
+            context (Optional[ProjectionContext]): Context of the matching forward pass. Defaults to
+                                                   the state of the pipeline's last forward pass.
             **kwargs (Any): Additional overrides for the projector config.
 
         Returns:
             Dict[str, np.ndarray]: Dictionary with key "stacked" for the blended equirectangular output,
                                    plus unstacked components if original data was used.
         """
-        self.update(**kwargs)
+        ctx = context or self._context()
+        cache = self.result_cache
+        stacked_dict = rect_data.get("stacked")
+        faces_hash = None
+        if cache is not None and isinstance(stacked_dict, dict):
+            names = sorted(stacked_dict)
+            faces_hash = content_hash(*(stacked_dict[name] for name in names))
 
-        if not self.sampler:
-            raise ValueError("Sampler is not set. Provide 'sampler_name' or use single_backward().")
-
-        # Override img_shape with the shape from the forward pass if available
-        if self._stacked_shape is not None:
-            if img_shape is not None and img_shape != self._stacked_shape:
-                logger.warning(
-                    f"Overriding user-supplied img_shape={img_shape} with stacked_shape={self._stacked_shape} "
-                    "to ensure consistent channel dimensions."
-                )
-            img_shape = self._stacked_shape
+        with self._lock:
+            self._restore_config(ctx)
+            self.update(**kwargs)
+
+            if not self.sampler:
+                raise ValueError("Sampler is not set. Provide 'sampler_name' or use single_backward().")
+
+            # Override img_shape with the shape from the forward pass if available
+            if ctx.stacked_shape is not None:
+                if img_shape is not None and img_shape != ctx.stacked_shape:
+                    logger.warning(
+                        f"Overriding user-supplied img_shape={img_shape} with stacked_shape={ctx.stacked_shape} "
+                        "to ensure consistent channel dimensions."
+                    )
+                img_shape = ctx.stacked_shape
+
+            if img_shape is None:
+                raise ValueError("img_shape must be provided if no prior forward shape is available.")
 
-        if img_shape is None:
-            raise ValueError("img_shape must be provided if no prior forward shape is available.")
+            tangent_points = self.sampler.get_tangent_points()
 
-        tangent_points = self.sampler.get_tangent_points()
-        combined = np.zeros(img_shape, dtype=np.float32)
-        weight_map = np.zeros(img_shape[:2], dtype=np.float32)
+            if stacked_dict is None:
+                raise ValueError("rect_data must have a 'stacked' key with tangent-point images.")
 
+            # Update projector config for final shape
+            self.projector.config.update(
+                lon_points=img_shape[1],
+                lat_points=img_shape[0]
+            )
+
+            remap_kwargs = self._remap_kwargs()
+            n_jobs = self.n_jobs
+            executor = self.pipeline_cfg.executor
+            faces = []
+            for idx, (lat_deg, lon_deg) in enumerate(tangent_points, start=1):
+                rect_img = stacked_dict.get(f"point_{idx}")
+                if rect_img is None:
+                    raise ValueError(f"Missing 'point_{idx}' in rect_data['stacked'].")
+
+                if rect_img.shape[-1] != img_shape[-1]:
+                    raise ValueError(
+                        f"rect_img for point_{idx} has {rect_img.shape[-1]} channels, "
+                        f"but final shape indicates {img_shape[-1]} channels. Check your data."
+                    )
+                faces.append((idx, rect_img, lat_deg, lon_deg))
+
+            result_key, cached = None, None
+            if faces_hash is not None:
+                signatures = []
+                for _, _, lat_deg, lon_deg in faces:
+                    self.projector.config.update(phi1_deg=lat_deg, lam0_deg=lon_deg)
+                    signatures.append(projection_signature(self.projector))
+                result_key = cache_key("backward", faces_hash, names, tuple(img_shape), signatures, repr(self.blender))
+                cached = cache.get(result_key)
+
+            tasks, boxes, keys = [], {}, {}
+            if cached is None:
+                for idx, rect_img, lat_deg, lon_deg in faces:
+                    if idx in ctx.skipped_faces and not rect_img.any():
+                        continue  # Skipped by the forward pass and still all zeros: adds nothing to the blend
+                    self.projector.config.update(phi1_deg=lat_deg, lam0_deg=lon_deg)
+                    box, map_x, map_y, mask = self.geometry.backward_crop(self.projector)
+                    boxes[idx] = (slice(box[0], box[1]), slice(box[2], box[3]))
+                    if executor is not None:
+                        keys[idx] = geometry_key(self.projection_name, self.projector)
+                    tasks.append((idx, rect_img, map_x, map_y, mask, remap_kwargs))
+            blender = self.blender
+
+        backend = "loky"
+        if executor is not None:
+            # Every face may be in flight at once, unless the memory budget says otherwise
+            backend, n_jobs = "executor", max(1, len(tasks))
+        elif n_jobs == "auto":
+            backend, n_jobs = self._tuned_parallelism(tasks, img_shape, blender) if tasks else ("sequential", 1)
+        workers = n_jobs
+        if n_jobs < 0:
+            from joblib import effective_n_jobs  # Imported on first use, it is slow to import
+
+            # joblib counts negative values back from the number of CPUs (-1: all of them)
+            workers = effective_n_jobs(n_jobs)
+        in_flight = max(1, workers)
+        if tasks:
+            plan = self._record_plan(plan_backward(
+                self.pipeline_cfg.max_memory, tuple(img_shape), tasks[0][1].shape, tasks[0][1].dtype.itemsize,
+                max(task[2].size for task in tasks), len(tasks), workers, blender.streaming
+            ))
+            if plan.budget is not None:
+                # Without a budget the plan is only recorded, and n_jobs goes to joblib as given
+                n_jobs, in_flight = plan.n_jobs, plan.in_flight
+
+        if cached is not None:
+            logger.debug(f"Backward result {result_key} found in the result cache.")
+            combined = cached["stacked"]
+        else:
+            combined = self._blend_backward(
+                tasks, boxes, blender, n_jobs, in_flight, img_shape, ctx,
+                backend=backend, executor=executor, keys=keys
+            )
+            if result_key is not None:
+                cache.put(result_key, {"stacked": combined})
+
+        output: Dict[str, Any] = {"stacked": combined}
+        unstacked = ctx.unstack(combined)
+        if unstacked is not None:
+            output.update(unstacked)
+        return output
+
+    def backward_incremental(
+        self,
+        rect_data: Dict[str, Any],
+        img_shape: Optional[Tuple[int, int, int]] = None,
+        context: Optional[ProjectionContext] = None,
+        **kwargs: Any
+    ) -> IncrementalBlend:
+        """
+        Backward projection into a stateful blend that can update single faces.
+
+        Gives the same result as backward_with_sampler, but the returned IncrementalBlend
+        keeps each face's contribution: after editing a few faces, call
+        blend.update_face(idx, new_img) for each of them instead of re-running the backward
+        pass, at a cost proportional to the changed faces' footprints.
+
+        Args:
+            rect_data (Dict[str, Any]): Dictionary containing "stacked" key with tangent-point images.
+            img_shape (Optional[Tuple[int,int,int]]): Desired final shape. Overridden if pipeline had a forward pass.
+            context (Optional[ProjectionContext]): Context of the matching forward pass. Defaults to
+                                                   the state of the pipeline's last forward pass.
+            **kwargs (Any): Additional overrides for the projector config.
+
+        Returns:
+            IncrementalBlend: The blend; blend.result() has the format of backward().
+        """
+        ctx = context or self._context()
         stacked_dict = rect_data.get("stacked")
         if stacked_dict is None:
             raise ValueError("rect_data must have a 'stacked' key with tangent-point images.")
 
-        # Update projector config for final shape
-        self.projector.config.update(
-            lon_points=img_shape[1],
-            lat_points=img_shape[0]
-        )
-
-        tasks = []
-        for idx, (lat_deg, lon_deg) in enumerate(tangent_points, start=1):
+        with self._lock:
+            self._restore_config(ctx)
+            self.update(**kwargs)
+            if not self.sampler:
+                raise ValueError("Sampler is not set. Provide 'sampler_name' to blend faces.")
+
+            img_shape = ctx.stacked_shape if ctx.stacked_shape is not None else img_shape
+            if img_shape is None:
+                raise ValueError("img_shape must be provided if no prior forward shape is available.")
+
+            self.projector.config.update(lon_points=img_shape[1], lat_points=img_shape[0])
+            geometry = {}
+            for idx, (lat_deg, lon_deg) in enumerate(self.sampler.get_tangent_points(), start=1):
+                self.projector.config.update(phi1_deg=lat_deg, lam0_deg=lon_deg)
+                geometry[idx] = self.geometry.backward_crop(self.projector)
+            remap_kwargs = self._remap_kwargs()
+
+        blend = IncrementalBlend(img_shape, geometry, remap_kwargs, context=ctx)
+        for idx in geometry:
             rect_img = stacked_dict.get(f"point_{idx}")
             if rect_img is None:
                 raise ValueError(f"Missing 'point_{idx}' in rect_data['stacked'].")
+            ctx.check()
+            if idx not in ctx.skipped_faces or rect_img.any():
+                blend.update_face(idx, rect_img)
+        return blend
 
-            if rect_img.shape[-1] != img_shape[-1]:
-                raise ValueError(
-                    f"rect_img for point_{idx} has {rect_img.shape[-1]} channels, "
-                    f"but final shape indicates {img_shape[-1]} channels. Check your data."
-                )
+    def _blend_backward(
+        self,
+        tasks: List[Tuple[Any, ...]],
+        boxes: Dict[int, Tuple[slice, slice]],
+        blender: BaseBlender,
+        n_jobs: int,
+        in_flight: int,
+        img_shape: Tuple[int, ...],
+        ctx: ProjectionContext,
+        backend: str = "loky",
+        executor: Optional[Executor] = None,
+        keys: Optional[Dict[int, Dict[str, Any]]] = None
+    ) -> np.ndarray:
+        """
+        Back-project every face over its footprint and blend them into one equirectangular image.
 
-            tasks.append((idx, lat_deg, lon_deg, rect_img))
+        Args:
+            tasks (List[Tuple[Any, ...]]): Arguments of _backward_task per face, on cropped grids.
+            boxes (Dict[int, Tuple[slice, slice]]): Footprint bounding box of each face.
+            blender (BaseBlender): Blender combining the faces.
+            n_jobs (int): Number of parallel jobs.
+            in_flight (int): Faces back-projected before they are handed to a streaming blender.
+            img_shape (Tuple[int, ...]): Shape of the equirectangular output.
+            ctx (ProjectionContext): Per-request state, checked for cancellation between faces.
+            backend (str): joblib backend of the parallel jobs, or "sequential".
+            executor (Optional[Executor]): Executor running tasks.backward_face instead of joblib. At most
+                                           in_flight faces are submitted and not yet blended.
+            keys (Optional[Dict[int, Dict[str, Any]]]): Geometry key of each face, for the executor.
 
-        def _backward_task(
-            idx: int,
-            lat_deg_: float,
-            lon_deg_: float,
-            rect_img_: np.ndarray
-        ) -> Tuple[int, np.ndarray, np.ndarray]:
-            """
-            Worker function for parallel backward projection.
-            """
-            logger.debug(f"[Parallel] Backward projecting point_{idx}, lat={lat_deg_}, lon={lon_deg_}...")
+        Returns:
+            np.ndarray: Blended float32 image of shape img_shape.
+        """
+        logger.info(f"Starting backward with n_jobs={n_jobs} ({backend}) on {len(tasks)} tasks.")
+
+        def faces() -> Iterator[Tuple[Tuple[slice, slice], np.ndarray]]:
+            if executor is not None:
+                yield from self._executor_faces(executor, tasks, boxes, keys, in_flight, ctx)
+                return
+            if n_jobs == 1 or backend == "sequential":
+                for task in tasks:
+                    ctx.check()
+                    idx, eq_img, _ = _backward_task(*task)
+                    yield boxes[idx], eq_img
+                return
+
+            from joblib import Parallel, delayed  # Imported on first use, it is slow to import
+
+            # Streaming blenders fold faces in as they come, so only in_flight of them are held
+            chunk = in_flight if blender.streaming else len(tasks)
+            with Parallel(n_jobs=n_jobs, backend=backend) as parallel:
+                for start in range(0, len(tasks), chunk):
+                    ctx.check()
+                    results = parallel(delayed(_backward_task)(*task) for task in tasks[start:start + chunk])
+                    while results:
+                        idx, eq_img, _ = results.pop(0)
+                        yield boxes[idx], eq_img
+
+        blended = blender.blend(faces(), img_shape)
+        logger.info("All backward tasks completed.")
+        return blended
+
+    @staticmethod
+    def _executor_faces(
+        executor: Executor,
+        tasks: List[Tuple[Any, ...]],
+        boxes: Dict[int, Tuple[slice, slice]],
+        keys: Dict[int, Dict[str, Any]],
+        window: int,
+        ctx: ProjectionContext
+    ) -> Iterator[Tuple[Tuple[slice, slice], np.ndarray]]:
+        """
+        Back-project faces on an executor, keeping at most `window` of them submitted but not yet yielded.
 
-            self.projector.config.update(
-                phi1_deg=lat_deg_,
-                lam0_deg=lon_deg_,
-            )
-            equirect_img, mask = self.projector.backward(rect_img_, return_mask=True)
-            return idx, equirect_img, mask
+        Args:
+            executor (Executor): Executor running tasks.backward_face.
+            tasks (List[Tuple[Any, ...]]): Arguments of _backward_task per face.
+            boxes (Dict[int, Tuple[slice, slice]]): Footprint bounding box of each face.
+            keys (Dict[int, Dict[str, Any]]): Geometry key of each face.
+            window (int): Maximum number of faces in flight.
+            ctx (ProjectionContext): Per-request state, checked for cancellation between faces.
+
+        Yields:
+            Tuple[Tuple[slice, slice], np.ndarray]: (box, back-projected crop) per face, in task order.
+        """
+        remaining = iter(tasks)
+        pending: "deque[Tuple[int, Future]]" = deque()
+
+        def submit_next() -> None:
+            task = next(remaining, None)
+            if task is not None:
+                idx, rect_img, remap_kwargs = task[0], task[1], task[5]
+                pending.append((idx, executor.submit(backward_face, keys[idx], rect_img, remap_kwargs)))
+
+        try:
+            for _ in range(max(1, window)):
+                submit_next()
+            while pending:
+                idx, future = pending.popleft()
+                ctx.check()
+                _, eq_img = future.result()
+                submit_next()
+                yield boxes[idx], eq_img
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+    def _tuned_parallelism(
+        self,
+        tasks: List[Tuple[Any, ...]],
+        img_shape: Tuple[int, ...],
+        blender: BaseBlender
+    ) -> Tuple[str, int]:
+        """
+        Backend and worker count for n_jobs="auto", calibrated once per machine and workload.
 
-        logger.info(f"Starting backward with n_jobs={self.n_jobs} on {len(tasks)} tasks.")
-        results = Parallel(n_jobs=self.n_jobs)(
-            delayed(_backward_task)(*task) for task in tasks
-        )
-        logger.info("All backward tasks completed.")
+        The calibration times the back-projection of a sample of the faces sequentially, on
+        threads and on processes (see autotune.candidate_settings), and persists the fastest.
+        It runs again only for new shapes, dtypes, projections, samplers or blenders.
 
-        # Feathered blending
-        from scipy.ndimage import distance_transform_edt
-        for (idx, eq_img, mask) in results:
-            valid_mask = np.max(eq_img > 0, axis=-1).astype(np.float32)
-            distance = distance_transform_edt(valid_mask)
-            feathered_mask = distance / distance.max() if distance.max() != 0 else valid_mask
-
-            combined += eq_img * feathered_mask[..., None]
-            weight_map += feathered_mask
-
-        # Normalize
-        valid_weights = weight_map > 0
-        combined[valid_weights] /= weight_map[valid_weights, None]
-        combined[~valid_weights] = 0
-
-        if self._original_data is not None and self._keys_order is not None:
-            new_data = self._original_data.unstack_new_instance(combined, self._keys_order)
-            output: Dict[str, Any] = {"stacked": combined}
-            output.update(new_data.as_dict())
-            return output
-        else:
-            return {"stacked": combined}
+        Args:
+            tasks (List[Tuple[Any, ...]]): Arguments of _backward_task per face.
+            img_shape (Tuple[int, ...]): Shape of the equirectangular output.
+            blender (BaseBlender): Blender of the pass.
+
+        Returns:
+            Tuple[str, int]: (backend, n_jobs).
+        """
+        face = tasks[0][1]
+        key = (f"backward|{self.projection_name}|{self.sampler_name}|faces={len(tasks)}|img={tuple(img_shape)}"
+               f"|face={face.shape}|{face.dtype}|{blender!r}")
+        entry = self.tuner.lookup(key)
+        if entry is None:
+            from joblib import Parallel, delayed  # Imported on first use, it is slow to import
+
+            candidates = candidate_settings()
+            sample = tasks[:min(len(tasks), 2 * max(n for _, n in candidates))]
+
+            def run(backend: str, n_jobs: int) -> None:
+                if backend == "sequential":
+                    for task in sample:
+                        _backward_task(*task)
+                else:
+                    Parallel(n_jobs=n_jobs, backend=backend)(delayed(_backward_task)(*task) for task in sample)
+
+            def warm_up(backend: str, n_jobs: int) -> None:
+                # Worker processes are reused across calls, so their startup is not part of the timing
+                if backend == "loky":
+                    Parallel(n_jobs=n_jobs, backend=backend)(delayed(abs)(i) for i in range(n_jobs))
+
+            (backend, n_jobs), timings = calibrate(run, candidates, warm_up=warm_up)
+            entry = {"backend": backend, "n_jobs": n_jobs, "timings": timings}
+            logger.info(f"Calibrated backward parallelism: {backend} with n_jobs={n_jobs} ({timings}).")
+            self.tuner.record(key, entry)
+        return entry["backend"], int(entry["n_jobs"])
 
     def single_backward(
         self,
         rect_data: Union[np.ndarray, Dict[str, Any]],
         img_shape: Optional[Tuple[int, int, int]] = None,
+        context: Optional[ProjectionContext] = None,
         **kwargs: Any
     ) -> Union[np.ndarray, Dict[str, Any]]:
         """
@@ -425,52 +1332,143 @@ Note: You can pass any updates to these configurations via kwargs.
         Args:
             rect_data (Union[np.ndarray, Dict[str, Any]]): Either a NumPy array or a dict with a 'stacked' key.
             img_shape (Optional[Tuple[int,int,int]]): Shape for the output (overridden if pipeline had a forward pass).
+            context (Optional[ProjectionContext]): Context of the matching forward pass. Defaults to
+                                                   the state of the pipeline's last forward pass.
             **kwargs (Any): Additional overrides for the projector config.
 
         Returns:
             Union[np.ndarray, Dict[str, Any]]: Backprojected image (stacked array), or dict with unstacked components if original data was used.
         """
-        self.update(**kwargs)
+        ctx = context or self._context()
 
-        if self._stacked_shape is not None and img_shape != self._stacked_shape:
+        if ctx.stacked_shape is not None and img_shape != ctx.stacked_shape:
             logger.warning(
-                f"Overriding user-supplied img_shape={img_shape} with stacked_shape={self._stacked_shape} "
+                f"Overriding user-supplied img_shape={img_shape} with stacked_shape={ctx.stacked_shape} "
                 "for single_backward."
             )
-            img_shape = self._stacked_shape
+            img_shape = ctx.stacked_shape
 
-        # If rect_data is directly a NumPy array
+        # rect_data is either directly a NumPy array or a dictionary
         if isinstance(rect_data, np.ndarray):
-            out_img, _ = self.projector.backward(rect_data, return_mask=True)
-            if self._original_data and self._keys_order:
-                new_data = self._original_data.unstack_new_instance(out_img, self._keys_order)
-                return new_data.as_dict()
-            else:
-                return out_img
+            stacked_arr = rect_data
+        else:
+            stacked_arr = rect_data.get("stacked")
+            if stacked_arr is None:
+                raise ValueError("Expecting key 'stacked' in rect_data for single_backward.")
 
-        # If rect_data is a dictionary
-        stacked_arr = rect_data.get("stacked")
-        if stacked_arr is None:
-            raise ValueError("Expecting key 'stacked' in rect_data for single_backward.")
+            if img_shape and stacked_arr.shape[-1] != img_shape[-1]:
+                raise ValueError(
+                    f"Stacked array has {stacked_arr.shape[-1]} channels, but final shape indicates {img_shape[-1]} channels."
+                )
 
-        if img_shape and stacked_arr.shape[-1] != img_shape[-1]:
-            raise ValueError(
-                f"Stacked array has {stacked_arr.shape[-1]} channels, but final shape indicates {img_shape[-1]} channels."
-            )
+        with self._lock:
+            self._restore_config(ctx)
+            self.update(**kwargs)
+            map_x, map_y, mask = self.geometry.backward(self.projector)
+            remap_kwargs = self._remap_kwargs()
 
-        out_img, _ = self.projector.backward(stacked_arr, return_mask=True)
-        if self._original_data and self._keys_order:
-            new_data = self._original_data.unstack_new_instance(out_img, self._keys_order)
-            return new_data.as_dict()
+        ctx.check()
+        if None in ctx.skipped_faces and not stacked_arr.any():
+            # The forward pass skipped the face and it was not edited since, it is all zeros
+            out_img = np.zeros(map_x.shape + stacked_arr.shape[2:], dtype=stacked_arr.dtype)
         else:
-            return out_img
+            out_img = remap(stacked_arr, map_x, map_y, mask=mask, **remap_kwargs)
+        unstacked = ctx.unstack(out_img)
+        return unstacked if unstacked is not None else out_img
 
-    def project(self, data: Union[PipelineData, np.ndarray], **kwargs: Any) -> Dict[str, Any]:
+    def export_operator(
+        self,
+        img_shape: Tuple[int, ...],
+        path: Optional[str] = None,
+        **kwargs: Any
+    ) -> "SparseProjectionOperator":
+        """
+        Export forward and backward projection of the current sampler configuration as sparse matrices.
+
+        The operator is cached per configuration and shape, so repeated calls are free.
+        Saving it with `path` lets other processes use SparseProjectionOperator.load()
+        and skip geometry computation entirely. Like project() and backward(), it folds
+        in the resize_factor and auto_size settings: operator.project() takes (H, W)
+        images and operator.backproject() returns them at the resized shape.
+
+        Args:
+            img_shape (Tuple[int, ...]): Shape of the equirectangular image (H, W[, C]).
+            path (Optional[str]): If given, also save the operator to this .npz file.
+            **kwargs (Any): Additional overrides for projector or sampler.
+
+        Returns:
+            SparseProjectionOperator: The operator for this configuration.
+
+        Raises:
+            ValueError: If the interpolation or border settings of the projection are not
+                        linear (only cv2.BORDER_CONSTANT with a zero border value is).
+        """
+        if not self.sampler:
+            raise ValueError("Sampler is not set. Provide 'sampler_name' to export a sampler operator.")
+
+        with self._lock:
+            self.update(**kwargs)
+            H, W = img_shape[:2]
+            resize_factor = self.resize_factor
+            out_shape = scaled_shape((H, W), resize_factor)
+            self.projector.config.update(lon_points=out_shape[1], lat_points=out_shape[0])
+            if self.pipeline_cfg.auto_size:
+                self.projector.config.update(**self.face_size(out_shape))
+            tangent_points = self.sampler.get_tangent_points()
+
+            signatures = []
+            for lat_deg, lon_deg in tangent_points:
+                self.projector.config.update(phi1_deg=lat_deg, lam0_deg=lon_deg)
+                signatures.append(projection_signature(self.projector))
+            key = ((H, W), float(resize_factor), tuple(signatures))
+
+            operator = self._operators.get(key)
+            if operator is None:
+                from .operators import SparseProjectionOperator
+
+                params = self.projector.config.config_object.config
+                forward_maps, backward_maps, weights = [], [], []
+                for lat_deg, lon_deg in tangent_points:
+                    self.projector.config.update(phi1_deg=lat_deg, lam0_deg=lon_deg)
+                    forward_maps.append(self.geometry.forward(self.projector, (H, W), resize_factor))
+                    backward_maps.append(self.geometry.backward(self.projector))
+                    weights.append(self.geometry.weights(self.projector))
+
+                operator = SparseProjectionOperator.from_geometry(
+                    forward_maps, backward_maps, weights,
+                    img_shape=(H, W),
+                    face_shape=(params.y_points, params.x_points),
+                    tangent_points=tangent_points,
+                    interpolation=params.interpolation,
+                    border_mode=params.borderMode,
+                    border_value=params.borderValue,
+                    out_shape=out_shape,
+                )
+                self._operators[key] = operator
+                logger.info(f"Built {operator!r}.")
+
+        if path is not None:
+            operator.save(path)
+        return operator
+
+    def project(
+        self,
+        data: Union[PipelineData, np.ndarray],
+        context: Optional[ProjectionContext] = None,
+        valid_mask: Optional[np.ndarray] = None,
+        **kwargs: Any
+    ) -> Dict[str, Any]:
         """
         Top-level forward projection interface. Chooses sampler-based or single projection.
 
         Args:
             data (Union[PipelineData, np.ndarray]): Input data for projection.
+            context (Optional[ProjectionContext]): Per-request state, for concurrent use of one pipeline.
+                                                   If None, the state is kept on the pipeline for the
+                                                   next backward call.
+            valid_mask (Optional[np.ndarray]): Boolean (H, W) mask of the valid input pixels. Faces
+                                               reading no valid pixel skip forward and backward work
+                                               and come out zero-filled (see PipelineConfig.skip_empty_faces).
             **kwargs (Any): Additional overrides.
 
         Returns:
@@ -483,22 +1481,116 @@ Note: You can pass any updates to these configurations via kwargs.
         else:
             raise Exception("Input data must be an instance of PipelineData or a Numpy Array")
         
+        img_shape = scaled_shape(img_shape, kwargs.get("resize_factor", self.resize_factor))
         shape = {'lon_points': img_shape[0], 'lat_points': img_shape[1]}
-        logger.debug(f"Updating x_points and y_points to {shape}.")
-        self.update(**shape)
-       
+
         if self.sampler:
-            return self.project_with_sampler(data, **kwargs)
+            return self._project_with_sampler(data, context, kwargs, shape_updates=shape, valid_mask=valid_mask)
         else:
-            out = self.single_projection(data, **kwargs)
+            out = self._single_projection(data, context, kwargs, shape_updates=shape, valid_mask=valid_mask)
             if isinstance(out, dict):
                 return out
             return {"stacked": out}
 
+    def projection_pipeline(self, projection_name: str, sampler_name: Optional[str]) -> "ProjectionPipeline":
+        """
+        Pipeline of another projection with this pipeline's configuration, as used by project_many().
+
+        It keeps its own grids and the state of its last forward pass, so its faces can be
+        back-projected with its backward().
+
+        Args:
+            projection_name (str): Registered projection name.
+            sampler_name (Optional[str]): Sampler name, or None for single projections.
+
+        Returns:
+            ProjectionPipeline: This pipeline for its own projection and sampler, otherwise a
+                                pipeline created on first use.
+        """
+        if (projection_name, sampler_name) == (self.projection_name, self.sampler_name):
+            return self
+        key = (projection_name, sampler_name)
+        with self._lock:
+            pipeline = self._fanout.get(key)
+            if pipeline is None:
+                cfg = copy.copy(self.pipeline_cfg)
+                cfg.resizer_cfg = copy.copy(cfg.resizer_cfg)
+                pipeline = ProjectionPipeline(projection_name, sampler_name, pipeline_cfg=cfg)
+                self._fanout[key] = pipeline
+            return pipeline
+
+    def project_many(
+        self,
+        data: Union[PipelineData, np.ndarray],
+        projections: Union[Iterable[str], Dict[str, Dict[str, Any]]],
+        valid_mask: Optional[np.ndarray] = None,
+        **kwargs: Any
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Forward projection of one input with several projections at once.
+
+        The input is stacked (and its validity mask derived) once, and the projections run
+        concurrently, each on its own pipeline (see projection_pipeline()), so their grids
+        are cached across calls like a single pipeline's. Every projection uses this
+        pipeline's sampler unless its overrides give another "sampler_name" (None for one
+        projection of the whole input, e.g. a mercator view). Each pipeline keeps the state
+        of its forward pass for its own backward(). Only the stacking and the mask are
+        shared: every pipeline has its own sampler, which computes its own tangent points.
+
+        Args:
+            data (Union[PipelineData, np.ndarray]): Input data for projection.
+            projections (Union[Iterable[str], Dict[str, Dict[str, Any]]]): Projection names, or a dict from
+                                                                         names to projection-specific overrides.
+            valid_mask (Optional[np.ndarray]): Boolean (H, W) mask of the valid input pixels.
+            **kwargs (Any): Overrides shared by every projection.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: The result of project() per projection name.
+        """
+        if isinstance(projections, dict):
+            overrides = {name: dict(params or {}) for name, params in projections.items()}
+        else:
+            overrides = {name: {} for name in projections}
+        if not overrides:
+            return {}
+        ctx = ProjectionContext()
+        stacked = self._prepare_data(data, ctx)
+        if valid_mask is None and self.pipeline_cfg.skip_empty_faces:
+            valid_mask = derive_valid_mask(stacked)
+        pipelines = {
+            name: self.projection_pipeline(name, params.pop("sampler_name", self.sampler_name))
+            for name, params in overrides.items()
+        }
+
+        def run(name: str) -> Dict[str, Any]:
+            pipeline = pipelines[name]
+            face_ctx = ProjectionContext()
+            projected = pipeline.project(stacked, context=face_ctx, valid_mask=valid_mask, **{**kwargs, **overrides[name]})
+            face_ctx.original_data, face_ctx.keys_order = ctx.original_data, ctx.keys_order
+            pipeline._adopt_context(face_ctx)
+            # Un-stack with the keys of the original input, which the pipelines did not see
+            faces = projected["stacked"]
+            if isinstance(faces, dict):
+                for face_name, face in faces.items():
+                    unstacked = face_ctx.unstack(face)
+                    if unstacked is not None:
+                        projected[face_name] = unstacked
+            else:
+                projected.update(face_ctx.unstack(faces) or {})
+            return projected
+
+        if len(pipelines) == 1:
+            return {name: run(name) for name in pipelines}
+        # OpenCV releases the GIL while resampling, so the projections overlap on threads
+        with ThreadPoolExecutor(max_workers=len(pipelines), thread_name_prefix="panorai-fanout") as pool:
+            futures = {name: pool.submit(run, name) for name in pipelines}
+            return {name: future.result() for name, future in futures.items()}
+
     def backward(
         self,
         data: Union[Dict[str, Any], np.ndarray],
         img_shape: Optional[Tuple[int, int, int]] = None,
+        context: Optional[ProjectionContext] = None,
         **kwargs: Any
     ) -> Dict[str, Any]:
         """
@@ -507,15 +1599,141 @@ Note: You can pass any updates to these configurations via kwargs.
         Args:
             data (Union[Dict[str, Any], np.ndarray]): Equirectangular or rectified input data.
             img_shape (Optional[Tuple[int,int,int]]): Desired output shape (overridden if pipeline had a forward pass).
+            context (Optional[ProjectionContext]): Context of the matching forward pass. Defaults to
+                                                   the state of the pipeline's last forward pass.
             **kwargs (Any): Additional overrides.
 
         Returns:
             Dict[str, Any]: A dictionary containing backward projection (blended) results.
         """
         if self.sampler:
-            return self.backward_with_sampler(data, img_shape=img_shape, **kwargs)
+            return self.backward_with_sampler(data, img_shape=img_shape, context=context, **kwargs)
         else:
-            out = self.single_backward(data, img_shape=img_shape, **kwargs)
+            out = self.single_backward(data, img_shape=img_shape, context=context, **kwargs)
             if isinstance(out, dict):
                 return out
-            return {"stacked": out}
\ No newline at end of file
+            return {"stacked": out}
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.pipeline_cfg.async_workers, thread_name_prefix="panorai-async"
+                )
+            return self._executor
+
+    async def _run_async(self, fn: Callable[[], Any], ctx: ProjectionContext) -> Any:
+        """
+        Run a blocking call on the pipeline's executor, cancelling it with the awaiting task.
+        """
+        future = asyncio.get_running_loop().run_in_executor(self._get_executor(), fn)
+        try:
+            return await future
+        except asyncio.CancelledError:
+            # The worker thread cannot be interrupted; it stops at the next face
+            ctx.cancel()
+            raise
+
+    async def aproject(
+        self,
+        data: Union[PipelineData, np.ndarray],
+        context: Optional[ProjectionContext] = None,
+        **kwargs: Any
+    ) -> Tuple[Dict[str, Any], ProjectionContext]:
+        """
+        Asynchronous project() for serving workloads.
+
+        Runs on a thread pool owned by the pipeline (PipelineConfig.async_workers threads), so
+        concurrent requests share one warm pipeline and its geometry cache without blocking the
+        event loop. The per-request state is returned in a context instead of being stored on
+        the pipeline; pass it to abackward(). Cancelling the awaiting task cancels the context,
+        which stops the projection at the next face.
+
+        Args:
+            data (Union[PipelineData, np.ndarray]): Input data for projection.
+            context (Optional[ProjectionContext]): Context to fill. A new one is created if None.
+            **kwargs (Any): Additional overrides.
+
+        Returns:
+            Tuple[Dict[str, Any], ProjectionContext]: The projection results and the request's context.
+        """
+        ctx = context or ProjectionContext()
+        result = await self._run_async(functools.partial(self.project, data, context=ctx, **kwargs), ctx)
+        return result, ctx
+
+    async def abackward(
+        self,
+        data: Union[Dict[str, Any], np.ndarray],
+        context: Optional[ProjectionContext] = None,
+        img_shape: Optional[Tuple[int, int, int]] = None,
+        **kwargs: Any
+    ) -> Dict[str, Any]:
+        """
+        Asynchronous backward(), see aproject().
+
+        Args:
+            data (Union[Dict[str, Any], np.ndarray]): Rectified input data.
+            context (Optional[ProjectionContext]): Context returned by aproject(). Without it,
+                                                   img_shape is required and no un-stacking is done.
+            img_shape (Optional[Tuple[int,int,int]]): Desired output shape (overridden by the context).
+            **kwargs (Any): Additional overrides.
+
+        Returns:
+            Dict[str, Any]: A dictionary containing backward projection (blended) results.
+        """
+        ctx = context or ProjectionContext()
+        return await self._run_async(
+            functools.partial(self.backward, data, img_shape=img_shape, context=ctx, **kwargs), ctx
+        )
+
+    def close(self) -> None:
+        """Shut down the thread pool used by aproject/abackward, if it was started."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def stream(
+        self,
+        frames: Iterable[Any],
+        operation: str = "project",
+        loader: Optional[Callable[[Any], Any]] = None,
+        writer: Optional[Callable[[int, Dict[str, Any]], None]] = None,
+        prefetch: int = 2,
+        write_queue: int = 2,
+        **kwargs: Any
+    ) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Process a video or image sequence whose frames share shape and configuration.
+
+        The next frame is decoded in a background thread while the current one projects,
+        and results are handed to `writer` from another thread through bounded queues.
+        All frames reuse the cached geometry of the first one.
+
+        Args:
+            frames (Iterable[Any]): Frames (PipelineData or np.ndarray), or items decoded by `loader`.
+            operation (str): "project", "backward" or "both" (project followed by backward).
+            loader (Optional[Callable[[Any], Any]]): Decoder applied to each item of `frames`, e.g. a file reader.
+            writer (Optional[Callable[[int, Dict[str, Any]], None]]): Called as writer(frame_index, result) in the background.
+            prefetch (int): Number of decoded frames buffered ahead of processing.
+            write_queue (int): Number of results buffered ahead of the writer.
+            **kwargs (Any): Additional overrides, applied to every frame.
+
+        Yields:
+            Tuple[int, Dict[str, Any]]: (frame_index, result) in input order. With operation="both",
+                                        result is {"project": ..., "backward": ...}.
+        """
+        if operation == "project":
+            def process(frame: Any) -> Dict[str, Any]:
+                return self.project(frame, **kwargs)
+        elif operation == "backward":
+            def process(frame: Any) -> Dict[str, Any]:
+                return self.backward(frame, **kwargs)
+        elif operation == "both":
+            def process(frame: Any) -> Dict[str, Any]:
+                projected = self.project(frame, **kwargs)
+                return {"project": projected, "backward": self.backward(projected, **kwargs)}
+        else:
+            raise ValueError(f"Unknown operation '{operation}'. Expected 'project', 'backward' or 'both'.")
+
+        return _stream(process, frames, loader=loader, writer=writer, prefetch=prefetch, write_queue=write_queue)
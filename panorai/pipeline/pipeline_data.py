@@ -1,12 +1,16 @@
 import numpy as np
+from concurrent.futures import Executor
 from typing import Dict, List, Tuple, Union, Optional
 
-from .utils import PreprocessEquirectangularImage
+from .sources import LazyArray, open_npy_dir, open_npz
 
 
 class PipelineData:
     """
     A container for paired data (e.g., RGB image, depth map, and additional arrays) for projection.
+
+    Entries can also be LazyArray handles (see from_npz / from_npy_dir), which are read
+    from disk on first access and can be released again with release().
     """
 
     def __init__(self, rgb: np.ndarray, depth: Optional[np.ndarray] = None, **kwargs: np.ndarray) -> None:
@@ -20,8 +24,9 @@ class PipelineData:
 
         Notes:
             You can store arbitrary data arrays, but each must share the same (H, W) dimensions.
+            Any array may be replaced by a LazyArray handle.
         """
-        self.data: Dict[str, np.ndarray] = {}
+        self.data: Dict[str, Union[np.ndarray, LazyArray]] = {}
 
         if rgb is not None:
             self.data["rgb"] = rgb
@@ -36,14 +41,48 @@ class PipelineData:
             self.H, self.W = v.shape[:2]
             break
 
+        # Set by pack(): the shared buffer and the views of it held in self.data
+        self._buffer: Optional[np.ndarray] = None
+        self._buffer_keys: List[str] = []
+        self._views: Dict[str, np.ndarray] = {}
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        """
+        Return one array, loading it first if it is a lazy handle.
+
+        Args:
+            key (str): Name of the array.
+
+        Returns:
+            np.ndarray: The array.
+        """
+        value = self.data[key]
+        return value.load() if isinstance(value, LazyArray) else value
+
+    def release(self, *keys: str) -> None:
+        """
+        Drop loaded lazy arrays from memory; they are read again on next access.
+
+        Args:
+            *keys (str): Arrays to release. Defaults to all lazy entries.
+        """
+        for key in keys or list(self.data):
+            value = self.data[key]
+            if isinstance(value, LazyArray):
+                value.release()
+
     def as_dict(self) -> Dict[str, np.ndarray]:
         """
         Return a dictionary of all stored arrays.
 
+        Lazy entries are loaded.
+
         Returns:
             Dict[str, np.ndarray]: A dictionary of data arrays by name.
         """
-        return self.data
+        if not any(isinstance(v, LazyArray) for v in self.data.values()):
+            return self.data
+        return {k: self[k] for k in self.data}
 
     @classmethod
     def from_dict(cls, data: Dict[str, np.ndarray]) -> "PipelineData":
@@ -68,31 +107,109 @@ class PipelineData:
         depth = data_copy.pop("depth", None)
         return cls(rgb=rgb, depth=depth, **data_copy)
 
+    @classmethod
+    def from_npz(cls, path: str, keys: Optional[List[str]] = None, mmap: bool = True) -> "PipelineData":
+        """
+        Create a lazy PipelineData from an .npz archive.
+
+        Only the headers of the selected members are read; each array is loaded on first
+        access. Members saved without compression are memory-mapped.
+
+        Args:
+            path (str): Path to the .npz file.
+            keys (Optional[List[str]]): Arrays to use. Defaults to all arrays in the archive.
+            mmap (bool): Memory-map uncompressed members.
+
+        Returns:
+            PipelineData: A new PipelineData instance backed by the archive.
+        """
+        return cls.from_dict(open_npz(path, keys=keys, mmap=mmap))
+
+    @classmethod
+    def from_npy_dir(cls, path: str, keys: Optional[List[str]] = None, mmap: bool = True) -> "PipelineData":
+        """
+        Create a lazy PipelineData from a directory of .npy files (one <key>.npy per array).
+
+        Args:
+            path (str): Directory holding the .npy files.
+            keys (Optional[List[str]]): Arrays to use. Defaults to every .npy file.
+            mmap (bool): Memory-map the files on load.
+
+        Returns:
+            PipelineData: A new PipelineData instance backed by the files.
+        """
+        return cls.from_dict(open_npy_dir(path, keys=keys, mmap=mmap))
+
+    def pack(self) -> "PipelineData":
+        """
+        Move all entries into one contiguous (H, W, total_channels) buffer.
+
+        Afterwards every entry of self.data is a view into that buffer, so stack_all()
+        returns the buffer itself without copying, e.g. when the same data is projected
+        repeatedly. Replacing an entry (or preprocess()) simply makes the next stack_all()
+        stack again. Writes to the views and to the buffer are shared.
+
+        Returns:
+            PipelineData: self, for chaining.
+        """
+        buffer, keys_order = self.stack_all()
+        views = self.unstack_all(buffer, keys_order)
+        self.data = dict(views)
+        self._buffer = buffer
+        self._buffer_keys = keys_order
+        self._views = views
+        return self
+
+    @property
+    def packed(self) -> bool:
+        """True if the entries are still the views created by pack()."""
+        if self._buffer is None or self.data.keys() != self._views.keys():
+            return False
+        return all(self.data[k] is v for k, v in self._views.items())
+
     def stack_all(self) -> Tuple[np.ndarray, List[str]]:
         """
         Stacks all channels into a single multi-channel array along the last dimension.
         Returns (H, W, total_channels).
 
+        Packed data (see pack()) returns its buffer directly. Otherwise the output is
+        allocated once from the entry shapes and every entry is copied into its channel
+        slice. Lazy entries that were not loaded before are released right after being
+        copied, so at most one of them is held in memory at a time.
+
         Returns:
             (np.ndarray, List[str]): A tuple of (stacked_array, keys_order).
         """
+        if self.packed:
+            return self._buffer, list(self._buffer_keys)
+        self._buffer = None
+
         sorted_keys = sorted(self.data.keys())
-        stacked_list = []
+        channels = [1 if self.data[k].ndim == 2 else self.data[k].shape[-1] for k in sorted_keys]
+        dtype = np.result_type(*[self.data[k].dtype for k in sorted_keys])
+        stacked = np.empty((self.H, self.W, sum(channels)), dtype=dtype)
 
-        for k in sorted_keys:
-            arr = self.data[k]
+        start_c = 0
+        for k, num_c in zip(sorted_keys, channels):
+            value = self.data[k]
+            was_loaded = not isinstance(value, LazyArray) or value.loaded
+            arr = self[k]
             if arr.ndim == 2:
                 # e.g. (H, W) -> expand to (H, W, 1)
                 arr = arr[..., np.newaxis]
-            stacked_list.append(arr)
+            stacked[..., start_c:start_c + num_c] = arr
+            start_c += num_c
+            if not was_loaded:
+                value.release()
 
-        stacked = np.concatenate(stacked_list, axis=-1)
         return stacked, sorted_keys
 
     def unstack_all(self, stacked_array: np.ndarray, keys_order: List[str]) -> Dict[str, np.ndarray]:
         """
         Unstacks a single multi-channel array back into separate entries.
 
+        The entries are views into stacked_array; nothing is copied.
+
         Args:
             stacked_array (np.ndarray): (H, W, total_channels)
             keys_order (List[str]): The list of keys that was used in stack_all().
@@ -128,25 +245,16 @@ class PipelineData:
         Returns:
             PipelineData: A new instance with unstacked data.
         """
-        new_data = {}
-        start_c = 0
-        for k in keys_order:
-            orig = self.data[k]
-            if orig.ndim == 2:
-                num_c = 1
-            else:
-                num_c = orig.shape[-1]
-
-            end_c = start_c + num_c
-            chunk = stacked_array[..., start_c:end_c]
-            if orig.ndim == 2:
-                chunk = chunk[..., 0]
-            new_data[k] = chunk
-            start_c = end_c
-
+        new_data = self.unstack_all(stacked_array, keys_order)
         return PipelineData.from_dict(new_data)
 
-    def preprocess(self, shadow_angle: float = 0, delta_lat: float = 0, delta_lon: float = 0) -> None:
+    def preprocess(
+        self,
+        shadow_angle: float = 0,
+        delta_lat: float = 0,
+        delta_lon: float = 0,
+        executor: Optional[Executor] = None
+    ) -> None:
         """
         Optionally preprocess each stored array by extending and/or rotating the equirectangular image.
 
@@ -154,14 +262,18 @@ class PipelineData:
             shadow_angle (float): Additional field of view in degrees to extend. Default is 0.
             delta_lat (float): Latitude rotation in degrees. Default is 0.
             delta_lon (float): Longitude rotation in degrees. Default is 0.
+            executor (Optional[Executor]): Executor preprocessing the arrays in parallel, one task per key.
         """
-        new_data = {}
-        for k, v in self.data.items():
-            new_data[k] = PreprocessEquirectangularImage.preprocess(
-                v,
-                shadow_angle=shadow_angle,
-                delta_lat=delta_lat,
-                delta_lon=delta_lon
-            )
+        from .tasks import preprocess_array
+
+        keys = list(self.data)
+        args = (shadow_angle, delta_lat, delta_lon)
+        if executor is None:
+            arrays = [preprocess_array(self[k], *args) for k in keys]
+        else:
+            arrays = [f.result() for f in [executor.submit(preprocess_array, self[k], *args) for k in keys]]
+        new_data = dict(zip(keys, arrays))
         self._cached_data = self.data.copy()
-        self.data = new_data
\ No newline at end of file
+        self.data = new_data
+        # shadow_angle adds rows
+        self.H, self.W = next(iter(new_data.values())).shape[:2]
\ No newline at end of file
@@ -0,0 +1,242 @@
+import logging
+import math
+from typing import Sequence, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger('pipeline.regions')
+
+# Cell size of the face-footprint index, in degrees
+DEFAULT_INDEX_RESOLUTION = 1.0
+
+
+def index_shape(resolution_deg: float = DEFAULT_INDEX_RESOLUTION) -> Tuple[int, int]:
+    """
+    Shape of the equirectangular grid of a footprint index.
+
+    Image coordinates follow the projections submodule, where latitude 90 is row 0 and
+    latitude -90 is row H - 1, so a grid of 180 / resolution + 1 rows has one cell per
+    `resolution_deg` (and likewise for columns).
+
+    Args:
+        resolution_deg (float): Cell size in degrees.
+
+    Returns:
+        Tuple[int, int]: (rows, cols).
+    """
+    return int(round(180.0 / resolution_deg)) + 1, int(round(360.0 / resolution_deg)) + 1
+
+
+def _row(lat_deg: Union[float, np.ndarray], rows: int) -> Union[float, np.ndarray]:
+    return (90.0 - lat_deg) / 180.0 * (rows - 1)
+
+
+def _col(lon_deg: Union[float, np.ndarray], cols: int) -> Union[float, np.ndarray]:
+    return (lon_deg + 180.0) / 360.0 * (cols - 1)
+
+
+def _col_range(lon_min: float, lon_max: float, cols: int) -> np.ndarray:
+    """Columns of a longitude interval, wrapping around the seam when lon_min > lon_max."""
+    lon_min = (lon_min + 180.0) % 360.0 - 180.0
+    lon_max = (lon_max + 180.0) % 360.0 - 180.0 if lon_max != 180.0 else 180.0
+    c0, c1 = int(math.floor(_col(lon_min, cols))), int(math.floor(_col(lon_max, cols)))
+    if lon_min <= lon_max:
+        return np.arange(c0, min(c1, cols - 1) + 1)
+    return np.concatenate([np.arange(c0, cols), np.arange(0, c1 + 1)])
+
+
+class LatLonBox:
+    """
+    Region between two latitudes and two longitudes, in degrees.
+
+    lon_min > lon_max describes a box across the +-180 degree seam.
+    """
+
+    def __init__(self, lat_min: float, lat_max: float, lon_min: float, lon_max: float) -> None:
+        if lat_min > lat_max:
+            raise ValueError(f"lat_min ({lat_min}) must not exceed lat_max ({lat_max}).")
+        self.lat_min = max(float(lat_min), -90.0)
+        self.lat_max = min(float(lat_max), 90.0)
+        self.lon_min = float(lon_min)
+        self.lon_max = float(lon_max)
+
+    def __repr__(self) -> str:
+        return f"LatLonBox(lat=[{self.lat_min}, {self.lat_max}], lon=[{self.lon_min}, {self.lon_max}])"
+
+    def cells(self, shape: Tuple[int, int]) -> np.ndarray:
+        """
+        Flat indices of the index cells the region touches.
+
+        Args:
+            shape (Tuple[int, int]): (rows, cols) of the index grid.
+
+        Returns:
+            np.ndarray: int64 cell indices.
+        """
+        rows, cols = shape
+        r0 = int(math.floor(_row(self.lat_max, rows)))
+        r1 = min(int(math.floor(_row(self.lat_min, rows))), rows - 1)
+        if self.lon_max - self.lon_min >= 360.0:
+            columns = np.arange(cols)
+        else:
+            columns = _col_range(self.lon_min, self.lon_max, cols)
+        return (np.arange(r0, r1 + 1)[:, None] * cols + columns[None]).ravel()
+
+
+class Cone:
+    """
+    Spherical cap: the directions within `radius_deg` of a centre, e.g. around a detection.
+    """
+
+    def __init__(self, lat_deg: float, lon_deg: float, radius_deg: float) -> None:
+        if radius_deg < 0:
+            raise ValueError(f"radius_deg must be non-negative, got {radius_deg}.")
+        self.lat_deg = float(lat_deg)
+        self.lon_deg = float(lon_deg)
+        self.radius_deg = float(radius_deg)
+
+    def __repr__(self) -> str:
+        return f"Cone(lat_deg={self.lat_deg}, lon_deg={self.lon_deg}, radius_deg={self.radius_deg})"
+
+    def cells(self, shape: Tuple[int, int]) -> np.ndarray:
+        """
+        Flat indices of the index cells the region touches.
+
+        Cells of the cap's bounding box are kept when their centre is within the radius
+        plus half a cell diagonal, which never drops a cell the cap overlaps.
+
+        Args:
+            shape (Tuple[int, int]): (rows, cols) of the index grid.
+
+        Returns:
+            np.ndarray: int64 cell indices.
+        """
+        rows, cols = shape
+        radius = min(self.radius_deg, 180.0)
+        lat_min, lat_max = self.lat_deg - radius, self.lat_deg + radius
+        if lat_min <= -90.0 or lat_max >= 90.0:
+            box = LatLonBox(max(lat_min, -90.0), min(lat_max, 90.0), -180.0, 180.0)
+        else:
+            # Widest longitude extent of the cap, reached off its centre latitude
+            half_width = math.degrees(math.asin(min(1.0, math.sin(math.radians(radius))
+                                                    / math.cos(math.radians(self.lat_deg)))))
+            box = LatLonBox(lat_min, lat_max, self.lon_deg - half_width, self.lon_deg + half_width)
+            if half_width >= 90.0:
+                box.lon_min, box.lon_max = -180.0, 180.0
+        candidates = box.cells(shape)
+
+        r, c = np.divmod(candidates, cols)
+        cell_lat = np.radians(90.0 - (r + 0.5) * 180.0 / (rows - 1))
+        cell_lon = np.radians(-180.0 + (c + 0.5) * 360.0 / (cols - 1))
+        lat0, lon0 = math.radians(self.lat_deg), math.radians(self.lon_deg)
+        cos_d = np.sin(lat0) * np.sin(cell_lat) + np.cos(lat0) * np.cos(cell_lat) * np.cos(cell_lon - lon0)
+        distance = np.degrees(np.arccos(np.clip(cos_d, -1.0, 1.0)))
+        half_diagonal = math.hypot(180.0 / (rows - 1), 360.0 / (cols - 1)) / 2
+        return candidates[distance <= radius + half_diagonal]
+
+
+class MaskRegion:
+    """
+    Region given as a boolean mask on an equirectangular grid of any resolution.
+    """
+
+    def __init__(self, mask: np.ndarray) -> None:
+        self.mask = np.asarray(mask, dtype=bool)
+        if self.mask.ndim != 2:
+            raise ValueError(f"A region mask must be 2-D (H, W), got shape {self.mask.shape}.")
+
+    def __repr__(self) -> str:
+        return f"MaskRegion(shape={self.mask.shape}, pixels={int(self.mask.sum())})"
+
+    def cells(self, shape: Tuple[int, int]) -> np.ndarray:
+        """
+        Flat indices of the index cells holding a pixel of the mask.
+
+        Args:
+            shape (Tuple[int, int]): (rows, cols) of the index grid.
+
+        Returns:
+            np.ndarray: int64 cell indices.
+        """
+        rows, cols = shape
+        h, w = self.mask.shape
+        i, j = np.nonzero(self.mask)
+        r = np.minimum(i * (rows - 1) // max(h - 1, 1), rows - 1)
+        c = np.minimum(j * (cols - 1) // max(w - 1, 1), cols - 1)
+        return np.unique(r.astype(np.int64) * cols + c)
+
+
+Region = Union[LatLonBox, Cone, MaskRegion]
+
+
+def as_region(region: Union[Region, np.ndarray]) -> Region:
+    """
+    Region from a LatLonBox, Cone, MaskRegion or boolean equirectangular mask.
+
+    Args:
+        region (Union[Region, np.ndarray]): The region.
+
+    Returns:
+        Region: The region.
+    """
+    if isinstance(region, np.ndarray):
+        return MaskRegion(region)
+    if not hasattr(region, "cells"):
+        raise TypeError(f"Expected a LatLonBox, Cone, MaskRegion or boolean mask, got {type(region).__name__}.")
+    return region
+
+
+class FootprintIndex:
+    """
+    Inverted index from coarse equirectangular cells to the faces whose footprint covers them.
+
+    Footprints come from footprint_runs on a low-resolution grid, dilated by one cell, so
+    the index may report a face that barely misses a region but never misses one that
+    overlaps it. A query touches only the region's cells and the faces listed there, so
+    its cost follows the size of the region rather than the number of faces.
+    """
+
+    def __init__(self, shape: Tuple[int, int], face_indices: Sequence[int], runs: Sequence[np.ndarray]) -> None:
+        """
+        Build the index.
+
+        Args:
+            shape (Tuple[int, int]): (rows, cols) of the index grid.
+            face_indices (Sequence[int]): Tangent point index of every face.
+            runs (Sequence[np.ndarray]): footprint_runs of every face on the index grid (block 1).
+        """
+        self.shape = tuple(shape)
+        self.face_indices = np.asarray(face_indices, dtype=np.int64)
+        cols = self.shape[1]
+        cells, owners = [], []
+        for k, face_runs in enumerate(runs):
+            lengths = face_runs[:, 2] - face_runs[:, 1] + 1
+            starts = face_runs[:, 0].astype(np.int64) * cols + face_runs[:, 1]
+            face_cells = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+            cells.append(face_cells)
+            owners.append(np.full(face_cells.size, k, dtype=np.int32))
+        cells = np.concatenate(cells) if cells else np.zeros(0, dtype=np.int64)
+        owners = np.concatenate(owners) if owners else np.zeros(0, dtype=np.int32)
+        order = np.argsort(cells, kind="stable")
+        self._faces = owners[order]
+        self._offsets = np.zeros(self.shape[0] * cols + 1, dtype=np.int64)
+        np.cumsum(np.bincount(cells, minlength=self.shape[0] * cols), out=self._offsets[1:])
+
+    def __repr__(self) -> str:
+        return f"FootprintIndex(shape={self.shape}, faces={len(self.face_indices)}, entries={self._faces.size})"
+
+    def query(self, region: Union[Region, np.ndarray]) -> np.ndarray:
+        """
+        Tangent point indices of the faces that may intersect a region.
+
+        Args:
+            region (Union[Region, np.ndarray]): LatLonBox, Cone, MaskRegion or boolean equirectangular mask.
+
+        Returns:
+            np.ndarray: Sorted int64 tangent point indices.
+        """
+        cells = as_region(region).cells(self.shape)
+        starts, stops = self._offsets[cells], self._offsets[cells + 1]
+        lengths = stops - starts
+        entries = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        return self.face_indices[np.unique(self._faces[entries])]
@@ -0,0 +1,162 @@
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from .disk_cache import GeometryDiskCache
+
+logger = logging.getLogger('pipeline.result_cache')
+
+DEFAULT_RESULT_CACHE_BYTES = 1024 ** 3
+
+
+def _get_hasher() -> Tuple[str, Callable[[], Any]]:
+    """
+    Pick the fastest available hash: xxh3-128 when xxhash is installed, blake2b otherwise.
+
+    Returns:
+        Tuple[str, Callable]: (hash name, factory of incremental hash objects).
+    """
+    try:
+        import xxhash
+
+        return "xxh3_128", xxhash.xxh3_128
+    except ImportError:
+        return "blake2b", lambda: hashlib.blake2b(digest_size=20)
+
+
+_HASH_NAME, _new_hash = _get_hasher()
+
+
+def content_hash(*arrays: np.ndarray) -> str:
+    """
+    Hash of the contents, shapes and dtypes of arrays.
+
+    Args:
+        *arrays (np.ndarray): Arrays to hash, in order.
+
+    Returns:
+        str: Hex digest, prefixed with the hash name.
+    """
+    h = _new_hash()
+    for arr in arrays:
+        arr = np.ascontiguousarray(arr)
+        h.update(f"{arr.dtype.str}{arr.shape}".encode("utf-8"))
+        h.update(memoryview(arr).cast("B"))
+    return f"{_HASH_NAME}:{h.hexdigest()}"
+
+
+class ResultCache:
+    """
+    LRU cache of projection results, optionally backed by a disk tier.
+
+    Entries are dicts of arrays keyed by a string built from the content hash of the
+    input and the full projection configuration (see ProjectionPipeline). The memory
+    tier evicts least recently used entries past `max_bytes`; the disk tier is a
+    GeometryDiskCache, shared between processes and evicted by its own budget.
+    The cache keeps read-only copies of the arrays it is given, so a miss leaves the
+    caller's result writable; every hit returns the same read-only arrays.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_RESULT_CACHE_BYTES, disk: Optional[GeometryDiskCache] = None) -> None:
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_bytes (int): Size budget of the memory tier in bytes. 0 keeps results on disk only.
+            disk (Optional[GeometryDiskCache]): Persistent tier shared across processes.
+        """
+        self.max_bytes = max_bytes
+        self.disk = disk
+        self._entries: "OrderedDict[str, Tuple[Dict[str, np.ndarray], int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def __repr__(self) -> str:
+        return f"ResultCache(max_bytes={self.max_bytes}, disk={self.disk!r})"
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Drop every result held in memory. The disk tier is left untouched."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remember(self, key: str, arrays: Dict[str, np.ndarray]) -> None:
+        nbytes = sum(arr.nbytes for arr in arrays.values())
+        if nbytes > self.max_bytes or key in self._entries:
+            return
+        self._entries[key] = (arrays, nbytes)
+        self._bytes += nbytes
+        while self._bytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._bytes -= evicted
+
+    def get(self, key: str) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Look up a result.
+
+        Args:
+            key (str): Result key.
+
+        Returns:
+            Optional[Dict[str, np.ndarray]]: The cached arrays, or None.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry[0]
+
+        arrays = self.disk.load_all(key) if self.disk is not None else None
+        with self._lock:
+            if arrays is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, arrays)
+        return arrays
+
+    def put(self, key: str, arrays: Dict[str, np.ndarray]) -> None:
+        """
+        Store a result.
+
+        The memory tier keeps read-only copies, so `arrays` stay writable and later
+        edits to them never reach the cache.
+
+        Args:
+            key (str): Result key.
+            arrays (Dict[str, np.ndarray]): Result arrays by name.
+        """
+        if sum(arr.nbytes for arr in arrays.values()) <= self.max_bytes:
+            frozen = {name: arr.copy() for name, arr in arrays.items()}
+            for arr in frozen.values():
+                arr.setflags(write=False)
+            with self._lock:
+                self._remember(key, frozen)
+        if self.disk is not None:
+            self.disk.store(key, arrays)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Cache counters.
+
+        Returns:
+            Dict[str, int]: Number of entries, bytes in memory, memory hits, disk hits and misses.
+        """
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,182 @@
+import os
+import struct
+import zipfile
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+def _read_npy_header(fp: Any) -> Tuple[Tuple[int, ...], bool, np.dtype]:
+    """
+    Read the header of a .npy stream, leaving the stream at the start of the data.
+
+    Returns:
+        Tuple[Tuple[int, ...], bool, np.dtype]: (shape, fortran_order, dtype).
+    """
+    version = np.lib.format.read_magic(fp)
+    if version == (1, 0):
+        return np.lib.format.read_array_header_1_0(fp)
+    return np.lib.format.read_array_header_2_0(fp)
+
+
+class LazyArray:
+    """
+    Handle to an array stored on disk, loaded on first access.
+
+    Shape and dtype come from the .npy header, so they are available without reading
+    (or decompressing) the data. Once loaded, the array is kept until release().
+    """
+
+    def __init__(self, shape: Tuple[int, ...], dtype: np.dtype) -> None:
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self._array: Optional[np.ndarray] = None
+
+    @property
+    def ndim(self) -> int:
+        return len(self.shape)
+
+    @property
+    def nbytes(self) -> int:
+        return int(np.prod(self.shape, dtype=np.int64)) * self.dtype.itemsize
+
+    @property
+    def loaded(self) -> bool:
+        return self._array is not None
+
+    def _read(self) -> np.ndarray:
+        raise NotImplementedError
+
+    def load(self) -> np.ndarray:
+        """
+        Read the array, or return the already loaded one.
+
+        Returns:
+            np.ndarray: The array.
+        """
+        if self._array is None:
+            self._array = self._read()
+        return self._array
+
+    def release(self) -> None:
+        """Drop the loaded array; the next load() reads it again."""
+        self._array = None
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(shape={self.shape}, dtype={self.dtype}, loaded={self.loaded})"
+
+
+class NpyArray(LazyArray):
+    """
+    A .npy file, memory-mapped on load.
+    """
+
+    def __init__(self, path: str, mmap: bool = True) -> None:
+        """
+        Read the header of a .npy file.
+
+        Args:
+            path (str): Path to the .npy file.
+            mmap (bool): Memory-map the data instead of reading it into memory.
+        """
+        self.path = path
+        self.mmap = mmap
+        with open(path, "rb") as f:
+            shape, _, dtype = _read_npy_header(f)
+        super().__init__(shape, dtype)
+
+    def _read(self) -> np.ndarray:
+        return np.load(self.path, mmap_mode="r" if self.mmap else None)
+
+
+class NpzMember(LazyArray):
+    """
+    One member of an .npz archive.
+
+    Members stored without compression (np.savez) are memory-mapped in place; compressed
+    members (np.savez_compressed) are decompressed on load.
+    """
+
+    def __init__(self, path: str, key: str, mmap: bool = True) -> None:
+        """
+        Read the header of an archive member.
+
+        Args:
+            path (str): Path to the .npz file.
+            key (str): Name of the array in the archive.
+            mmap (bool): Memory-map uncompressed members.
+        """
+        self.path = path
+        self.key = key
+        self.mmap = mmap
+        with zipfile.ZipFile(path) as archive:
+            info = archive.getinfo(f"{key}.npy")
+            with archive.open(info) as f:
+                shape, self._fortran_order, dtype = _read_npy_header(f)
+                header_size = f.tell()
+        super().__init__(shape, dtype)
+        self._offset = None
+        if mmap and info.compress_type == zipfile.ZIP_STORED and not self.dtype.hasobject:
+            self._offset = self._data_offset(info) + header_size
+
+    def _data_offset(self, info: zipfile.ZipInfo) -> int:
+        # The local file header is 30 bytes followed by the file name and an extra field
+        with open(self.path, "rb") as f:
+            f.seek(info.header_offset)
+            local_header = f.read(30)
+        name_len, extra_len = struct.unpack("<HH", local_header[26:30])
+        return info.header_offset + 30 + name_len + extra_len
+
+    def _read(self) -> np.ndarray:
+        if self._offset is not None:
+            return np.memmap(self.path, dtype=self.dtype, mode="r", offset=self._offset, shape=self.shape,
+                             order="F" if self._fortran_order else "C")
+        with np.load(self.path) as archive:
+            return archive[self.key]
+
+
+def npz_keys(path: str) -> List[str]:
+    """
+    Names of the arrays in an .npz archive, without reading any of them.
+
+    Args:
+        path (str): Path to the .npz file.
+
+    Returns:
+        List[str]: Array names.
+    """
+    with zipfile.ZipFile(path) as archive:
+        return [name[:-4] for name in archive.namelist() if name.endswith(".npy")]
+
+
+def open_npz(path: str, keys: Optional[List[str]] = None, mmap: bool = True) -> Dict[str, NpzMember]:
+    """
+    Lazy handles to the arrays of an .npz archive.
+
+    Args:
+        path (str): Path to the .npz file.
+        keys (Optional[List[str]]): Arrays to open. Defaults to all of them.
+        mmap (bool): Memory-map uncompressed members.
+
+    Returns:
+        Dict[str, NpzMember]: Handles by array name.
+    """
+    keys = npz_keys(path) if keys is None else keys
+    return {key: NpzMember(path, key, mmap=mmap) for key in keys}
+
+
+def open_npy_dir(path: str, keys: Optional[List[str]] = None, mmap: bool = True) -> Dict[str, NpyArray]:
+    """
+    Lazy handles to the .npy files of a directory, e.g. written with `--output_format npy`.
+
+    Args:
+        path (str): Directory holding one <key>.npy file per array.
+        keys (Optional[List[str]]): Arrays to open. Defaults to every .npy file.
+        mmap (bool): Memory-map the files on load.
+
+    Returns:
+        Dict[str, NpyArray]: Handles by array name.
+    """
+    if keys is None:
+        keys = sorted(name[:-4] for name in os.listdir(path) if name.endswith(".npy"))
+    return {key: NpyArray(os.path.join(path, f"{key}.npy"), mmap=mmap) for key in keys}
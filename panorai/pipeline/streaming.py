@@ -0,0 +1,184 @@
+import logging
+import queue
+import threading
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple
+
+logger = logging.getLogger('pipeline.streaming')
+
+_END = object()
+
+
+class _Failure:
+    """Wraps an exception raised in a background stage so it can be re-raised by the consumer."""
+
+    def __init__(self, exc: BaseException) -> None:
+        self.exc = exc
+
+
+def _put(q: "queue.Queue[Any]", item: Any, stop: threading.Event) -> bool:
+    """Put into a bounded queue, giving up if the stream is being torn down."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+class Prefetcher:
+    """
+    Iterates (and optionally decodes) frames in a background thread, a bounded number ahead.
+    """
+
+    def __init__(
+        self,
+        frames: Iterable[Any],
+        loader: Optional[Callable[[Any], Any]] = None,
+        maxsize: int = 2
+    ) -> None:
+        """
+        Start prefetching.
+
+        Args:
+            frames (Iterable[Any]): Source of frames, e.g. arrays, PipelineData or file paths.
+            loader (Optional[Callable[[Any], Any]]): Decoder applied to every item of `frames`.
+            maxsize (int): Number of decoded frames allowed to wait for the consumer.
+        """
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, maxsize))
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(frames, loader), daemon=True,
+                                        name="panorai-prefetch")
+        self._thread.start()
+
+    def _run(self, frames: Iterable[Any], loader: Optional[Callable[[Any], Any]]) -> None:
+        try:
+            for frame in frames:
+                if loader is not None:
+                    frame = loader(frame)
+                if not _put(self._queue, frame, self._stop):
+                    return
+        except BaseException as exc:  # Surface decoder errors in the consumer thread
+            _put(self._queue, _Failure(exc), self._stop)
+            return
+        _put(self._queue, _END, self._stop)
+
+    def __iter__(self) -> Iterator[Any]:
+        while True:
+            item = self._queue.get()
+            if item is _END:
+                return
+            if isinstance(item, _Failure):
+                raise item.exc
+            yield item
+
+    def close(self) -> None:
+        """Stop the background thread."""
+        self._stop.set()
+        self._thread.join()
+
+
+class WriteBehind:
+    """
+    Hands results to a writer callable from a background thread through a bounded queue.
+    """
+
+    def __init__(self, writer: Callable[[int, Any], None], maxsize: int = 2) -> None:
+        """
+        Start the writer thread.
+
+        Args:
+            writer (Callable[[int, Any], None]): Called as writer(frame_index, result).
+            maxsize (int): Number of results allowed to wait for the writer.
+        """
+        self._writer = writer
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, maxsize))
+        self._stop = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, daemon=True, name="panorai-write-behind")
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _END:
+                return
+            if self._error is not None:
+                continue  # Drain without writing after a failure
+            index, result = item
+            try:
+                self._writer(index, result)
+            except BaseException as exc:
+                self._error = exc
+
+    def submit(self, index: int, result: Any) -> None:
+        """
+        Queue a result, blocking while the writer is `maxsize` results behind.
+
+        Raises:
+            BaseException: The first error raised by the writer, if any.
+        """
+        self._raise_if_failed()
+        _put(self._queue, (index, result), self._stop)
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def close(self) -> None:
+        """
+        Flush pending results and stop the writer thread.
+
+        Raises:
+            BaseException: The first error raised by the writer, if any.
+        """
+        _put(self._queue, _END, self._stop)
+        self._thread.join()
+        self._raise_if_failed()
+
+
+def stream(
+    process: Callable[[Any], Any],
+    frames: Iterable[Any],
+    loader: Optional[Callable[[Any], Any]] = None,
+    writer: Optional[Callable[[int, Any], None]] = None,
+    prefetch: int = 2,
+    write_queue: int = 2
+) -> Iterator[Tuple[int, Any]]:
+    """
+    Run `process` over a sequence of frames as a three-stage pipeline.
+
+    Decoding (iteration of `frames` and `loader`) runs in a prefetch thread and writing
+    runs in a write-behind thread, both connected through bounded queues, so throughput
+    is bounded by the slowest stage rather than by the sum of all stages.
+
+    Args:
+        process (Callable[[Any], Any]): Processing applied to every decoded frame.
+        frames (Iterable[Any]): Source of frames.
+        loader (Optional[Callable[[Any], Any]]): Decoder applied to every item of `frames`.
+        writer (Optional[Callable[[int, Any], None]]): Called as writer(frame_index, result) in the background.
+        prefetch (int): Number of decoded frames buffered ahead of processing.
+        write_queue (int): Number of results buffered ahead of the writer.
+
+    Yields:
+        Tuple[int, Any]: (frame_index, result) in input order.
+    """
+    prefetcher = Prefetcher(frames, loader=loader, maxsize=prefetch)
+    write_behind = WriteBehind(writer, maxsize=write_queue) if writer is not None else None
+    completed = False
+    try:
+        for index, frame in enumerate(prefetcher):
+            result = process(frame)
+            if write_behind is not None:
+                write_behind.submit(index, result)
+            yield index, result
+        completed = True
+    finally:
+        prefetcher.close()
+        if write_behind is not None:
+            try:
+                write_behind.close()
+            except BaseException:
+                # Don't mask the error that interrupted the stream
+                if completed:
+                    raise
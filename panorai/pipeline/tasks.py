@@ -0,0 +1,152 @@
+"""
+Face-level tasks of the pipeline, as pure functions of (geometry key, face data).
+
+They can run on any concurrent.futures.Executor (see PipelineConfig.executor): thread
+and process pools, or cluster executors on other machines. A geometry key is the
+projection name and its full configuration, so workers rebuild the grids themselves
+instead of receiving them. Each worker process keeps them in a GeometryCache, backed by
+the on-disk cache in PANORAI_CACHE_DIR when that is set, so they are computed once per
+worker (or once per machine with a shared disk cache).
+"""
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from .disk_cache import GeometryDiskCache
+from .geometry import GeometryCache, remap
+
+logger = logging.getLogger('pipeline.tasks')
+
+# Rows kept above and below a face's footprint, covering the support of every interpolation kernel
+ROW_MARGIN = 4
+
+GeometryKey = Dict[str, Any]
+
+# Per-process state of the workers; the lock serializes the projector updates and grid lookups
+_worker_lock = threading.Lock()
+_worker_geometry: Optional[GeometryCache] = None
+_worker_projectors: Dict[str, Any] = {}
+
+
+def geometry_key(projection_name: str, projector: Any) -> GeometryKey:
+    """
+    Geometry key of the projector's current face.
+
+    Args:
+        projection_name (str): Registered projection name.
+        projector (Any): A configured ProjectionProcessor.
+
+    Returns:
+        GeometryKey: Picklable description from which workers rebuild the face's grids.
+    """
+    return {"projection": projection_name, "config": projector.config.config_object.config.model_dump()}
+
+
+def _configured_projector(key: GeometryKey) -> Tuple[GeometryCache, Any]:
+    """
+    The worker's geometry cache and a projector configured for a geometry key. Hold _worker_lock.
+    """
+    global _worker_geometry
+    if _worker_geometry is None:
+        cache_dir = os.environ.get("PANORAI_CACHE_DIR")
+        _worker_geometry = GeometryCache(disk=GeometryDiskCache(cache_dir) if cache_dir else None)
+    projector = _worker_projectors.get(key["projection"])
+    if projector is None:
+        from ..submodules.projections import ProjectionRegistry
+
+        projector = ProjectionRegistry.get_projection(key["projection"], return_processor=True)
+        _worker_projectors[key["projection"]] = projector
+    projector.config.update(**key["config"])
+    return _worker_geometry, projector
+
+
+def footprint_rows(map_y: np.ndarray, height: int) -> Tuple[int, int]:
+    """
+    Rows of the equirectangular input read by a forward grid.
+
+    Args:
+        map_y (np.ndarray): Forward y-grid, (h, w) or (taps, h, w).
+        height (int): Height of the input.
+
+    Returns:
+        Tuple[int, int]: (first row, stop row), with ROW_MARGIN rows on each side.
+    """
+    finite = map_y[np.isfinite(map_y)]
+    if finite.size == 0:
+        return 0, height
+    start = max(int(np.floor(finite.min())) - ROW_MARGIN, 0)
+    stop = min(int(np.floor(finite.max())) + ROW_MARGIN + 1, height)
+    return start, max(start, stop)
+
+
+def forward_face(
+    key: GeometryKey,
+    rows: np.ndarray,
+    img_shape: Tuple[int, ...],
+    row_offset: int,
+    resize_factor: float,
+    remap_kwargs: Dict[str, Any],
+    tile_rows: Optional[int] = None
+) -> np.ndarray:
+    """
+    Forward-project one face.
+
+    Args:
+        key (GeometryKey): Geometry key of the face.
+        rows (np.ndarray): The rows of the equirectangular input the face reads (see footprint_rows).
+        img_shape (Tuple[int, ...]): Shape of the whole input.
+        row_offset (int): Index of the first of those rows in the input.
+        resize_factor (float): Resize factor folded into the grid.
+        remap_kwargs (Dict[str, Any]): Interpolation settings of the projection.
+        tile_rows (Optional[int]): Row tile of the remap (see MemoryPlan).
+
+    Returns:
+        np.ndarray: The face.
+    """
+    with _worker_lock:
+        geometry, projector = _configured_projector(key)
+        map_x, map_y = geometry.forward(projector, img_shape, resize_factor)
+    if row_offset:
+        map_y = map_y - np.float32(row_offset)
+    return remap(rows, map_x, map_y, tile_rows=tile_rows, **remap_kwargs)
+
+
+def backward_face(key: GeometryKey, face: np.ndarray, remap_kwargs: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Back-project one face over the bounding box of its footprint.
+
+    Args:
+        key (GeometryKey): Geometry key of the face, configured for the equirectangular output shape.
+        face (np.ndarray): Face image (h, w, C).
+        remap_kwargs (Dict[str, Any]): Interpolation settings of the projection.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (box [row start, row stop, col start, col stop], back-projected crop).
+    """
+    with _worker_lock:
+        geometry, projector = _configured_projector(key)
+        box, map_x, map_y, mask = geometry.backward_crop(projector)
+    return box, remap(face, map_x, map_y, mask=mask, **remap_kwargs)
+
+
+def preprocess_array(array: np.ndarray, shadow_angle: float, delta_lat: float, delta_lon: float) -> np.ndarray:
+    """
+    Extend and rotate one equirectangular array (see PreprocessEquirectangularImage.preprocess).
+
+    Args:
+        array (np.ndarray): Equirectangular array.
+        shadow_angle (float): Additional field of view in degrees to extend.
+        delta_lat (float): Latitude rotation in degrees.
+        delta_lon (float): Longitude rotation in degrees.
+
+    Returns:
+        np.ndarray: The preprocessed array.
+    """
+    from .utils.preprocess_eq import PreprocessEquirectangularImage
+
+    return PreprocessEquirectangularImage.preprocess(
+        array, shadow_angle=shadow_angle, delta_lat=delta_lat, delta_lon=delta_lon
+    )
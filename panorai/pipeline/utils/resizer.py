@@ -1,16 +1,101 @@
-from skimage.transform import resize
 import logging
-import sys
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Tuple, Union
+
 import cv2
 import numpy as np
-from typing import Union
 
-# Logging setup
+# Handlers are left to the application (see panorai.setup_logging)
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
-stream_handler = logging.StreamHandler(sys.stdout)
-stream_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-logger.handlers = [stream_handler]
+
+# Channels per cv2.resize call; larger channel counts are resized in groups of this size
+_CV_MAX_CHANNELS = 128
+
+# Images with at least this many pixels are split into row tiles resized in parallel
+TILE_MIN_PIXELS = 2 ** 22
+
+
+def _to_cv2_dtype(img: np.ndarray) -> Tuple[np.ndarray, Callable[[np.ndarray], np.ndarray]]:
+    """
+    View or convert an image to a dtype cv2.resize accepts, plus the inverse conversion.
+    """
+    dtype = img.dtype
+    if dtype in (np.uint8, np.uint16, np.int16, np.float32, np.float64):
+        return img, lambda out: out
+    if dtype == np.bool_:
+        return img.astype(np.float32), lambda out: out >= 0.5
+    if np.issubdtype(dtype, np.integer):
+        return img.astype(np.float64), lambda out: np.rint(out).astype(dtype)
+    return img.astype(np.float32), lambda out: out.astype(dtype)
+
+
+def _cv2_resize(img: np.ndarray, size: Tuple[int, int], interpolation: int) -> np.ndarray:
+    """
+    cv2.resize for any channel count, keeping a trailing channel axis of size 1.
+    """
+    channels = img.shape[2] if img.ndim == 3 else None
+    if channels is not None and channels > _CV_MAX_CHANNELS:
+        return np.concatenate([
+            _cv2_resize(np.ascontiguousarray(img[..., c:c + _CV_MAX_CHANNELS]), size, interpolation)
+            for c in range(0, channels, _CV_MAX_CHANNELS)
+        ], axis=-1)
+    out = cv2.resize(img, size, interpolation=interpolation)
+    if channels is not None and out.ndim == 2:
+        out = out[..., np.newaxis]
+    return out
+
+
+def fast_resize(
+    img: np.ndarray,
+    new_shape: Tuple[int, int],
+    interpolation: int = cv2.INTER_LINEAR,
+    max_workers: Optional[int] = None
+) -> np.ndarray:
+    """
+    Resize an image with OpenCV, keeping its dtype.
+
+    Downsampling uses cv2.INTER_AREA (an exact box filter); upsampling uses `interpolation`.
+    Large downsampling jobs are split into row tiles resized on a thread pool. Tiles only
+    break at output rows whose source row is an integer, so every output pixel is computed
+    from the same input pixels as in a single call and the result is identical.
+
+    Args:
+        img (np.ndarray): Image (H, W) or (H, W, C), any number of channels.
+        new_shape (Tuple[int, int]): Output (height, width).
+        interpolation (int): OpenCV interpolation flag used for upsampling.
+        max_workers (Optional[int]): Number of threads for tiling. Defaults to the CPU count.
+
+    Returns:
+        np.ndarray: Resized image with the dtype of img.
+    """
+    h, w = img.shape[:2]
+    new_h, new_w = new_shape
+    work, restore = _to_cv2_dtype(img)
+
+    if new_h > h or new_w > w:
+        return restore(_cv2_resize(work, (new_w, new_h), interpolation))
+
+    # Output rows that start at an integer input row; tiles may only break there
+    step = new_h // math.gcd(h, new_h)
+    n_blocks = new_h // step
+    workers = min(max_workers or os.cpu_count() or 1, n_blocks)
+    if h * w < TILE_MIN_PIXELS or workers < 2:
+        return restore(_cv2_resize(work, (new_w, new_h), cv2.INTER_AREA))
+
+    out = np.empty((new_h, new_w) + work.shape[2:], dtype=work.dtype)
+    blocks_per_tile = math.ceil(n_blocks / workers)
+    rows = step * blocks_per_tile
+
+    def _tile(r0: int) -> None:
+        r1 = min(r0 + rows, new_h)
+        src = work[r0 * h // new_h:r1 * h // new_h]
+        out[r0:r1] = _cv2_resize(src, (new_w, r1 - r0), cv2.INTER_AREA)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(_tile, range(0, new_h, rows)))
+    return restore(out)
 
 
 class ImageResizer:
@@ -29,7 +114,9 @@ class ImageResizer:
 
         Args:
             resize_factor (float): Factor by which to resize the image. >1 for upsampling, <1 for downsampling.
-            method (str): Resizing method ('skimage' or 'cv2'). Default is 'skimage'.
+            method (str): Resizing method: 'skimage' (reference, float64 output), 'cv2', or 'fast'
+                          (dtype-preserving OpenCV area/linear resize, tiled over threads, see fast_resize).
+                          Default is 'skimage'.
             mode (str): Mode parameter for skimage resize. Default is "reflect".
             anti_aliasing (bool): Whether to apply anti-aliasing (only for skimage).
             interpolation (int): Interpolation method for cv2.resize. Default is cv2.INTER_LINEAR.
@@ -40,7 +127,7 @@ class ImageResizer:
         self.anti_aliasing = anti_aliasing
         self.interpolation = interpolation
 
-        logger.info(f"Initialized ImageResizer with resize_factor={resize_factor}, method={method}, "
+        logger.debug(f"Initialized ImageResizer with resize_factor={resize_factor}, method={method}, "
                     f"mode={mode}, anti_aliasing={anti_aliasing}, interpolation={interpolation}")
 
     def resize_image(self, img: np.ndarray, upsample: bool = True) -> np.ndarray:
@@ -63,10 +150,12 @@ class ImageResizer:
                 int(img.shape[0] * resize_factor),
                 int(img.shape[1] * resize_factor),
             )
-            logger.info(f"Resizing image with factor={resize_factor}.")
+            logger.debug(f"Resizing image with factor={resize_factor}.")
             logger.debug(f"Original shape: {img.shape}, New shape: {new_shape}.")
 
             if self.method == "skimage":
+                from skimage.transform import resize  # Imported on first use, it is slow to import
+
                 if len(img.shape) == 3:  # e.g. RGB image
                     resized_img = resize(
                         img, (*new_shape, img.shape[2]),
@@ -79,7 +168,7 @@ class ImageResizer:
                         mode=self.mode,
                         anti_aliasing=self.anti_aliasing
                     )
-                logger.info("Image resizing completed using skimage.")
+                logger.debug("Image resizing completed using skimage.")
                 return resized_img
             elif self.method == "cv2":
                 resized_img = cv2.resize(
@@ -87,8 +176,10 @@ class ImageResizer:
                     (new_shape[1], new_shape[0]),  # cv2 expects (width, height)
                     interpolation=self.interpolation
                 )
-                logger.info("Image resizing completed using cv2.")
+                logger.debug("Image resizing completed using cv2.")
                 return resized_img
+            elif self.method == "fast":
+                return fast_resize(img, new_shape, interpolation=self.interpolation)
             else:
                 raise ValueError(f"Unknown resizing method: {self.method}")
 
@@ -114,7 +205,7 @@ class ResizerConfig:
         Args:
             resizer_cls (type): The ImageResizer class or a subclass to instantiate.
             resize_factor (float): Factor by which to resize the image.
-            method (str): Resizing method ('skimage' or 'cv2').
+            method (str): Resizing method ('skimage', 'cv2' or 'fast').
             mode (str): Mode parameter for skimage resize.
             anti_aliasing (bool): Whether to apply anti-aliasing (only for skimage).
             interpolation (int): Interpolation method for cv2.resize.
@@ -0,0 +1,127 @@
+from typing import Tuple
+
+import numpy as np
+
+DEFAULT_VALIDITY_BLOCK = 8
+
+
+def derive_valid_mask(data: np.ndarray) -> np.ndarray:
+    """
+    Validity mask of an equirectangular image: pixels with any non-zero channel.
+
+    Zero rows added by PreprocessEquirectangularImage (shadow_angle) and zeroed-out
+    masked regions come out invalid.
+
+    Args:
+        data (np.ndarray): Image (H, W) or (H, W, C).
+
+    Returns:
+        np.ndarray: Boolean (H, W) mask.
+    """
+    return data != 0 if data.ndim == 2 else np.any(data != 0, axis=-1)
+
+
+def downsample_mask(mask: np.ndarray, block: int) -> np.ndarray:
+    """
+    Coarse mask with one cell per block x block pixels, True if any pixel of the block is.
+
+    Args:
+        mask (np.ndarray): Boolean (H, W) mask.
+        block (int): Block size in pixels.
+
+    Returns:
+        np.ndarray: Boolean (ceil(H / block), ceil(W / block)) mask.
+    """
+    h, w = mask.shape
+    hb, wb = -(-h // block), -(-w // block)
+    padded = np.zeros((hb * block, wb * block), dtype=bool)
+    padded[:h, :w] = mask
+    return padded.reshape(hb, block, wb, block).any(axis=(1, 3))
+
+
+def footprint_runs(map_x: np.ndarray, map_y: np.ndarray, img_shape: Tuple[int, ...], block: int) -> np.ndarray:
+    """
+    Blocks of the equirectangular image read by a forward grid, as row runs.
+
+    The coarse footprint is dilated by one block (longitude wraps around) so that the
+    interpolation kernel around every sample is covered.
+
+    Args:
+        map_x (np.ndarray): Forward x-grid, (h, w) or (taps, h, w).
+        map_y (np.ndarray): Forward y-grid, same shape as map_x.
+        img_shape (Tuple[int, ...]): Shape of the equirectangular image (H, W[, C]).
+        block (int): Block size in pixels.
+
+    Returns:
+        np.ndarray: int32 (n, 3) array of (block row, first block column, last block column).
+    """
+    h, w = img_shape[:2]
+    hb, wb = -(-h // block), -(-w // block)
+    # Non-finite samples (e.g. off the projection's domain) read nothing
+    finite = np.isfinite(map_x) & np.isfinite(map_y)
+    rows = np.clip(np.floor(map_y[finite]).astype(np.int64), 0, h - 1) // block
+    cols = (np.floor(map_x[finite]).astype(np.int64) % w) // block
+
+    coarse = np.zeros((hb, wb), dtype=bool)
+    coarse[rows, cols] = True
+    coarse |= np.roll(coarse, 1, axis=1) | np.roll(coarse, -1, axis=1)
+    coarse[1:] |= coarse[:-1].copy()
+    coarse[:-1] |= coarse[1:].copy()
+
+    # Start and end of every run of True cells in each row
+    edges = np.diff(np.pad(coarse.astype(np.int8), ((0, 0), (1, 1))), axis=1)
+    start_rows, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)
+    return np.stack([start_rows, starts, ends - 1], axis=1).astype(np.int32)
+
+
+class ValidityIndex:
+    """
+    Summed-area table of a downsampled validity mask.
+
+    Tells in O(number of runs) whether a face footprint (see footprint_runs) contains
+    any valid block, so faces that would only read empty pixels can be skipped.
+    """
+
+    def __init__(self, mask: np.ndarray, block: int = DEFAULT_VALIDITY_BLOCK) -> None:
+        """
+        Build the index.
+
+        Args:
+            mask (np.ndarray): Boolean (H, W) validity mask at the resolution of the input.
+            block (int): Block size in pixels of the downsampled mask.
+        """
+        self.block = block
+        self.shape = mask.shape[:2]
+        self.coarse = downsample_mask(np.asarray(mask, dtype=bool), block)
+        self.table = np.zeros((self.coarse.shape[0] + 1, self.coarse.shape[1] + 1), dtype=np.int32)
+        self.table[1:, 1:] = self.coarse.cumsum(axis=0).cumsum(axis=1)
+
+    def __repr__(self) -> str:
+        return f"ValidityIndex(shape={self.shape}, block={self.block}, valid_blocks={int(self.table[-1, -1])})"
+
+    def count(self, runs: np.ndarray) -> int:
+        """
+        Number of valid blocks covered by row runs.
+
+        Args:
+            runs (np.ndarray): (n, 3) runs from footprint_runs().
+
+        Returns:
+            int: Valid block count.
+        """
+        r, c0, c1 = runs[:, 0], runs[:, 1], runs[:, 2] + 1
+        t = self.table
+        return int((t[r + 1, c1] - t[r, c1] - t[r + 1, c0] + t[r, c0]).sum())
+
+    def any_valid(self, runs: np.ndarray) -> bool:
+        """
+        Whether a footprint contains any valid block.
+
+        Args:
+            runs (np.ndarray): (n, 3) runs from footprint_runs().
+
+        Returns:
+            bool: False if every block of the footprint is invalid.
+        """
+        return self.count(runs) > 0
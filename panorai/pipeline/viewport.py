@@ -0,0 +1,305 @@
+import logging
+import math
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger('pipeline.viewport')
+
+# Orientation and field-of-view quantum of the cached view grids, in degrees
+DEFAULT_ORIENTATION_STEP = 0.1
+
+# Largest number of halvings of the panorama kept for rendering wide views
+DEFAULT_PYRAMID_LEVELS = 6
+
+
+def quantize(value: float, step: float) -> float:
+    """
+    Round an angle to a multiple of `step` (unchanged if step is 0).
+
+    Args:
+        value (float): Angle in degrees.
+        step (float): Quantum in degrees.
+
+    Returns:
+        float: The quantized angle.
+    """
+    if not step:
+        return float(value)
+    return round(round(value / step) * step, 9)
+
+
+def view_maps(
+    pitch_deg: float,
+    roll_deg: float,
+    fov_deg: float,
+    width: int,
+    height: int,
+    eq_shape: Tuple[int, ...]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Remap grid of a perspective view looking at longitude 0.
+
+    The view is a gnomonic face with square pixels: `fov_deg` spans its width and the
+    height follows from the aspect ratio. Its tangent-plane coordinates are rotated by
+    `roll_deg` (the camera turns counter-clockwise, so the scene turns clockwise in the
+    output) and cast as rays, so unlike the inverse gnomonic formulas used by the
+    projections there is no singular pixel at the tangent point. Image coordinates follow the transformers of the
+    projections submodule, so the grid matches a gnomonic ProjectionProcessor with
+    phi1_deg=pitch_deg, lam0_deg=0 and x_points=y_points.
+
+    Args:
+        pitch_deg (float): Latitude of the view centre in degrees.
+        roll_deg (float): Rotation of the view about its axis in degrees.
+        fov_deg (float): Horizontal field of view in degrees.
+        width (int): Width of the view in pixels.
+        height (int): Height of the view in pixels.
+        eq_shape (Tuple[int, ...]): Shape of the equirectangular panorama (H, W[, C]).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (map_x, map_y) as float32 arrays of shape (height, width).
+    """
+    h, w = eq_shape[:2]
+    half = math.tan(math.radians(fov_deg) / 2)
+    pitch = half * 2 / max(width - 1, 1)
+    x = np.linspace(-half, half, width)
+    y = (np.arange(height) - (height - 1) / 2) * pitch
+    x, y = np.meshgrid(x, y)
+    if roll_deg:
+        cos_r, sin_r = math.cos(math.radians(roll_deg)), math.sin(math.radians(roll_deg))
+        x, y = x * cos_r + y * sin_r, y * cos_r - x * sin_r
+
+    # Rays in (towards longitude 0, east, north) coordinates; image rows point south
+    phi = math.radians(pitch_deg)
+    ray_x = math.cos(phi) + y * math.sin(phi)
+    ray_z = math.sin(phi) - y * math.cos(phi)
+    lat = np.degrees(np.arctan2(ray_z, np.hypot(ray_x, x)))
+    lon = np.degrees(np.arctan2(x, ray_x))
+
+    map_x = (lon + 180.0) / 360.0 * (w - 1)
+    map_y = (90.0 - lat) / 180.0 * (h - 1)
+    return map_x.astype(np.float32), map_y.astype(np.float32)
+
+
+def shift_longitude(map_x: np.ndarray, yaw_deg: float, eq_width: int) -> np.ndarray:
+    """
+    Rotate a view grid about the polar axis.
+
+    Turning the view by `yaw_deg` adds the same longitude to every pixel, which is a
+    constant shift of map_x modulo the panorama's period, so one grid serves every yaw.
+
+    Args:
+        map_x (np.ndarray): x-grid of a view looking at longitude 0.
+        yaw_deg (float): Longitude of the view centre in degrees.
+        eq_width (int): Width of the equirectangular panorama.
+
+    Returns:
+        np.ndarray: The shifted float32 x-grid.
+    """
+    period = np.float32(eq_width - 1)
+    shifted = map_x + np.float32((yaw_deg % 360.0) / 360.0 * (eq_width - 1))
+    # Both terms are in [0, period], so one conditional subtraction wraps (cheaper than np.mod)
+    np.subtract(shifted, period, out=shifted, where=shifted >= period)
+    return shifted
+
+
+def pyramid_level(eq_width: int, fov_deg: float, width: int, n_levels: int) -> int:
+    """
+    Coarsest panorama level that still resolves a view.
+
+    The pixel pitch of a gnomonic view is largest at its centre, 2 tan(F / 2) / (width - 1)
+    radians; level k, whose width is halved k times, is used while its pitch is no larger.
+
+    Args:
+        eq_width (int): Width of the full-resolution panorama.
+        fov_deg (float): Horizontal field of view of the view in degrees.
+        width (int): Width of the view in pixels.
+        n_levels (int): Number of levels available (level 0 is the panorama itself).
+
+    Returns:
+        int: Level index.
+    """
+    view_ppd = max(width - 1, 1) / (2 * math.tan(math.radians(fov_deg) / 2)) * math.pi / 180
+    level = 0
+    while level + 1 < n_levels and (max(eq_width >> (level + 1), 2) - 1) / 360.0 >= view_ppd:
+        level += 1
+    return level
+
+
+class ViewGridCache:
+    """
+    LRU cache of view grids keyed by quantized orientation.
+
+    Pitch, roll and field of view are rounded to `step_deg` and, with the view size and
+    panorama shape, key a grid computed at yaw 0. Yaw is not part of the key: it is
+    applied exactly by shift_longitude, so panning around the horizon never computes a
+    grid. A view is therefore rendered at most step_deg / 2 away from the requested
+    pitch, roll and field of view.
+    """
+
+    def __init__(self, max_entries: int = 64, step_deg: float = DEFAULT_ORIENTATION_STEP) -> None:
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries (int): Maximum number of grids kept.
+            step_deg (float): Quantum of pitch, roll and field of view in degrees (0: exact).
+        """
+        self.max_entries = max_entries
+        self.step_deg = step_deg
+        self._entries: "OrderedDict[Hashable, Tuple[np.ndarray, np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"ViewGridCache(max_entries={self.max_entries}, step_deg={self.step_deg}, entries={len(self)})"
+
+    def get(
+        self,
+        pitch_deg: float,
+        roll_deg: float,
+        fov_deg: float,
+        width: int,
+        height: int,
+        eq_shape: Tuple[int, ...]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Grid of a view looking at longitude 0 (see view_maps), from the cache if possible.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Read-only (map_x, map_y).
+        """
+        key = (
+            quantize(pitch_deg, self.step_deg), quantize(roll_deg % 360.0, self.step_deg),
+            quantize(fov_deg, self.step_deg), int(width), int(height), tuple(eq_shape[:2])
+        )
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self.misses += 1
+
+        maps = view_maps(key[0], key[1], key[2], width, height, eq_shape)
+        for grid in maps:
+            grid.flags.writeable = False
+        with self._lock:
+            self._entries[key] = maps
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return maps
+
+    def clear(self) -> None:
+        """Drop every grid."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self), "hits": self.hits, "misses": self.misses}
+
+
+class ViewRenderer:
+    """
+    Renders perspective views of one panorama.
+
+    Keeps a pyramid of the panorama, halved with area averaging and built lazily, so a
+    wide or small view samples a level close to its own resolution instead of aliasing
+    the full-resolution image, and fetches grids from a shared ViewGridCache.
+
+    Created by ProjectionPipeline.viewer() and ProjectionPipeline.render_view().
+    """
+
+    def __init__(
+        self,
+        panorama: np.ndarray,
+        grids: Optional[ViewGridCache] = None,
+        remap_kwargs: Optional[Dict[str, Any]] = None,
+        max_levels: int = DEFAULT_PYRAMID_LEVELS
+    ) -> None:
+        """
+        Initialize the renderer.
+
+        Args:
+            panorama (np.ndarray): Equirectangular image (H, W[, C]).
+            grids (Optional[ViewGridCache]): Grid cache, possibly shared with other renderers.
+            remap_kwargs (Optional[Dict[str, Any]]): Interpolation settings (see geometry.remap).
+            max_levels (int): Largest number of halvings of the panorama (0 disables the pyramid).
+        """
+        self.grids = grids if grids is not None else ViewGridCache()
+        self.remap_kwargs = dict(remap_kwargs or {"interpolation": cv2.INTER_LINEAR})
+        self._levels: List[np.ndarray] = [panorama]
+        self._lock = threading.Lock()
+        h, w = panorama.shape[:2]
+        self.n_levels = 1 + min(max_levels, max(0, int(math.log2(max(min(h, w), 1))) - 1))
+
+    def __repr__(self) -> str:
+        return f"ViewRenderer(shape={self.panorama.shape}, levels={self.n_levels}, built={len(self._levels)})"
+
+    @property
+    def panorama(self) -> np.ndarray:
+        """The full-resolution panorama."""
+        return self._levels[0]
+
+    def level(self, k: int) -> np.ndarray:
+        """
+        Level k of the pyramid, the panorama halved k times.
+
+        Args:
+            k (int): Level index, below n_levels.
+
+        Returns:
+            np.ndarray: The level, with the panorama's dtype and channels.
+        """
+        with self._lock:
+            while len(self._levels) <= k:
+                prev = self._levels[-1]
+                size = (max(prev.shape[1] // 2, 1), max(prev.shape[0] // 2, 1))
+                level = cv2.resize(prev, size, interpolation=cv2.INTER_AREA)
+                if prev.ndim == 3 and level.ndim == 2:
+                    level = level[..., np.newaxis]
+                self._levels.append(level)
+            return self._levels[k]
+
+    def render(
+        self,
+        yaw: float,
+        pitch: float,
+        roll: float = 0.0,
+        fov_deg: float = 90.0,
+        width: int = 640,
+        height: int = 480,
+        level: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Render a perspective view.
+
+        Args:
+            yaw (float): Longitude of the view centre in degrees.
+            pitch (float): Latitude of the view centre in degrees.
+            roll (float): Rotation of the view about its axis in degrees, counter-clockwise.
+            fov_deg (float): Horizontal field of view in degrees, below 180.
+            width (int): Width of the view in pixels.
+            height (int): Height of the view in pixels.
+            level (Optional[int]): Pyramid level to sample. Defaults to the coarsest one that
+                                   resolves the view (see pyramid_level).
+
+        Returns:
+            np.ndarray: The view (height, width[, C]), with the panorama's dtype.
+        """
+        from .geometry import remap
+
+        if not 0 < fov_deg < 180:
+            raise ValueError(f"fov_deg must be in (0, 180), got {fov_deg}.")
+        if level is None:
+            level = pyramid_level(self.panorama.shape[1], fov_deg, width, self.n_levels)
+        source = self.level(min(level, self.n_levels - 1))
+        map_x, map_y = self.grids.get(pitch, roll, fov_deg, width, height, source.shape)
+        map_x = shift_longitude(map_x, yaw, source.shape[1])
+        return remap(source, map_x, map_y, **self.remap_kwargs)
@@ -0,0 +1,278 @@
+# panorai/sampler/coverage.py
+
+import functools
+import math
+from typing import Any, Dict, Sequence, Tuple
+
+import numpy as np
+
+# Directions used to verify coverage; their spacing is about 3.6 / sqrt(n) radians (~1.5 deg)
+DEFAULT_TEST_DIRECTIONS = 20000
+
+# Largest field of view of a gnomonic face
+MAX_FOV_DEG = 179.0
+
+
+def to_vectors(points: Sequence[Tuple[float, float]]) -> np.ndarray:
+    """
+    Unit vectors of (latitude, longitude) points in degrees.
+
+    Args:
+        points (Sequence[Tuple[float, float]]): (latitude_deg, longitude_deg) pairs.
+
+    Returns:
+        np.ndarray: (n, 3) unit vectors.
+    """
+    lat, lon = np.radians(np.asarray(points, dtype=np.float64).reshape(-1, 2)).T
+    return np.stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)], axis=1)
+
+
+def fibonacci_directions(n: int = DEFAULT_TEST_DIRECTIONS) -> np.ndarray:
+    """
+    Nearly uniform unit vectors on the sphere (Fibonacci lattice).
+
+    Args:
+        n (int): Number of directions.
+
+    Returns:
+        np.ndarray: (n, 3) unit vectors.
+    """
+    i = np.arange(n) + 0.5
+    z = 1 - 2 * i / n
+    r = np.sqrt(1 - z ** 2)
+    angle = 2 * np.pi * i / ((1 + np.sqrt(5)) / 2)
+    return np.stack([r * np.cos(angle), r * np.sin(angle), z], axis=1)
+
+
+def nearest_neighbor_spacing(points: Sequence[Tuple[float, float]]) -> np.ndarray:
+    """
+    Angular distance from every tangent point to its nearest neighbour.
+
+    Args:
+        points (Sequence[Tuple[float, float]]): (latitude_deg, longitude_deg) pairs.
+
+    Returns:
+        np.ndarray: Distances in degrees, one per point (180 for a single point).
+    """
+    vectors = to_vectors(points)
+    cos = np.clip(vectors @ vectors.T, -1.0, 1.0)
+    np.fill_diagonal(cos, -1.0)
+    return np.degrees(np.arccos(cos.max(axis=1)))
+
+
+def gnomonic_extent(points: Sequence[Tuple[float, float]], directions: np.ndarray) -> np.ndarray:
+    """
+    Half field of view each face needs to contain each direction.
+
+    A direction lies in a square gnomonic face of field of view F centred on a tangent
+    point when both of its tangent-plane coordinates are within tan(F / 2), which is when
+    the returned angle is at most F / 2.
+
+    Args:
+        points (Sequence[Tuple[float, float]]): (latitude_deg, longitude_deg) tangent points.
+        directions (np.ndarray): (m, 3) unit vectors.
+
+    Returns:
+        np.ndarray: (n, m) half fields of view in degrees; 90 for directions behind the face.
+    """
+    lat, lon = np.radians(np.asarray(points, dtype=np.float64).reshape(-1, 2)).T
+    center = to_vectors(points)
+    east = np.stack([-np.sin(lon), np.cos(lon), np.zeros_like(lon)], axis=1)
+    north = np.stack([-np.sin(lat) * np.cos(lon), -np.sin(lat) * np.sin(lon), np.cos(lat)], axis=1)
+
+    cos_c = center @ directions.T
+    front = cos_c > 1e-9
+    safe = np.where(front, cos_c, 1.0)
+    extent = np.maximum(np.abs(east @ directions.T), np.abs(north @ directions.T)) / safe
+    return np.where(front, np.degrees(np.arctan(extent)), 90.0)
+
+
+def covers(points: Sequence[Tuple[float, float]], fov_deg: float, directions: np.ndarray = None) -> bool:
+    """
+    Whether square gnomonic faces of a given field of view cover the whole sphere.
+
+    Args:
+        points (Sequence[Tuple[float, float]]): (latitude_deg, longitude_deg) tangent points.
+        fov_deg (float): Field of view of every face in degrees.
+        directions (np.ndarray): Directions to check. Defaults to a dense Fibonacci lattice.
+
+    Returns:
+        bool: True if every direction falls inside at least one face.
+    """
+    if directions is None:
+        directions = fibonacci_directions()
+    return bool(np.all(gnomonic_extent(points, directions).min(axis=0) <= fov_deg / 2))
+
+
+@functools.lru_cache(maxsize=64)
+def _covering_fov(points: Tuple[Tuple[float, float], ...], n_directions: int) -> float:
+    # Half field of view of the face closest (in the gnomonic sense) to each direction
+    needed = gnomonic_extent(points, fibonacci_directions(n_directions)).min(axis=0)
+    return float(2 * needed.max())
+
+
+def covering_fov(points: Sequence[Tuple[float, float]], n_directions: int = DEFAULT_TEST_DIRECTIONS) -> float:
+    """
+    Smallest field of view for which square gnomonic faces at the points cover the sphere,
+    evaluated on a dense lattice of directions.
+
+    Args:
+        points (Sequence[Tuple[float, float]]): (latitude_deg, longitude_deg) tangent points.
+        n_directions (int): Number of directions checked.
+
+    Returns:
+        float: Field of view in degrees (at least 180 if the points leave a hemisphere uncovered).
+    """
+    return _covering_fov(tuple((float(lat), float(lon)) for lat, lon in points), n_directions)
+
+
+def auto_fov(points: Sequence[Tuple[float, float]], margin_deg: float = 2.0) -> float:
+    """
+    Field of view of the faces at a set of tangent points.
+
+    Starts from the largest nearest-neighbour spacing of the points, grows it to the
+    covering field of view if faces that large would leave gaps, and adds the overlap
+    margin.
+
+    Args:
+        points (Sequence[Tuple[float, float]]): (latitude_deg, longitude_deg) tangent points.
+        margin_deg (float): Overlap margin added to the field of view, in degrees.
+
+    Returns:
+        float: Field of view in degrees.
+
+    Raises:
+        ValueError: If the points cannot cover the sphere with faces narrower than MAX_FOV_DEG.
+    """
+    fov = max(float(nearest_neighbor_spacing(points).max()), covering_fov(points)) + margin_deg
+    if fov > MAX_FOV_DEG:
+        raise ValueError(
+            f"{len(points)} tangent points need a {fov:.1f} degree field of view to cover the sphere; "
+            f"gnomonic faces are limited to {MAX_FOV_DEG} degrees. Use more points."
+        )
+    return fov
+
+
+def face_pixels(fov_deg: float, pixels_per_degree: float) -> int:
+    """
+    Side of a square gnomonic face matching the angular resolution of the source.
+
+    The pixel pitch at the face centre, 2 tan(F / 2) / N radians, is matched to the
+    source's; off-centre face pixels are smaller, so the source is never undersampled.
+    The side is rounded up to an even number: the centre pixel of an odd-sized face falls
+    exactly on the tangent point, where the inverse gnomonic projection is singular.
+
+    Args:
+        fov_deg (float): Field of view of the face in degrees.
+        pixels_per_degree (float): Angular resolution of the source (equirectangular width / 360).
+
+    Returns:
+        int: Face width and height in pixels.
+    """
+    side = math.ceil(2 * math.tan(math.radians(fov_deg) / 2) * math.degrees(1) * pixels_per_degree)
+    return max(2, side + side % 2)
+
+
+def _label_holes(uncovered: np.ndarray) -> Tuple[np.ndarray, int]:
+    """
+    Connected regions of an equirectangular mask, joined across the +-180 degree seam.
+    """
+    from scipy.ndimage import label
+
+    labels, n = label(uncovered)
+    if n == 0:
+        return labels, 0
+    # Regions touching both sides of the seam are one hole
+    parent = np.arange(n + 1)
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            i = parent[i]
+        return i
+
+    for a, b in zip(labels[:, 0], labels[:, -1]):
+        if a and b:
+            parent[find(a)] = find(b)
+    roots = np.array([find(i) for i in range(n + 1)])
+    # Number the merged holes from 1, keeping 0 for covered cells even when there are none
+    holes = np.unique(roots[1:])
+    relabel = np.zeros(n + 1, dtype=labels.dtype)
+    relabel[holes] = np.arange(1, len(holes) + 1)
+    return relabel[roots][labels], len(holes)
+
+
+def analyze_coverage(
+    points: Sequence[Tuple[float, float]],
+    fov_deg: float,
+    x_points: int = None,
+    y_points: int = None,
+    resolution_deg: float = 0.5
+) -> Dict[str, Any]:
+    """
+    Coverage and overlap of square gnomonic faces at a set of tangent points.
+
+    Every cell of an equirectangular grid is tested against every face, and statistics
+    are weighted by cell area, so they are fractions of the sphere.
+
+    Args:
+        points (Sequence[Tuple[float, float]]): (latitude_deg, longitude_deg) tangent points.
+        fov_deg (float): Field of view of every face in degrees.
+        x_points (int): Face width in pixels, to report the total number of face pixels.
+        y_points (int): Face height in pixels.
+        resolution_deg (float): Cell size of the analysis grid in degrees.
+
+    Returns:
+        Dict[str, Any]: Report with
+            - n_faces, fov_deg, total_face_pixels (None without x_points and y_points),
+            - coverage_fraction: fraction of the sphere inside at least one face,
+            - overlap_min, overlap_mean, overlap_max: number of faces containing a point
+              (the mean is the total area of the faces over the area of the sphere),
+            - redundant_ratio: fraction of the projected area covering points already
+              covered by another face,
+            - holes: number of connected uncovered regions, hole_fraction: their area, and
+              hole_centers: (latitude_deg, longitude_deg) of the largest cell of each.
+    """
+    rows = max(1, int(round(180.0 / resolution_deg)))
+    cols = 2 * rows
+    lat = 90.0 - (np.arange(rows) + 0.5) * 180.0 / rows
+    lon = -180.0 + (np.arange(cols) + 0.5) * 360.0 / cols
+    lat_grid, lon_grid = np.meshgrid(lat, lon, indexing="ij")
+    directions = to_vectors(np.stack([lat_grid.ravel(), lon_grid.ravel()], axis=1))
+    area = np.repeat(np.cos(np.radians(lat)), cols)
+    area /= area.sum()
+
+    # One face at a time, to bound memory by the size of the grid
+    multiplicity = np.zeros(rows * cols, dtype=np.int32)
+    for point in points:
+        multiplicity += gnomonic_extent([point], directions)[0] <= fov_deg / 2
+
+    covered = multiplicity > 0
+    hole_fraction = float(area[~covered].sum())
+    projected = float((area * multiplicity).sum())
+    redundant = float((area * np.maximum(multiplicity - 1, 0)).sum())
+
+    uncovered = ~covered.reshape(rows, cols)
+    labels, n_holes = _label_holes(uncovered)
+    hole_centers = []
+    for k in range(1, n_holes + 1):
+        r, c = np.nonzero(labels == k)
+        i = np.argmax(np.cos(np.radians(lat[r])))
+        hole_centers.append((float(lat[r[i]]), float(lon[c[i]])))
+
+    total_face_pixels = None
+    if x_points is not None and y_points is not None:
+        total_face_pixels = len(points) * int(x_points) * int(y_points)
+
+    return {
+        "n_faces": len(points),
+        "fov_deg": float(fov_deg),
+        "total_face_pixels": total_face_pixels,
+        "coverage_fraction": 1.0 - hole_fraction,
+        "overlap_min": int(multiplicity.min()),
+        "overlap_mean": projected,
+        "overlap_max": int(multiplicity.max()),
+        "redundant_ratio": redundant / projected if projected else 0.0,
+        "holes": n_holes,
+        "hole_fraction": hole_fraction,
+        "hole_centers": hole_centers,
+    }
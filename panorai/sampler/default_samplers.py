@@ -2,21 +2,29 @@
 
 import logging
 from .registry import SamplerRegistry
-from .base_samplers import SAMPLER_CLASSES
 
 logger = logging.getLogger('sampler.default_samplers')
 
+# Import paths of the default samplers; they are imported and instantiated on first use
+DEFAULT_SAMPLERS = {
+    "CubeSampler": f"{__package__}.base_samplers:CubeSampler",
+    "IcosahedronSampler": f"{__package__}.base_samplers:IcosahedronSampler",
+    "FibonacciSampler": f"{__package__}.base_samplers:FibonacciSampler",
+    "HEALPixSampler": f"{__package__}.healpix:HEALPixSampler",
+}
+
 
 def register_default_samplers() -> None:
     """
     Registers default sampler classes into the SamplerRegistry.
 
+    Registration is lazy: each sampler is imported and instantiated the first time it
+    is requested from the registry.
+
     Raises:
         Exception: If sampler registration fails for any reason.
     """
     logger.debug("Registering default samplers.")
-    for k, v in SAMPLER_CLASSES.items():
-        # Instantiate and register the default instance
-        sampler_instance = v()
-        SamplerRegistry.register(k, sampler_instance)
+    for name, target in DEFAULT_SAMPLERS.items():
+        SamplerRegistry.register_lazy(name, target)
     logger.debug("All default samplers registered.")
\ No newline at end of file
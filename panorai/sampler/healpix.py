@@ -0,0 +1,206 @@
+# panorai/sampler/healpix.py
+
+from typing import Any, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .base_samplers import Sampler
+
+# Row and column offsets of the 12 base pixels (Gorski et al. 2005)
+_JRLL = np.array([2, 2, 2, 2, 3, 3, 3, 3, 4, 4, 4, 4])
+_JPLL = np.array([1, 3, 5, 7, 0, 2, 4, 6, 1, 3, 5, 7])
+
+# Largest supported order: pixel indices of order 29 still fit in int64
+MAX_ORDER = 29
+
+ArrayLike = Union[float, np.ndarray]
+
+
+def _spread_bits(v: np.ndarray) -> np.ndarray:
+    """Move bit k of v to bit 2k."""
+    v = v.astype(np.int64) & 0xFFFFFFFF
+    v = (v | (v << 16)) & 0x0000FFFF0000FFFF
+    v = (v | (v << 8)) & 0x00FF00FF00FF00FF
+    v = (v | (v << 4)) & 0x0F0F0F0F0F0F0F0F
+    v = (v | (v << 2)) & 0x3333333333333333
+    return (v | (v << 1)) & 0x5555555555555555
+
+
+def _compact_bits(v: np.ndarray) -> np.ndarray:
+    """Move bit 2k of v to bit k (inverse of _spread_bits)."""
+    v = v.astype(np.int64) & 0x5555555555555555
+    v = (v | (v >> 1)) & 0x3333333333333333
+    v = (v | (v >> 2)) & 0x0F0F0F0F0F0F0F0F
+    v = (v | (v >> 4)) & 0x00FF00FF00FF00FF
+    v = (v | (v >> 8)) & 0x0000FFFF0000FFFF
+    return (v | (v >> 16)) & 0x00000000FFFFFFFF
+
+
+def ang2pix(order: int, lat_deg: ArrayLike, lon_deg: ArrayLike) -> np.ndarray:
+    """
+    Nested HEALPix pixel containing each direction.
+
+    Constant time per direction and vectorized: the pixel follows in closed form from
+    z = sin(latitude) and the longitude, without any distance check.
+
+    Args:
+        order (int): Resolution order; nside = 2 ** order and there are 12 * 4 ** order pixels.
+        lat_deg (ArrayLike): Latitudes in degrees.
+        lon_deg (ArrayLike): Longitudes in degrees.
+
+    Returns:
+        np.ndarray: int64 nested pixel indices, with the broadcast shape of the inputs.
+    """
+    nside = 1 << order
+    lat, lon = np.broadcast_arrays(np.asarray(lat_deg, dtype=np.float64), np.asarray(lon_deg, dtype=np.float64))
+    z = np.sin(np.radians(lat))
+    za = np.abs(z)
+    tt = np.mod(lon, 360.0) / 90.0  # in [0, 4)
+
+    # Equatorial belt, |z| <= 2/3
+    temp1 = nside * (0.5 + tt)
+    temp2 = nside * z * 0.75
+    jp = np.floor(temp1 - temp2).astype(np.int64)  # Index of the ascending edge line
+    jm = np.floor(temp1 + temp2).astype(np.int64)  # Index of the descending edge line
+    ifp, ifm = jp // nside, jm // nside
+    face_eq = np.where(ifp == ifm, ifp | 4, np.where(ifp < ifm, ifp, ifm + 8))
+    ix_eq = jm & (nside - 1)
+    iy_eq = nside - (jp & (nside - 1)) - 1
+
+    # Polar caps
+    ntt = np.minimum(np.floor(tt).astype(np.int64), 3)
+    tp = tt - ntt
+    tmp = nside * np.sqrt(3.0 * (1.0 - za))
+    jp_p = np.minimum(np.floor(tp * tmp).astype(np.int64), nside - 1)
+    jm_p = np.minimum(np.floor((1.0 - tp) * tmp).astype(np.int64), nside - 1)
+    north = z > 0
+    face_p = np.where(north, ntt, ntt + 8)
+    ix_p = np.where(north, nside - jm_p - 1, jp_p)
+    iy_p = np.where(north, nside - jp_p - 1, jm_p)
+
+    equatorial = za <= 2.0 / 3.0
+    face = np.where(equatorial, face_eq, face_p)
+    ix = np.where(equatorial, ix_eq, ix_p)
+    iy = np.where(equatorial, iy_eq, iy_p)
+    return face * nside * nside + (_spread_bits(ix) | (_spread_bits(iy) << 1))
+
+
+def pix2ang(order: int, pix: ArrayLike) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Centres of nested HEALPix pixels.
+
+    Args:
+        order (int): Resolution order.
+        pix (ArrayLike): Nested pixel indices.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (latitude_deg, longitude_deg), longitudes in (-180, 180].
+    """
+    nside = 1 << order
+    npix = 12 * nside * nside
+    pix = np.asarray(pix, dtype=np.int64)
+    face = pix >> (2 * order)
+    ipf = pix & (nside * nside - 1)
+    ix, iy = _compact_bits(ipf), _compact_bits(ipf >> 1)
+
+    # Ring index, counted from the north pole
+    jr = _JRLL[face] * nside - ix - iy - 1
+    nr = np.where(jr < nside, jr, np.where(jr > 3 * nside, 4 * nside - jr, nside))
+    z = np.where(
+        jr < nside, 1.0 - nr * nr * 4.0 / npix,
+        np.where(jr > 3 * nside, nr * nr * 4.0 / npix - 1.0, (2 * nside - jr) * 2.0 / (3.0 * nside))
+    )
+    kshift = np.where((jr >= nside) & (jr <= 3 * nside), (jr - nside) & 1, 0)
+
+    jp = (_JPLL[face] * nr + ix - iy + 1 + kshift) // 2
+    jp = np.where(jp > 4 * nside, jp - 4 * nside, jp)
+    jp = np.where(jp < 1, jp + 4 * nside, jp)
+    lon = (jp - (kshift + 1) * 0.5) * 90.0 / nr
+    lon = np.where(lon > 180.0, lon - 360.0, lon)
+    return np.degrees(np.arcsin(np.clip(z, -1.0, 1.0))), lon
+
+
+def parent(pix: ArrayLike, levels: int = 1) -> np.ndarray:
+    """
+    Nested index of the pixel containing `pix`, `levels` orders coarser.
+
+    Args:
+        pix (ArrayLike): Nested pixel indices.
+        levels (int): Number of orders to go up.
+
+    Returns:
+        np.ndarray: int64 pixel indices.
+    """
+    return np.asarray(pix, dtype=np.int64) >> (2 * levels)
+
+
+def children(pix: ArrayLike, levels: int = 1) -> np.ndarray:
+    """
+    Nested indices of the pixels making up `pix`, `levels` orders finer.
+
+    Args:
+        pix (ArrayLike): Nested pixel indices.
+        levels (int): Number of orders to go down.
+
+    Returns:
+        np.ndarray: int64 array of shape pix.shape + (4 ** levels,), in nested order.
+    """
+    pix = np.asarray(pix, dtype=np.int64)
+    return (pix[..., None] << (2 * levels)) + np.arange(4 ** levels, dtype=np.int64)
+
+
+class HEALPixSampler(Sampler):
+    """
+    Tangent points at the centres of the HEALPix pixels of one order, in nested order.
+
+    HEALPix divides the sphere into 12 * 4 ** order pixels of equal area, each split
+    into four at the next order, so point_<i> is pixel i - 1 and the face covering
+    any direction, the parent and the children of a face follow in closed form
+    (see face_index, parent and children). The pixels are not squares, so let
+    auto_size (PipelineConfig) pick a field of view that covers the sphere.
+    """
+
+    def __init__(self, **kwargs: Any) -> None:
+        """
+        Initialize the HEALPixSampler.
+
+        Args:
+            **kwargs (Any): Expects 'order' (default 0, 12 points); nside = 2 ** order.
+        """
+        super().__init__(**kwargs)
+
+    @property
+    def order(self) -> int:
+        """Resolution order of the tangent points."""
+        order = int(self.params.get('order', 0))
+        if not 0 <= order <= MAX_ORDER:
+            raise ValueError(f"order must be between 0 and {MAX_ORDER}, got {order}.")
+        return order
+
+    def get_tangent_points(self) -> List[Tuple[float, float]]:
+        """
+        Centres of every pixel of the current order.
+
+        Returns:
+            List[Tuple[float, float]]: (latitude_deg, longitude_deg) pairs, pixel 0 first.
+        """
+        lat, lon = pix2ang(self.order, np.arange(12 * 4 ** self.order))
+        return [(float(a), float(b)) for a, b in zip(lat, lon)]
+
+    def face_index(self, lat_deg: ArrayLike, lon_deg: ArrayLike, order: Optional[int] = None) -> np.ndarray:
+        """
+        Tangent point index ("point_<idx>") of the face owning each direction.
+
+        Each direction belongs to the face of the pixel containing it (usually, but not
+        always, the nearest tangent point), so an ownership map of an equirectangular
+        image is face_index over its pixel grid.
+
+        Args:
+            lat_deg (ArrayLike): Latitudes in degrees.
+            lon_deg (ArrayLike): Longitudes in degrees.
+            order (Optional[int]): Order of the faces. Defaults to the sampler's.
+
+        Returns:
+            np.ndarray: int64 1-based tangent point indices.
+        """
+        return ang2pix(self.order if order is None else order, lat_deg, lon_deg) + 1
@@ -1,8 +1,11 @@
 # panorai/sampler/registry.py
 
+import importlib
 import logging
-from typing import Any, Dict, Type
-from .base_samplers import Sampler
+from typing import TYPE_CHECKING, Any, Dict, Type
+
+if TYPE_CHECKING:
+    from .base_samplers import Sampler
 
 logger = logging.getLogger('sampler.registry')
 
@@ -24,11 +27,15 @@ class SamplerNotFoundError(SamplerRegistryError):
 class SamplerRegistry:
     """
     Registry for managing projection sampler configurations.
+
+    Samplers can be registered as instances, or lazily as an import path that is only
+    imported and instantiated when the sampler is first requested.
     """
-    _registry: Dict[str, Sampler] = {}
+    _registry: Dict[str, "Sampler"] = {}
+    _lazy: Dict[str, str] = {}
 
     @classmethod
-    def register(cls, name: str, sampler: Sampler) -> None:
+    def register(cls, name: str, sampler: "Sampler") -> None:
         """
         Register a Sampler instance under a given name.
 
@@ -40,10 +47,36 @@ class SamplerRegistry:
             SamplerRegistryError: If there's any error during registration.
         """
         cls._registry[name] = sampler
+        cls._lazy.pop(name, None)
         logger.info(f"Sampler '{name}' registered successfully.")
 
     @classmethod
-    def get_sampler(cls, name: str, **kwargs: Any) -> Sampler:
+    def register_lazy(cls, name: str, target: str) -> None:
+        """
+        Register a sampler class by import path, without importing it.
+
+        Args:
+            name (str): Sampler name.
+            target (str): "package.module:ClassName" of a Sampler subclass, instantiated
+                without arguments on first use.
+        """
+        cls._lazy[name] = target
+        cls._registry.pop(name, None)
+        logger.debug(f"Sampler '{name}' registered lazily as '{target}'.")
+
+    @classmethod
+    def _resolve(cls, name: str) -> None:
+        module_name, _, attr = cls._lazy[name].partition(":")
+        try:
+            sampler_cls = getattr(importlib.import_module(module_name), attr)
+            sampler = sampler_cls()
+        except Exception as e:
+            raise SamplerRegistryError(f"Cannot load sampler '{name}' from '{cls._lazy[name]}'.") from e
+        cls._registry[name] = sampler
+        del cls._lazy[name]
+
+    @classmethod
+    def get_sampler(cls, name: str, **kwargs: Any) -> "Sampler":
         """
         Retrieve a sampler from the registry and update its parameters.
 
@@ -58,6 +91,8 @@ class SamplerRegistry:
             SamplerNotFoundError: If the sampler name is not found in the registry.
         """
         logger.debug(f"Retrieving sampler '{name}' with override parameters: {kwargs}")
+        if name in cls._lazy:
+            cls._resolve(name)
         if name not in cls._registry:
             error_msg = f"Sampler '{name}' not found in the registry."
             logger.error(error_msg)
@@ -76,6 +111,6 @@ class SamplerRegistry:
             list: A list of sampler names.
         """
         logger.debug("Listing all registered samplers.")
-        samplers = list(cls._registry.keys())
+        samplers = list(cls._registry.keys()) + list(cls._lazy.keys())
         logger.info(f"Registered samplers: {samplers}")
         return samplers
\ No newline at end of file
@@ -23,7 +23,6 @@ setup(
         "Intended Audience :: Developers",
         "Topic :: Scientific/Engineering :: Image Processing",
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.7",
         "Programming Language :: Python :: 3.8",
         "Programming Language :: Python :: 3.9",
         "Programming Language :: Python :: 3.10",
@@ -31,7 +30,7 @@ setup(
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
     ],
-    python_requires=">=3.7",  # Specify the minimum Python version
+    python_requires=">=3.8",  # Specify the minimum Python version
     install_requires=[
         "numpy",
         "opencv-python-headless",  # Use headless if no GUI is needed
@@ -56,6 +55,7 @@ setup(
     entry_points={
         "console_scripts": [
             "panorai-cli=panorai.cli.projection_pipeline_cli:main",
+            "panorai-serve=panorai.cli.server:main",
         ],
     },
     include_package_data=True,  # Includes non-code files specified in MANIFEST.in
@@ -0,0 +1,220 @@
+"""
+Tests for the panorai-cli batch helpers.
+"""
+import os
+
+from panorai.cli.batch import Manifest, expand_inputs, output_name, run_batch
+
+
+def _touch(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, "w").close()
+
+
+def test_expand_inputs_directory_and_glob(tmp_path):
+    for name in ("a.npz", "b.png", "notes.txt", "sub/c.npz"):
+        _touch(str(tmp_path / name))
+
+    from_dir = expand_inputs(str(tmp_path))
+    assert [os.path.relpath(p, tmp_path) for p in from_dir] == ["a.npz", "b.png", os.path.join("sub", "c.npz")]
+
+    from_glob = expand_inputs(str(tmp_path / "*.npz"))
+    assert [os.path.basename(p) for p in from_glob] == ["a.npz"]
+
+    assert output_name(str(tmp_path / "sub" / "c.npz"), str(tmp_path)) == "sub__c"
+
+
+def test_run_batch_resumes_from_manifest(tmp_path):
+    inputs = [str(tmp_path / f"{i}.npz") for i in range(4)]
+    manifest_path = str(tmp_path / "manifest.jsonl")
+    processed = []
+    broken = {inputs[2]}
+
+    def task(path):
+        processed.append(path)
+        if path in broken:
+            return None, "boom"
+        return path + ".out", None
+
+    counts = run_batch(inputs[:3], task, Manifest(manifest_path))
+    assert counts == {"done": 2, "failed": 1, "skipped": 0}
+
+    # Resuming only retries the failed input and processes the new one
+    processed.clear()
+    broken.clear()
+    counts = run_batch(inputs, task, Manifest(manifest_path))
+    assert processed == inputs[2:]
+    assert counts == {"done": 2, "failed": 0, "skipped": 2}
+
+
+def _crash_on_bad(path):
+    if os.path.basename(path).startswith("bad"):
+        os._exit(1)
+    return path + ".out", None
+
+
+def test_run_batch_survives_a_dying_worker(tmp_path):
+    import json
+
+    inputs = [str(tmp_path / f"{name}.npz") for name in ("a", "b", "bad", "c", "d", "e")]
+    manifest_path = str(tmp_path / "manifest.jsonl")
+    counts = run_batch(inputs, _crash_on_bad, Manifest(manifest_path), workers=2)
+    assert counts == {"done": 5, "failed": 1, "skipped": 0}
+    with open(manifest_path) as f:
+        failed = [r["input"] for r in map(json.loads, f) if r["status"] == "failed"]
+    assert failed == [os.path.abspath(inputs[2])]
+
+
+def test_write_arrays_round_trip(tmp_path):
+    import numpy as np
+
+    from panorai.cli.writers import OUTPUT_FORMATS, load_chunked, write_arrays
+
+    arrays = {
+        "project.rgb": np.random.rand(6, 8, 3).astype(np.float32),
+        "backward.depth": np.arange(20, dtype=np.uint16).reshape(4, 5),
+    }
+    for fmt in OUTPUT_FORMATS:
+        out = tmp_path / fmt
+        out.mkdir()
+        path = write_arrays(arrays, str(out), output_format=fmt)
+        if fmt == "chunked":
+            loaded = load_chunked(path)
+        elif fmt == "npy":
+            loaded = {k: np.load(os.path.join(path, f"{k}.npy"), mmap_mode="r") for k in arrays}
+        else:
+            loaded = dict(np.load(path))
+        for key, arr in arrays.items():
+            assert loaded[key].dtype == arr.dtype
+            np.testing.assert_array_equal(loaded[key], arr)
+
+
+def test_server_runs_shared_memory_and_file_jobs(tmp_path):
+    import numpy as np
+
+    from panorai.cli.server import JobScheduler, ProjectionServer, ServerClient
+    from panorai.pipeline import ProjectionPipeline
+
+    rgb = np.random.randint(0, 255, (32, 64, 3), dtype=np.uint8)
+    np.savez(str(tmp_path / "in.npz"), rgb=rgb)
+    address = str(tmp_path / "serve.sock")
+    server = ProjectionServer(address, JobScheduler(workers=2, max_batch=4)).start()
+    try:
+        client = ServerClient(address)
+        assert client.health()
+        job = dict(projection_name="gnomonic", sampler_name="CubeSampler", operation="project",
+                   kwargs={"x_points": 16, "y_points": 16})
+
+        arrays = client.run_arrays({"rgb": rgb}, **job)
+        reference = ProjectionPipeline(projection_name="gnomonic", sampler_name="CubeSampler")
+        expected = reference.project(rgb, x_points=16, y_points=16)
+        np.testing.assert_array_equal(arrays["project.stacked.point_1"], expected["stacked"]["point_1"])
+
+        out_dir = tmp_path / "out"
+        client.submit(dict(job, input={"path": str(tmp_path / "in.npz")},
+                           output={"dir": str(out_dir), "format": "npz", "save_png": False}))
+        saved = np.load(str(out_dir / "output.npz"))
+        np.testing.assert_array_equal(saved["project.point_1.rgb"], arrays["project.point_1.rgb"])
+
+        stats = client.stats()
+        assert stats["completed"] == 2 and stats["failed"] == 0 and stats["queue_depth"] == 0
+        assert set(stats["latency_ms"]) == {"p50", "p90", "p99"}
+        assert stats["pipelines"]['gnomonic/CubeSampler {"x_points": 16, "y_points": 16}']["hits"] >= 1
+
+        # A job without kwargs runs on the default configuration, not on the previous job's
+        default = client.run_arrays({"rgb": rgb}, **dict(job, kwargs={}))
+        assert default["project.stacked.point_1"].shape == ProjectionPipeline(
+            projection_name="gnomonic", sampler_name="CubeSampler").project(rgb)["stacked"]["point_1"].shape
+        again = client.run_arrays({"rgb": rgb}, **job)
+        np.testing.assert_array_equal(again["project.stacked.point_1"], expected["stacked"]["point_1"])
+    finally:
+        server.shutdown()
+    assert not os.path.exists(address)
+    assert not ServerClient(address).health()
+
+
+def test_scheduler_builds_pipelines_outside_its_lock():
+    import threading
+
+    from panorai.cli.server import JobScheduler
+
+    release = threading.Event()
+    built = []
+
+    def slow_build(projection_name, sampler_name):
+        built.append((projection_name, sampler_name))
+        release.wait(5)
+        raise RuntimeError("no pipeline")
+
+    scheduler = JobScheduler(workers=1, build_pipeline=slow_build)
+    try:
+        first = scheduler.submit({"input": {}, "kwargs": {"x_points": 16}})
+        while not built:
+            threading.Event().wait(0.01)
+        # A cold build neither blocks new submissions nor the stats
+        second = scheduler.submit({"input": {}})
+        assert scheduler.stats()["in_flight"] == 1 and scheduler.stats()["queue_depth"] == 1
+        release.set()
+        first.wait()
+        second.wait()
+        assert "no pipeline" in first.error and "no pipeline" in second.error
+    finally:
+        scheduler.stop()
+
+
+def test_server_limits_paths_and_reaps_unread_results(tmp_path):
+    import numpy as np
+    import pytest
+
+    from panorai.cli.server import OutputBlocks, ProjectionServer, JobScheduler, ServerClient, array_to_shm, shm_to_array
+
+    np.savez(str(tmp_path / "in.npz"), rgb=np.zeros((16, 32, 3), dtype=np.uint8))
+    address = str(tmp_path / "serve.sock")
+    server = ProjectionServer(address, JobScheduler(workers=1, root=str(tmp_path / "jobs"))).start()
+    try:
+        assert os.stat(address).st_mode & 0o077 == 0, "the socket should only accept the server's user"
+        with pytest.raises(RuntimeError, match="outside the server root"):
+            ServerClient(address).submit({"input": {"path": str(tmp_path / "in.npz")},
+                                          "output": {"dir": str(tmp_path / "jobs" / "out")}})
+    finally:
+        server.shutdown()
+
+    outputs = OutputBlocks(ttl=0)
+    read, unread = (array_to_shm(np.arange(4), owned=False) for _ in range(2))
+    for shm, descriptor in (read, unread):
+        shm.close()
+        outputs.add(descriptor["shm"])
+    np.testing.assert_array_equal(shm_to_array(read[1], unlink=True), np.arange(4))
+    assert outputs.reap() == 1 and len(outputs) == 0
+    with pytest.raises(FileNotFoundError):
+        shm_to_array(unread[1])
+
+
+def test_analyze_coverage_reports_holes_and_overlap(monkeypatch, capsys):
+    import json
+    import sys
+
+    from panorai.cli import projection_pipeline_cli
+    from panorai.sampler.coverage import analyze_coverage
+
+    cube = [(0, 0), (0, 90), (0, 180), (0, -90), (90, 0), (-90, 0)]
+    exact = analyze_coverage(cube, fov_deg=90, x_points=64, y_points=64, resolution_deg=2)
+    assert exact["coverage_fraction"] == 1.0 and exact["holes"] == 0
+    assert exact["overlap_min"] == 1 and exact["redundant_ratio"] < 0.01  # Only cells on the cube edges
+    assert exact["total_face_pixels"] == 6 * 64 * 64
+
+    narrow = analyze_coverage(cube, fov_deg=80, resolution_deg=2)
+    assert narrow["coverage_fraction"] < 1.0 and narrow["overlap_min"] == 0 and narrow["holes"] >= 1
+
+    # A face too small to cover any cell leaves the whole sphere as one hole
+    assert analyze_coverage([(0, 1)], fov_deg=0.01, resolution_deg=2)["holes"] == 1
+
+    monkeypatch.setattr(sys, "argv", ["panorai-cli", "--analyze-coverage", "--sampler_name", "FibonacciSampler",
+                                      "--kwargs", "n_points=20", "fov_deg=70", "resolution_deg=2"])
+    try:
+        projection_pipeline_cli.main()
+    except SystemExit as exit_code:
+        assert exit_code.code == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report["n_faces"] == 20 and report["coverage_fraction"] == 1.0
+    assert report["overlap_mean"] > 1 and 0 < report["redundant_ratio"] < 1
@@ -1,6 +1,8 @@
 """
 Example tests for the ProjectionPipeline using pytest.
 """
+import os
+
 import pytest
 import numpy as np
 
@@ -77,4 +79,757 @@ def test_pipeline_with_pipeline_data():
     # Also expect unstacked keys like "point_1" -> dict with "rgb" and "depth"
     assert "point_1" in result, "Expected unstacked data for 'point_1'"
     p1_data = result["point_1"]
-    assert "rgb" in p1_data and "depth" in p1_data, "Unstacked data must have 'rgb' and 'depth'"
\ No newline at end of file
+    assert "rgb" in p1_data and "depth" in p1_data, "Unstacked data must have 'rgb' and 'depth'"
+
+def test_export_operator_matches_project(tmp_path):
+    """
+    The sparse forward operator reproduces project() and survives a save/load round trip.
+    """
+    from panorai.pipeline.operators import SparseProjectionOperator
+
+    pipeline = ProjectionPipeline(projection_name="gnomonic", sampler_name="CubeSampler")
+    data = np.random.rand(64, 128, 3).astype(np.float32)
+    projections = pipeline.project(data, x_points=32, y_points=32)
+
+    operator = pipeline.export_operator(data.shape, path=str(tmp_path / "op.npz"))
+    assert pipeline.export_operator(data.shape) is operator, "Operator should be cached per configuration"
+
+    faces = operator.project(data)
+    assert faces.shape == (6, 32, 32, 3)
+    for idx in range(6):
+        assert np.allclose(faces[idx], projections["stacked"][f"point_{idx + 1}"], atol=1e-3)
+
+    ones = operator.backproject(np.ones((6, 32, 32, 3), dtype=np.float32))
+    assert np.allclose(ones, 1.0, atol=1e-3), "Normalized blend of constant faces should be constant"
+
+    loaded = SparseProjectionOperator.load(str(tmp_path / "op.npz"))
+    assert np.allclose(loaded.project(data), faces)
+
+
+def test_export_operator_follows_resize_and_border_settings():
+    """
+    The operator folds in resize_factor and bilinear interpolation like project(), and
+    refuses border settings that no sparse matrix can reproduce.
+    """
+    import cv2
+
+    pipeline = ProjectionPipeline(projection_name="gnomonic", sampler_name="CubeSampler")
+    data = np.random.rand(64, 128, 3).astype(np.float32)
+    settings = dict(x_points=16, y_points=16, resize_factor=0.5, interpolation=cv2.INTER_LINEAR)
+    projections = pipeline.project(data, **settings)
+
+    operator = pipeline.export_operator(data.shape, **settings)
+    faces = operator.project(data)
+    for idx in range(6):
+        np.testing.assert_allclose(faces[idx], projections["stacked"][f"point_{idx + 1}"], atol=1e-3)
+    assert operator.backproject(faces).shape == pipeline.backward(projections)["stacked"].shape == (32, 64, 3)
+
+    with pytest.raises(ValueError, match="border"):
+        pipeline.export_operator(data.shape, borderMode=cv2.BORDER_REPLICATE)
+    with pytest.raises(ValueError, match="border"):
+        pipeline.export_operator(data.shape, borderMode=cv2.BORDER_CONSTANT, borderValue=1)
+
+
+def test_geometry_disk_cache_shared_between_pipelines(tmp_path):
+    """
+    A second pipeline pointing at the same cache_dir memory-maps grids instead of recomputing them.
+    """
+    from panorai.pipeline import PipelineConfig
+
+    data = np.random.rand(50, 100, 3).astype(np.float32)
+
+    first = ProjectionPipeline("gnomonic", "CubeSampler", PipelineConfig(cache_dir=str(tmp_path)))
+    expected = first.project(data, x_points=24, y_points=24)
+    first.backward(expected)
+    assert first.geometry.stats()["misses"] == 12, "6 forward + 6 backward grids should be computed"
+
+    second = ProjectionPipeline("gnomonic", "CubeSampler", PipelineConfig(cache_dir=str(tmp_path)))
+    result = second.project(data, x_points=24, y_points=24)
+    second.backward(result)
+    stats = second.geometry.stats()
+    assert stats["misses"] == 0 and stats["disk_hits"] == 12
+    assert np.array_equal(result["stacked"]["point_3"], expected["stacked"]["point_3"])
+
+
+def test_geometry_disk_cache_eviction(tmp_path):
+    """
+    The disk cache stays within its size budget by evicting least recently used entries.
+    """
+    from panorai.pipeline.disk_cache import GeometryDiskCache
+
+    cache = GeometryDiskCache(str(tmp_path), max_bytes=3000)
+    for i in range(5):
+        cache.store(f"entry{i}", {"a": np.full(256, i, dtype=np.float32)})
+
+    assert cache.size() <= 3000
+    assert cache.load("entry4", ("a",))[0][0] == 4
+    assert cache.load("entry0", ("a",)) is None
+
+    # Writes well within the budget do not list the store again
+    roomy = GeometryDiskCache(str(tmp_path / "roomy"), max_bytes=1024 ** 2)
+    listings = []
+    roomy.entries = lambda entries=roomy.entries: listings.append(1) or entries()
+    for i in range(20):
+        roomy.store(f"entry{i}", {"a": np.full(256, i, dtype=np.float32)})
+    assert len(listings) == 1 and roomy.load("entry19", ("a",))[0][0] == 19
+
+    # Directories left by crashed writers are swept once stale
+    for name in (".tmp-crashed", ".trash-crashed", ".tmp-writing"):
+        os.makedirs(os.path.join(cache.root, name))
+    for name in (".tmp-crashed", ".trash-crashed"):
+        os.utime(os.path.join(cache.root, name), (0, 0))
+    cache.evict()
+    assert sorted(n for n in os.listdir(cache.root) if n.startswith(".")) == [".tmp-writing"]
+
+    # A cache directory that cannot be written to only misses
+    broken = GeometryDiskCache(str(tmp_path / "broken"))
+    os.rmdir(broken.root)
+    open(broken.root, "w").close()
+    broken.store("entry", {"a": np.zeros(4)})
+    assert broken.load("entry", ("a",)) is None
+
+
+def test_stream_matches_per_frame_projection():
+    """
+    stream() yields the same results as per-frame project()/backward() and feeds the writer in order.
+    """
+    pipeline = ProjectionPipeline(projection_name="gnomonic", sampler_name="CubeSampler")
+    frames = [np.random.rand(40, 80, 3).astype(np.float32) for _ in range(4)]
+
+    written = []
+    results = list(pipeline.stream(iter(frames), operation="both", writer=lambda i, r: written.append(i),
+                                   x_points=16, y_points=16))
+
+    assert [idx for idx, _ in results] == [0, 1, 2, 3]
+    assert written == [0, 1, 2, 3]
+
+    reference = ProjectionPipeline(projection_name="gnomonic", sampler_name="CubeSampler")
+    expected = reference.project(frames[2], x_points=16, y_points=16)
+    assert np.array_equal(results[2][1]["project"]["stacked"]["point_1"], expected["stacked"]["point_1"])
+    assert results[2][1]["backward"]["stacked"].shape == (40, 80, 3)
+
+
+def test_lazy_pipeline_data_from_npz(tmp_path):
+    """
+    Lazy PipelineData reads shapes from headers, memory-maps uncompressed members
+    and stacks exactly like the in-memory version.
+    """
+    from panorai.pipeline.sources import NpzMember
+
+    rgb = np.random.rand(20, 40, 3).astype(np.float32)
+    depth = np.random.rand(20, 40).astype(np.float32)
+    for save, mapped in ((np.savez, True), (np.savez_compressed, False)):
+        path = str(tmp_path / f"{save.__name__}.npz")
+        save(path, rgb=rgb, depth=depth, unused=np.zeros(3))
+
+        lazy = PipelineData.from_npz(path, keys=["rgb", "depth"])
+        assert (lazy.H, lazy.W) == (20, 40)
+        assert isinstance(lazy.data["rgb"], NpzMember) and not lazy.data["rgb"].loaded
+
+        stacked, keys = lazy.stack_all()
+        expected, expected_keys = PipelineData(rgb=rgb, depth=depth).stack_all()
+        assert keys == expected_keys
+        np.testing.assert_array_equal(stacked, expected)
+        assert not lazy.data["rgb"].loaded, "stack_all should release entries it loaded"
+
+        assert isinstance(lazy["rgb"], np.memmap) == mapped
+        np.testing.assert_array_equal(lazy["rgb"], rgb)
+        lazy.release()
+        assert not lazy.data["rgb"].loaded
+
+
+def test_packed_pipeline_data_stacks_without_copy():
+    """
+    Packed PipelineData exposes its entries as views of one buffer and stack_all returns that buffer.
+    """
+    rgb = np.random.rand(30, 60, 3).astype(np.float32)
+    depth = np.random.rand(30, 60).astype(np.float32)
+    data = PipelineData(rgb=rgb, depth=depth).pack()
+
+    stacked, keys = data.stack_all()
+    assert stacked is data.stack_all()[0]
+    assert np.shares_memory(stacked, data.data["rgb"]) and np.shares_memory(stacked, data.data["depth"])
+    np.testing.assert_array_equal(data.data["depth"], depth)
+
+    pipeline = ProjectionPipeline(projection_name="gnomonic", sampler_name="CubeSampler")
+    packed_result = pipeline.project(data)
+    plain_result = pipeline.project(PipelineData(rgb=rgb, depth=depth))
+    for idx in range(1, 7):
+        np.testing.assert_allclose(packed_result[f"point_{idx}"]["depth"], plain_result[f"point_{idx}"]["depth"])
+        assert np.shares_memory(packed_result[f"point_{idx}"]["depth"], packed_result["stacked"][f"point_{idx}"])
+
+    # Replacing an entry falls back to regular stacking
+    data.data["depth"] = depth * 2
+    assert not data.packed
+    np.testing.assert_allclose(data.stack_all()[0][..., 0], depth * 2)
+
+
+def test_resize_stage_matches_area_resize_then_project():
+    """
+    resize_factor is folded into the forward grids: projecting at full resolution with
+    factor 0.25 matches INTER_AREA-resizing first, and backward returns the resized shape.
+    """
+    import cv2
+    from panorai.pipeline import PipelineConfig
+
+    yy, xx = np.mgrid[0:256, 0:512]
+    img = np.stack([xx % 256, yy % 256, ((xx + yy) % 2) * 255], axis=-1).astype(np.uint8)
+
+    fused = ProjectionPipeline(projection_name="gnomonic", sampler_name="CubeSampler",
+                               pipeline_cfg=PipelineConfig(resize_factor=0.25))
+    result = fused.project(img)
+
+    small = cv2.resize(img, (128, 64), interpolation=cv2.INTER_AREA)
+    reference = ProjectionPipeline(projection_name="gnomonic", sampler_name="CubeSampler").project(small)
+
+    for idx in range(1, 7):
+        face = result["stacked"][f"point_{idx}"]
+        assert face.dtype == np.uint8
+        # The 1-pixel checkerboard is averaged away instead of aliasing
+        assert np.abs(face[..., 2].astype(float) - 127.5).max() <= 1
+        diff = np.abs(face.astype(float) - reference["stacked"][f"point_{idx}"].astype(float))
+        assert np.median(diff) <= 1
+
+    assert fused.backward(result)["stacked"].shape == (64, 128, 3)
+
+
+def test_fast_resizer_preserves_dtype_and_matches_single_call():
+    """
+    The 'fast' resizer keeps the dtype, handles many channels, and tiling does not change the result.
+    """
+    import cv2
+    from panorai.pipeline.utils import resizer
+    from panorai.pipeline.utils.resizer import ImageResizer, fast_resize
+
+    img = (np.random.rand(600, 1200, 3) * 65535).astype(np.uint16)
+    expected = cv2.resize(img, (400, 200), interpolation=cv2.INTER_AREA)
+
+    tile_min_pixels = resizer.TILE_MIN_PIXELS
+    resizer.TILE_MIN_PIXELS = 0  # Force tiling on a small image
+    try:
+        tiled = fast_resize(img, (200, 400), max_workers=4)
+    finally:
+        resizer.TILE_MIN_PIXELS = tile_min_pixels
+    np.testing.assert_array_equal(tiled, expected)
+
+    out = ImageResizer(resize_factor=0.5, method="fast").resize_image(img)
+    assert out.dtype == np.uint16 and out.shape == (300, 600, 3)
+
+    many = np.random.rand(40, 80, 300).astype(np.float32)
+    small = fast_resize(many, (20, 40))
+    assert small.shape == (20, 40, 300)
+    np.testing.assert_allclose(small[..., 299], cv2.resize(np.ascontiguousarray(many[..., 299]), (40, 20),
+                                                            interpolation=cv2.INTER_AREA), rtol=1e-5)
+
+    labels = np.random.randint(0, 5, size=(40, 80)).astype(np.int64)
+    assert fast_resize(labels, (80, 160), interpolation=cv2.INTER_NEAREST).dtype == np.int64
+
+
+def test_async_requests_share_one_pipeline():
+    """
+    Concurrent aproject/abackward calls keep their state, including the projection config
+    set by their kwargs, in their own contexts.
+    """
+    import asyncio
+    from panorai.pipeline import ProjectionCancelled, ProjectionContext
+
+    pipeline = ProjectionPipeline(projection_name="gnomonic", sampler_name="CubeSampler")
+    inputs = [
+        PipelineData(rgb=np.random.rand(64, 128, 3).astype(np.float32),
+                     depth=np.random.rand(64, 128).astype(np.float32)),
+        np.random.rand(32, 64, 2).astype(np.float32),
+        np.random.rand(48, 96, 3).astype(np.float32),
+    ]
+    settings = [dict(x_points=32, y_points=32), dict(x_points=16, y_points=16),
+                dict(x_points=24, y_points=24, fov_deg=100.0, interpolation=1)]
+    expected = []
+    for data, kwargs in zip(inputs, settings):
+        dedicated = ProjectionPipeline(projection_name="gnomonic", sampler_name="CubeSampler")
+        projected = dedicated.project(data, **kwargs)
+        expected.append((projected, dedicated.backward(projected)))
+
+    async def request(data, kwargs):
+        projected, ctx = await pipeline.aproject(data, **kwargs)
+        return projected, await pipeline.abackward(projected, context=ctx)
+
+    async def run_all():
+        return await asyncio.gather(*[request(data, kwargs) for data, kwargs in zip(inputs, settings)] * 3)
+
+    try:
+        results = asyncio.run(run_all())
+        for (projected, restored), (exp_projected, exp_restored) in zip(results, expected * 3):
+            np.testing.assert_allclose(projected["stacked"]["point_1"], exp_projected["stacked"]["point_1"])
+            np.testing.assert_allclose(restored["stacked"], exp_restored["stacked"], atol=1e-6)
+        assert "depth" in results[0][1] and "depth" not in results[1][1]
+
+        cancelled = ProjectionContext()
+        cancelled.cancel()
+        with pytest.raises(ProjectionCancelled):
+            asyncio.run(pipeline.aproject(inputs[1], context=cancelled))
+    finally:
+        pipeline.close()
+
+
+def test_result_cache_returns_repeated_projections(tmp_path):
+    """
+    With a result cache, repeating project/backward on the same content and configuration
+    returns the cached arrays, from memory or from the disk tier of another pipeline. The
+    arrays of a miss stay writable and editing them does not change the cache.
+    """
+    from panorai.pipeline import PipelineConfig
+
+    cfg = dict(result_cache_bytes=64 * 1024 ** 2, result_cache_dir=str(tmp_path / "results"))
+    pipeline = ProjectionPipeline(projection_name="gnomonic", sampler_name="CubeSampler",
+                                  pipeline_cfg=PipelineConfig(**cfg))
+    data = PipelineData(rgb=np.random.rand(32, 64, 3).astype(np.float32),
+                        depth=np.random.rand(32, 64).astype(np.float32))
+
+    first = pipeline.project(data, x_points=16, y_points=16)
+    restored = pipeline.backward(first)
+    assert first["stacked"]["point_1"].flags.writeable and restored["stacked"].flags.writeable
+    expected_face = first["stacked"]["point_1"].copy()
+    first["stacked"]["point_1"][:] = 0
+
+    same_content = PipelineData(rgb=data.data["rgb"].copy(), depth=data.data["depth"].copy())
+    again = pipeline.project(same_content, x_points=16, y_points=16)
+    np.testing.assert_array_equal(again["stacked"]["point_1"], expected_face)
+    assert not again["stacked"]["point_1"].flags.writeable
+    assert again["point_1"]["depth"].shape == (16, 16)
+    assert pipeline.project(data, x_points=16, y_points=16)["stacked"]["point_1"] is again["stacked"]["point_1"]
+    np.testing.assert_array_equal(pipeline.backward(again)["stacked"], restored["stacked"])
+    assert pipeline.result_cache.stats()["hits"] == 3
+
+    pipeline.project(data, x_points=8, y_points=8)
+    assert pipeline.result_cache.stats()["misses"] == 3
+
+    other = ProjectionPipeline(projection_name="gnomonic", sampler_name="CubeSampler",
+                               pipeline_cfg=PipelineConfig(**cfg))
+    from_disk = other.project(data, x_points=16, y_points=16)
+    assert other.result_cache.stats()["disk_hits"] == 1
+    np.testing.assert_array_equal(from_disk["stacked"]["point_3"], first["stacked"]["point_3"])
+    assert not from_disk["stacked"]["point_3"].flags.writeable
+
+
+def test_faces_without_valid_data_are_skipped():
+    """
+    Faces whose footprint only reads zero (invalid) pixels are skipped, zero-filled and left
+    out of the blend, with the same outputs as projecting them in full.
+    """
+    import warnings
+
+    from panorai.pipeline import PipelineConfig, ProjectionContext
+    from panorai.pipeline.validity import ValidityIndex, footprint_runs
+
+    rgb = np.random.randint(1, 255, size=(256, 512, 3), dtype=np.uint8)
+    rgb[164:] = 0  # Nothing below 25 degrees south, like a large shadow_angle
+    data = PipelineData(rgb=rgb, depth=np.where(rgb[..., 0] > 0, 2.0, 0.0).astype(np.float32))
+
+    reference = ProjectionPipeline(projection_name="gnomonic", sampler_name="CubeSampler")
+    skipping = ProjectionPipeline(projection_name="gnomonic", sampler_name="CubeSampler",
+                                  pipeline_cfg=PipelineConfig(skip_empty_faces=True))
+    expected = reference.project(data)
+    ctx = ProjectionContext()
+    result = skipping.project(data, context=ctx)
+    assert ctx.skipped_faces == {6}
+    assert result.keys() == expected.keys()
+    for key in expected["stacked"]:
+        np.testing.assert_array_equal(result["stacked"][key], expected["stacked"][key])
+    np.testing.assert_array_equal(skipping.backward(result, context=ctx)["depth"],
+                                  reference.backward(expected)["depth"])
+
+    # An explicit mask skips every face that does not see its valid region
+    mask = np.zeros(rgb.shape[:2], dtype=bool)
+    mask[:16] = True
+    skipping.project(data, context=ctx, valid_mask=mask)
+    assert ctx.skipped_faces == {1, 2, 3, 4, 6}
+
+    # A result cache hit reports the same skipped faces as the miss
+    caching = ProjectionPipeline(projection_name="gnomonic", sampler_name="CubeSampler",
+                                 pipeline_cfg=PipelineConfig(skip_empty_faces=True, result_cache_bytes=64 * 1024 ** 2))
+    for _ in range(2):
+        ctx = ProjectionContext()
+        caching.project(data, context=ctx)
+        assert ctx.skipped_faces == {6}
+    assert caching.result_cache.stats()["hits"] == 1
+
+    index = ValidityIndex(mask, block=8)
+    assert index.count(np.array([[0, 0, 63], [1, 0, 63], [2, 0, 63]], dtype=np.int32)) == 128
+
+    # Non-finite samples (e.g. the centre of an odd gnomonic face) are left out of footprints
+    map_x = np.array([[np.nan, 1.5], [2.5, 3.5]])
+    map_y = np.array([[np.nan, 1.5], [2.5, np.inf]])
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        runs = footprint_runs(map_x, map_y, (8, 8), block=2)
+    np.testing.assert_array_equal(runs, footprint_runs(np.array([1.5, 2.5]), np.array([1.5, 2.5]), (8, 8), block=2))
+
+
+def test_edited_skipped_faces_are_back_projected():
+    """
+    A skipped face filled in after the forward pass (e.g. an inpainted nadir) reaches the blend.
+    """
+    from panorai.pipeline import PipelineConfig, ProjectionContext
+
+    data = np.random.rand(256, 512, 3).astype(np.float32) + 0.1
+    data[164:] = 0  # Nothing below 25 degrees south
+    reference = ProjectionPipeline(projection_name="gnomonic", sampler_name="CubeSampler")
+    skipping = ProjectionPipeline(projection_name="gnomonic", sampler_name="CubeSampler",
+                                  pipeline_cfg=PipelineConfig(skip_empty_faces=True))
+    ctx = ProjectionContext()
+    projected = skipping.project(data, context=ctx)
+    assert ctx.skipped_faces == {6}
+    projected["stacked"]["point_6"] = np.full_like(projected["stacked"]["point_6"], 0.5)
+
+    expected = reference.backward(projected, img_shape=data.shape)["stacked"]
+    assert expected[-1].min() > 0.4, "the edited nadir face should cover the bottom rows"
+    np.testing.assert_array_equal(skipping.backward(projected, context=ctx)["stacked"], expected)
+    blend = skipping.backward_incremental(projected, context=ctx)
+    np.testing.assert_allclose(blend.result()["stacked"], expected, atol=1e-6)
+
+    single = ProjectionPipeline(projection_name="gnomonic")
+    face = single.single_projection(data, context=ctx, phi1_deg=-90.0, lam0_deg=0.0,
+                                    valid_mask=data[..., 0] > 0)
+    assert ctx.skipped_faces == {None} and not face.any()
+    out = single.single_backward(np.full_like(face, 0.5), context=ctx, phi1_deg=-90.0, lam0_deg=0.0)
+    assert out[-1].min() > 0.4
+
+
+def test_incremental_blend_updates_single_faces():
+    """
+    IncrementalBlend matches backward() before and after replacing or removing faces.
+    """
+    pipeline = ProjectionPipeline(projection_name="gnomonic", sampler_name="CubeSampler")
+    data = PipelineData(rgb=np.random.rand(64, 128, 3).astype(np.float32),
+                        depth=np.random.rand(64, 128).astype(np.float32))
+    projected = pipeline.project(data, x_points=32, y_points=32)
+
+    blend = pipeline.backward_incremental(projected)
+    np.testing.assert_allclose(blend.stacked, pipeline.backward(projected)["stacked"], atol=1e-5)
+    assert blend.faces == (1, 2, 3, 4, 5, 6)
+
+    edited = {"stacked": dict(projected["stacked"])}
+    edited["stacked"]["point_2"] = np.full_like(projected["stacked"]["point_2"], 0.25)
+    blend.update_face(2, edited["stacked"]["point_2"])
+    np.testing.assert_allclose(blend.result()["depth"], pipeline.backward(edited)["depth"], atol=1e-5)
+
+    edited["stacked"]["point_5"] = np.zeros_like(projected["stacked"]["point_5"])
+    blend.update_face(5, None)
+    np.testing.assert_allclose(blend.stacked, pipeline.backward(edited)["stacked"], atol=1e-5)
+    assert blend.faces == (1, 2, 3, 4, 6)
+
+
+def test_multiband_blender_reconstructs_constant_panorama():
+    """
+    Blenders are pluggable; the multi-band blender leaves no seams on a constant image.
+    """
+    from panorai.blender import BlenderRegistry
+    from panorai.pipeline import PipelineConfig
+
+    assert {"FeatheringBlender", "MultiBandBlender"} <= set(BlenderRegistry.list_blenders())
+
+    cfg = PipelineConfig(blender="MultiBandBlender", blender_params={"levels": 3})
+    pipeline = ProjectionPipeline(projection_name="gnomonic", sampler_name="CubeSampler", pipeline_cfg=cfg)
+    projected = pipeline.project(np.full((64, 128, 3), 0.5, dtype=np.float32), x_points=32, y_points=32)
+
+    multiband = pipeline.backward(projected)["stacked"]
+    assert multiband.shape == (64, 128, 3)
+    np.testing.assert_allclose(multiband, 0.5, atol=1e-4)
+
+    pipeline.update(blender="FeatheringBlender")
+    feathered = pipeline.backward(projected)["stacked"]
+    assert np.abs(feathered - 0.5).max() > np.abs(multiband - 0.5).max()
+
+
+def test_auto_size_matches_input_resolution_and_covers_sphere():
+    """
+    auto_size derives a covering field of view from the sampler and the face size from the input.
+    """
+    from panorai.pipeline import PipelineConfig
+    from panorai.sampler.coverage import covers
+
+    pipeline = ProjectionPipeline("gnomonic", "FibonacciSampler", PipelineConfig(auto_size=True, fov_margin_deg=2.0))
+    pipeline.sampler.update(n_points=20)
+    points = pipeline.sampler.get_tangent_points()
+
+    sizing = pipeline.face_size((64, 128, 3))
+    assert covers(points, sizing["fov_deg"]) and not covers(points, sizing["fov_deg"] - 4.0)
+    # Twice the input resolution gives (about) twice the face pixels
+    assert abs(pipeline.face_size((128, 256, 3))["x_points"] - 2 * sizing["x_points"]) <= 2
+
+    data = np.random.rand(64, 128, 3).astype(np.float32) + 0.1
+    projected = pipeline.project(data)
+    assert projected["stacked"]["point_1"].shape == (sizing["y_points"], sizing["x_points"], 3)
+    assert np.all(pipeline.backward(projected)["stacked"].max(axis=-1) > 0), "auto-sized faces leave gaps"
+
+
+def test_memory_budget_plans_and_measures_passes():
+    """
+    With max_memory, passes are planned within the budget, give the same results and report their peak.
+    """
+    from panorai.pipeline import PipelineConfig
+
+    data = (np.random.rand(64, 128, 3) * 255).astype(np.uint8)
+    reference = ProjectionPipeline("gnomonic", "CubeSampler", PipelineConfig(n_jobs=2))
+    expected = reference.project(data, x_points=32, y_points=32, resize_factor=0.5)
+    expected_back = reference.backward(expected)["stacked"]
+    assert reference.stats()["memory"]["backward"]["plan"]["in_flight"] == 2
+    assert "peak" not in reference.stats()["memory"]["backward"]
+
+    budget = 100_000
+    pipeline = ProjectionPipeline("gnomonic", "CubeSampler", PipelineConfig(n_jobs=2, max_memory=budget))
+    result = pipeline.project(data, x_points=32, y_points=32, resize_factor=0.5)
+    for key, face in expected["stacked"].items():
+        np.testing.assert_array_equal(result["stacked"][key], face)
+    np.testing.assert_allclose(pipeline.backward(result)["stacked"], expected_back, atol=1e-6)
+
+    memory = pipeline.stats()["memory"]
+    assert memory["max_memory"] == budget
+    assert memory["forward"]["plan"]["tile_rows"] == 16
+    assert memory["backward"]["plan"]["in_flight"] == 1 and memory["backward"]["plan"]["n_jobs"] == 1
+    assert memory["backward"]["peak"]["traced_bytes"] > 0
+
+
+def test_peak_memory_without_reset_peak(monkeypatch):
+    """
+    Without tracemalloc.reset_peak (Python < 3.9), PeakMemory still reports a peak, at least the block's own.
+    """
+    import tracemalloc
+    from panorai.pipeline.memory import PeakMemory
+
+    monkeypatch.delattr(tracemalloc, "reset_peak", raising=False)
+    with PeakMemory() as outer:
+        with PeakMemory() as peak:
+            block = np.ones(1 << 20)
+        del block
+    assert peak.traced >= 8 << 20 and outer.traced >= peak.traced
+
+
+def test_negative_n_jobs_runs_backward_in_parallel(monkeypatch):
+    """
+    n_jobs=-1 reaches joblib as given without a memory budget; only the plan counts workers.
+    """
+    import joblib
+    from joblib import effective_n_jobs
+
+    from panorai.pipeline import PipelineConfig
+
+    calls = []
+
+    class RecordingParallel(joblib.Parallel):
+        def __init__(self, n_jobs=None, **kwargs):
+            calls.append(n_jobs)
+            super().__init__(n_jobs=n_jobs, **kwargs)
+
+    monkeypatch.setattr(joblib, "Parallel", RecordingParallel)
+    pipeline = ProjectionPipeline("gnomonic", "CubeSampler", PipelineConfig(n_jobs=-1))
+    reference = ProjectionPipeline("gnomonic", "CubeSampler")
+
+    data = np.random.rand(64, 128, 3).astype(np.float32)
+    projected = pipeline.project(data, x_points=32, y_points=32)
+    expected = reference.backward(reference.project(data, x_points=32, y_points=32))["stacked"]
+    np.testing.assert_allclose(pipeline.backward(projected)["stacked"], expected, atol=1e-6)
+    assert calls == [-1]
+    plan = pipeline.stats()["memory"]["backward"]["plan"]
+    assert plan["n_jobs"] == effective_n_jobs(-1) and plan["in_flight"] == min(effective_n_jobs(-1), 6)
+
+
+def test_auto_n_jobs_calibrates_once_per_shape(tmp_path, monkeypatch):
+    """
+    n_jobs="auto" calibrates on the first backward of a shape, persists the choice and reuses it.
+    """
+    import json
+
+    from panorai.pipeline import PipelineConfig
+    from panorai.pipeline import pipeline as pipeline_module
+    from panorai.pipeline.autotune import candidate_settings
+
+    assert candidate_settings(4) == [("sequential", 1), ("threading", 2), ("threading", 4), ("loky", 2), ("loky", 4)]
+
+    calibrations = []
+    calibrate = pipeline_module.calibrate
+
+    def counting_calibrate(run, candidates, warm_up=None):
+        calibrations.append(candidates)
+        return calibrate(run, [("sequential", 1), ("threading", 2)], warm_up=warm_up)
+
+    monkeypatch.setattr(pipeline_module, "calibrate", counting_calibrate)
+    tuning_file = tmp_path / "autotune.json"
+    cfg = PipelineConfig(n_jobs="auto", tuning_file=str(tuning_file))
+    pipeline = ProjectionPipeline("gnomonic", "CubeSampler", pipeline_cfg=cfg)
+    reference = ProjectionPipeline("gnomonic", "CubeSampler")
+
+    data = np.random.rand(64, 128, 3).astype(np.float32)
+    projected = pipeline.project(data, x_points=32, y_points=32)
+    expected = reference.backward(reference.project(data, x_points=32, y_points=32))["stacked"]
+    for _ in range(2):
+        np.testing.assert_allclose(pipeline.backward(projected)["stacked"], expected, atol=1e-6)
+    assert len(calibrations) == 1
+
+    (entries,) = json.loads(tuning_file.read_text()).values()
+    (entry,) = entries.values()
+    assert (entry["backend"], entry["n_jobs"]) in {("sequential", 1), ("threading", 2)}
+
+    # A new pipeline reuses the persisted calibration; a new shape is calibrated again
+    pipeline = ProjectionPipeline("gnomonic", "CubeSampler", pipeline_cfg=cfg)
+    pipeline.backward(pipeline.project(data, x_points=32, y_points=32))
+    assert len(calibrations) == 1
+    pipeline.backward(pipeline.project(data, x_points=16, y_points=16))
+    assert len(calibrations) == 2
+
+
+def test_executor_runs_face_tasks_out_of_process():
+    """
+    Forward, backward and preprocess tasks on a process pool give the local results.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    from panorai.pipeline import PipelineConfig, PipelineData
+
+    reference = ProjectionPipeline("gnomonic", "CubeSampler")
+    rgb = (np.random.rand(64, 128, 3) * 255).astype(np.uint8)
+    depth = np.random.rand(64, 128).astype(np.float32)
+
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        pipeline = ProjectionPipeline("gnomonic", "CubeSampler", pipeline_cfg=PipelineConfig(executor=pool))
+        for data, kwargs in ((depth[..., None], {}), (rgb, {"resize_factor": 0.5})):
+            expected = reference.project(data, x_points=32, y_points=32, **kwargs)
+            projected = pipeline.project(data, x_points=32, y_points=32, **kwargs)
+            for name, face in expected["stacked"].items():
+                np.testing.assert_array_equal(projected["stacked"][name], face)
+            np.testing.assert_array_equal(
+                pipeline.backward(projected)["stacked"], reference.backward(expected)["stacked"]
+            )
+
+        local = PipelineData(rgb=rgb.astype(np.float32), depth=depth)
+        remote = PipelineData(rgb=rgb.astype(np.float32), depth=depth)
+        local.preprocess(shadow_angle=30)
+        remote.preprocess(shadow_angle=30, executor=pool)
+        for key in ("rgb", "depth"):
+            np.testing.assert_array_equal(remote[key], local[key])
+
+
+def test_render_view_reuses_grids_across_yaw():
+    """
+    render_view matches the gnomonic projector, shifts cached grids for yaw and picks pyramid levels.
+    """
+    from panorai.pipeline.geometry import compute_forward_maps
+    from panorai.pipeline.viewport import shift_longitude, view_maps
+
+    pipeline = ProjectionPipeline("gnomonic")
+    eq_shape = (128, 256, 3)
+    pipeline.projector.config.update(phi1_deg=20, lam0_deg=-150, fov_deg=90, x_points=32, y_points=32)
+    map_x, map_y = compute_forward_maps(pipeline.projector, eq_shape)
+    view_x, view_y = view_maps(20, 0, 90, 32, 32, eq_shape)
+    view_x = shift_longitude(view_x, -150, eq_shape[1])
+    seam_distance = np.abs(map_x - view_x)
+    assert np.minimum(seam_distance, eq_shape[1] - 1 - seam_distance).max() < 1e-3
+    assert np.abs(map_y - view_y).max() < 1e-3
+
+    data = (np.random.rand(*eq_shape) * 255).astype(np.uint8)
+    views = [pipeline.render_view(data, yaw, 10, width=48, height=32, level=0) for yaw in (0, 45, 90.5)]
+    assert all(view.shape == (32, 48, 3) and view.dtype == np.uint8 for view in views)
+    assert pipeline.stats()["views"] == {"entries": 1, "hits": 2, "misses": 1}
+
+    # Rolling a square view by 180 degrees turns it upside down
+    upright = pipeline.render_view(data, 30, 0, 0, 60, 33, 33, level=0)
+    np.testing.assert_array_equal(pipeline.render_view(data, 30, 0, 180, 60, 33, 33, level=0), upright[::-1, ::-1])
+
+    # A small, wide view samples a coarse level of the pyramid
+    renderer = pipeline.viewer(np.full(eq_shape, 7, dtype=np.uint8))
+    np.testing.assert_array_equal(renderer.render(0, 0, fov_deg=120, width=16, height=16), 7)
+    assert len(renderer._levels) > 1
+
+
+def test_project_region_projects_only_intersecting_faces():
+    """
+    project_region returns the faces whose footprint meets the region, identical to a full projection.
+    """
+    from panorai.pipeline import Cone, LatLonBox
+    from panorai.sampler.coverage import fibonacci_directions, gnomonic_extent
+
+    pipeline = ProjectionPipeline("gnomonic", "FibonacciSampler")
+    data = (np.random.rand(64, 128, 3) * 255).astype(np.uint8)
+    full = pipeline.project(data, x_points=32, y_points=32)
+
+    region = Cone(10, 45, 5)
+    partial = pipeline.project_region(data, region, x_points=32, y_points=32)
+    assert 0 < len(partial["indices"]) < len(full["stacked"])
+    assert sorted(partial["stacked"]) == sorted(f"point_{idx}" for idx in partial["indices"])
+    for name, face in partial["stacked"].items():
+        np.testing.assert_array_equal(face, full["stacked"][name])
+
+    # Every face that really sees the region is selected
+    directions = fibonacci_directions(20000)
+    lat = np.degrees(np.arcsin(directions[:, 2]))
+    lon = np.degrees(np.arctan2(directions[:, 1], directions[:, 0]))
+    seen = gnomonic_extent(pipeline.sampler.get_tangent_points(), directions) <= 45
+    box = LatLonBox(-20, 30, 160, -150)  # Across the seam
+    inside = (lat >= -20) & (lat <= 30) & ((lon >= 160) | (lon <= -150))
+    assert set(np.flatnonzero(seen[:, inside].any(axis=1)) + 1) <= set(pipeline.face_indices(box))
+
+    mask = np.zeros(data.shape[:2], dtype=bool)
+    mask[30:34, 60:64] = True
+    assert pipeline.face_indices(mask) == pipeline.project_region(data, mask)["indices"]
+    assert pipeline.face_indices(LatLonBox(-90, 90, -180, 180)) == list(range(1, len(full["stacked"]) + 1))
+
+
+def test_healpix_sampler_lookup_and_hierarchy():
+    """
+    HEALPixSampler pixels round-trip through ang2pix, nest across orders and have equal areas.
+    """
+    from panorai.pipeline import PipelineConfig
+    from panorai.sampler.healpix import ang2pix, children, parent, pix2ang
+
+    sampler = SamplerRegistry.get_sampler("HEALPixSampler", order=1)
+    points = sampler.get_tangent_points()
+    assert len(points) == 48
+
+    lat, lon = np.array(points).T
+    np.testing.assert_array_equal(sampler.face_index(lat, lon), np.arange(1, 49))
+    for order in range(4):
+        pix = np.arange(12 * 4 ** order)
+        np.testing.assert_array_equal(ang2pix(order, *pix2ang(order, pix)), pix)
+
+    rng = np.random.default_rng(0)
+    directions = rng.normal(size=(48000, 3))
+    directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+    lat = np.degrees(np.arcsin(directions[:, 2]))
+    lon = np.degrees(np.arctan2(directions[:, 1], directions[:, 0]))
+    fine = ang2pix(3, lat, lon)
+    np.testing.assert_array_equal(parent(fine, 2), ang2pix(1, lat, lon))
+    assert (children(parent(fine, 2), 2) == fine[:, None]).any(axis=1).all()
+
+    # Equal areas: about 1000 uniform directions per pixel of order 1
+    counts = np.bincount(ang2pix(1, lat, lon), minlength=48)
+    assert counts.min() > 850 and counts.max() < 1150
+
+    pipeline = ProjectionPipeline("gnomonic", "HEALPixSampler", pipeline_cfg=PipelineConfig(auto_size=True))
+    projections = pipeline.project(np.random.rand(64, 128, 3).astype(np.float32), order=0)
+    assert len(projections["stacked"]) == 12
+
+
+def test_project_many_matches_separate_pipelines():
+    """
+    project_many stacks once and returns what a pipeline per projection would.
+    """
+    data = PipelineData(rgb=np.random.rand(64, 128, 3).astype(np.float32),
+                        depth=np.random.rand(64, 128).astype(np.float32))
+    pipeline = ProjectionPipeline("gnomonic", "CubeSampler")
+    outputs = pipeline.project_many(data, {
+        "gnomonic": {"x_points": 32, "y_points": 32},
+        "mercator": {"sampler_name": None, "x_points": 128, "y_points": 64},
+    })
+
+    reference = ProjectionPipeline("gnomonic", "CubeSampler")
+    faces = reference.project(data, x_points=32, y_points=32)
+    for name, face in faces["stacked"].items():
+        np.testing.assert_array_equal(outputs["gnomonic"]["stacked"][name], face)
+        np.testing.assert_array_equal(outputs["gnomonic"][name]["rgb"], faces[name]["rgb"])
+    mercator = ProjectionPipeline("mercator").project(data, x_points=128, y_points=64)
+    np.testing.assert_array_equal(outputs["mercator"]["stacked"], mercator["stacked"])
+    np.testing.assert_array_equal(outputs["mercator"]["depth"], mercator["depth"])
+
+    # Every projection keeps its forward state for its own backward, and its pipeline is reused
+    restored = pipeline.backward(outputs["gnomonic"])
+    np.testing.assert_allclose(restored["rgb"], reference.backward(faces)["rgb"], atol=1e-6)
+    assert pipeline.projection_pipeline("mercator", None) is pipeline.projection_pipeline("mercator", None)
@@ -0,0 +1,43 @@
+"""
+Startup-time guards: importing panorai must stay cheap.
+"""
+import logging
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ("cv2", "scipy", "skimage", "joblib", "panorai.submodules.projections")
+
+
+def _loaded_after(code):
+    script = f"import sys\n{code}\nprint(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    out = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, check=True)
+    return [m for m in out.stdout.strip().split(",") if m]
+
+
+def test_import_panorai_does_not_load_heavy_dependencies():
+    assert _loaded_after("import panorai") == []
+
+
+def test_listing_samplers_does_not_instantiate_them():
+    code = (
+        "from panorai.sampler import SamplerRegistry\n"
+        "assert 'CubeSampler' in SamplerRegistry.list_samplers()\n"
+        "assert 'panorai.sampler.base_samplers' not in sys.modules"
+    )
+    assert _loaded_after(code) == []
+
+
+def test_pipeline_import_defers_optional_dependencies():
+    loaded = _loaded_after("from panorai import ProjectionPipeline")
+    assert "skimage" not in loaded and "joblib" not in loaded and "scipy" not in loaded
+
+
+def test_import_does_not_replace_logging_handlers():
+    import panorai.pipeline.pipeline  # noqa: F401
+    import panorai.pipeline.utils.resizer  # noqa: F401
+
+    for name in ("panorai.pipeline.pipeline", "panorai.pipeline.utils.resizer"):
+        assert not any(isinstance(h, logging.StreamHandler) for h in logging.getLogger(name).handlers)